@@ -0,0 +1,24 @@
+"""
+Account paths
+Where each account's sign-in files live, shared by app.py and the
+get_*_cookies.py scripts so a cookie set is saved where the app looks for it.
+"""
+
+import os
+import re
+import sys
+
+ACCOUNTS_DIR = os.environ.get('ACCOUNTS_DIR', 'accounts')
+DEFAULT_ACCOUNT = 'default'
+ACCOUNT_NAME = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+def account_file(account, name):
+    """The default account's files sit next to app.py, other accounts' under ACCOUNTS_DIR/<account>/"""
+    return name if account == DEFAULT_ACCOUNT else os.path.join(ACCOUNTS_DIR, account, name)
+
+def account_cookie_path(site):
+    """Cookie file for python get_<site>_cookies.py [account]; exits on an invalid account name"""
+    account = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_ACCOUNT
+    if not ACCOUNT_NAME.match(account):
+        sys.exit(f"Account names are letters, digits, _ and - only: {account}")
+    return account_file(account, f"{site}_cookies.json")
@@ -1,5 +1,6 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, send_from_directory
 import os
+import sys
 import json
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -7,17 +8,122 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 import time
+import signal
+import subprocess
+import random
+import re
 from groq import Groq
 from werkzeug.utils import secure_filename
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.date import DateTrigger
+from apscheduler.executors.pool import ThreadPoolExecutor as SchedulerThreadPool
 import threading
 import atexit
+import logging
+import logging.handlers
+import queue
+import itertools
+import hmac
+import linecache
+import io
+import shutil
+import sqlite3
+import socket
+from collections import deque
+from contextlib import contextmanager
+from account_paths import ACCOUNTS_DIR, DEFAULT_ACCOUNT, ACCOUNT_NAME, account_file
+
+# psutil is only needed for Chrome memory sampling
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Logging: records go through a queue so posting threads never block on stdout.
+# LOG_LEVEL=DEBUG|INFO|WARNING, LOG_FORMAT=text|json, POSTER_QUIET=1 for warnings and errors only.
+LOG_LEVEL = 'WARNING' if os.environ.get('POSTER_QUIET') else os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()
+
+_log_local = threading.local()
+_trace_local = threading.local()
+
+class PostContextFilter(logging.Filter):
+    """Stamp account, post_id, platform and step from the calling thread onto each record"""
+    def filter(self, record):
+        context = getattr(_log_local, 'context', None) or {}
+        trace = getattr(_trace_local, 'trace', None)
+        record.account = context.get('account')
+        record.post_id = context.get('post_id')
+        record.platform = context.get('platform') or (trace['platform'] if trace else None)
+        record.step = trace['step'] if trace else None
+        # Single-account setups keep their usual prefix; other accounts than 'default' lead it
+        account = record.account if record.account != 'default' else None
+        record.context = '/'.join(str(v) for v in (account, record.post_id, record.platform, record.step) if v) or '-'
+        return True
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line"""
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'msg': record.getMessage(),
+            'account': getattr(record, 'account', None),
+            'post_id': getattr(record, 'post_id', None),
+            'platform': getattr(record, 'platform', None),
+            'step': getattr(record, 'step', None)
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+def setup_logging():
+    """Attach a QueueHandler to the 'poster' logger and drain it to stdout on a listener thread"""
+    logger = logging.getLogger('poster')
+    if logger.handlers:
+        return logger
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(PostContextFilter())
+    logger.addHandler(queue_handler)
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == 'json':
+        stream_handler.setFormatter(JsonLogFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)-7s [%(context)s] %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return logger
+
+@contextmanager
+def log_context(**fields):
+    """Add fields (e.g. post_id) to every log record from this thread inside the block"""
+    previous = getattr(_log_local, 'context', None)
+    _log_local.context = dict(previous or {}, **fields)
+    try:
+        yield
+    finally:
+        _log_local.context = previous
+
+log = setup_logging()
 
 # PIL imports for image generation
 try:
@@ -25,12 +131,15 @@ try:
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
-    print("WARNING: PIL (Pillow) not installed.")
+    log.warning("PIL (Pillow) not installed.")
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['SCHEDULED_FOLDER'] = 'scheduled_uploads'
 app.config['GENERATED_IMAGES_FOLDER'] = 'generated_images'
+app.config['FLIGHT_RECORDS_FOLDER'] = 'flight_records'
+app.config['PROFILES_FOLDER'] = 'profiles'
+app.config['PERFORMANCE_FOLDER'] = 'performance'
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max file size for videos
 app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'gif', 'mp4', 'mov', 'avi', 'mkv', 'webm'}
 
@@ -39,13 +148,48 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['SCHEDULED_FOLDER'], exist_ok=True)
 os.makedirs(app.config['GENERATED_IMAGES_FOLDER'], exist_ok=True)
 
-# Initialize scheduler
-scheduler = BackgroundScheduler()
-scheduler.start()
+# POSTER_WORKER=1 marks a poster worker process (see PosterWorker); workers never run the scheduler
+POSTER_WORKER = os.environ.get('POSTER_WORKER') == '1'
+# Process roles: APP_ROLE=all (the default) serves the UI and runs the scheduler and browsers in one
+# process. APP_ROLE=web only serves requests and hands work to the durable queue in WORK_QUEUE_DB;
+# the scheduler worker (python worker.py, APP_ROLE=scheduler) owns jobs, browsers and the queue.
+APP_ROLE = 'poster' if POSTER_WORKER else os.environ.get('APP_ROLE', 'all')
+RUNS_SCHEDULER = APP_ROLE in ('all', 'scheduler')
+
+# Initialize scheduler; overdue catch-up gets its own few threads so it can never hold every
+# scheduler thread while it waits for a browser
+BACKFILL_THREADS = int(os.environ.get('BACKFILL_THREADS', '2'))
+scheduler = BackgroundScheduler(executors={'default': SchedulerThreadPool(10),
+                                           'backfill': SchedulerThreadPool(BACKFILL_THREADS)})
+if RUNS_SCHEDULER:
+    scheduler.start()
 
 # Scheduled posts storage
 SCHEDULED_POSTS_FILE = 'scheduled_posts.json'
-scheduled_posts_lock = threading.Lock()
+
+class StoreLock:
+    """Lock for the posts file, shared by threads and (through flock) by other worker processes"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+    
+    def __enter__(self):
+        self._lock.acquire()
+        if FCNTL_AVAILABLE:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+    
+    def __exit__(self, *exc):
+        if self._file:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
+
+scheduled_posts_lock = StoreLock(SCHEDULED_POSTS_FILE + '.lock')
 
 def load_scheduled_posts():
     """Load scheduled posts from JSON file"""
@@ -59,19 +203,246 @@ def load_scheduled_posts():
 
 def save_scheduled_posts(posts):
     """Save scheduled posts to JSON file"""
-    with open(SCHEDULED_POSTS_FILE, 'w') as f:
+    # Replace rather than rewrite in place: web processes may be reading it at the same time
+    with open(SCHEDULED_POSTS_FILE + '.tmp', 'w') as f:
         json.dump(posts, f, indent=2)
+    os.replace(SCHEDULED_POSTS_FILE + '.tmp', SCHEDULED_POSTS_FILE)
+
+# Work queue: web-only processes enqueue commands (post now, schedule, cancel, retry, delete) in
+# SQLite and wait up to WEB_COMMAND_WAIT_SECONDS for the result; anything slower is answered
+# with 202 and a command id to poll on /commands/<id>. Any number of scheduler workers may consume
+# the queue: each claims a command atomically (with a lease its heartbeat renews) and runs it on
+# its command pool (COMMAND_THREADS), apart from its scheduler threads. Every write to the JSON
+# store happens under scheduled_posts_lock, which is also a file lock, so nodes never interleave.
+WORK_QUEUE_DB = os.environ.get('WORK_QUEUE_DB', 'work_queue.db')
+WORK_QUEUE_POLL_SECONDS = float(os.environ.get('WORK_QUEUE_POLL_SECONDS', '0.5'))
+WEB_COMMAND_WAIT_SECONDS = float(os.environ.get('WEB_COMMAND_WAIT_SECONDS', '25'))
+# A "post now" that no worker has started within COMMAND_TTL_SECONDS is failed instead of posted:
+# whoever asked has given up waiting, and posting hours later would surprise them
+COMMAND_TTL_SECONDS = float(os.environ.get('COMMAND_TTL_SECONDS', '900'))
+EXPIRING_COMMANDS = ('post',)
+WORKER_HEARTBEAT_SECONDS = 5
+WORK_QUEUE_KEEP_DAYS = 7
+
+_queue_schema_ready = False
+
+def queue_db():
+    """A connection to the work queue (autocommit; use BEGIN IMMEDIATE for claims)"""
+    global _queue_schema_ready
+    conn = sqlite3.connect(WORK_QUEUE_DB, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    if not _queue_schema_ready:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS commands (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued', result TEXT,
+            created_at REAL NOT NULL, started_at REAL, finished_at REAL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS commands_status ON commands (status, id)")
+        conn.execute("CREATE TABLE IF NOT EXISTS worker_status (name TEXT PRIMARY KEY, updated_at REAL, status TEXT)")
+        conn.execute("CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS breakers (key TEXT PRIMARY KEY, state TEXT NOT NULL)")
+        _queue_schema_ready = True
+    return conn
+
+# Multi-node: several scheduler workers (python worker.py, each with its own browsers) can share
+# scheduled_posts.json and WORK_QUEUE_DB, on one machine or on storage that honours file locks.
+# Every node fires every scheduled post and claims its sub-jobs under the posts lock, so each
+# sub-job runs once. A claim is a lease the node's heartbeat renews; when a node stops renewing,
+# the others take its sub-jobs over as interrupted (the retry checks the account first) after
+# LEASE_TTL_SECONDS.
+WORKER_ID = os.environ.get('WORKER_ID') or f"{socket.gethostname()}-{os.getpid()}"
+LEASE_TTL_SECONDS = float(os.environ.get('LEASE_TTL_SECONDS', '60'))
+
+def job_lease(post_id, platform):
+    return f"job/{post_id}/{platform}"
+
+def acquire_lease(name, conn=None):
+    """Take (or renew) a lease for this node; False while another live node holds it"""
+    own = conn is None
+    conn = conn or queue_db()
+    try:
+        now = time.time()
+        cursor = conn.execute("""INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE leases.owner = excluded.owner OR leases.expires_at < ?""",
+            (name, WORKER_ID, now + LEASE_TTL_SECONDS, now))
+        return cursor.rowcount == 1
+    finally:
+        if own:
+            conn.close()
+
+def release_lease(name):
+    conn = queue_db()
+    try:
+        conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, WORKER_ID))
+    finally:
+        conn.close()
+
+def renew_leases():
+    """Heartbeat: extend every lease this node holds"""
+    conn = queue_db()
+    try:
+        conn.execute("UPDATE leases SET expires_at = ? WHERE owner = ?", (time.time() + LEASE_TTL_SECONDS, WORKER_ID))
+    finally:
+        conn.close()
+
+def live_leases():
+    """Names of the leases whose holder is still renewing them"""
+    conn = queue_db()
+    try:
+        return {row['name'] for row in conn.execute("SELECT name FROM leases WHERE expires_at >= ?", (time.time(),))}
+    finally:
+        conn.close()
+
+def enqueue_command(kind, payload):
+    """Queue a command for the scheduler worker; returns its id"""
+    conn = queue_db()
+    try:
+        cursor = conn.execute("INSERT INTO commands (kind, payload, created_at) VALUES (?, ?, ?)",
+                              (kind, json.dumps(payload), time.time()))
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+def command_status(command_id):
+    """A command's row as a dict (result decoded), or None"""
+    conn = queue_db()
+    try:
+        row = conn.execute("SELECT * FROM commands WHERE id = ?", (command_id,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    command = dict(row)
+    command['payload'] = json.loads(command['payload'])
+    command['result'] = json.loads(command['result']) if command['result'] else None
+    return command
+
+def queued_commands(kind):
+    conn = queue_db()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM commands WHERE kind = ? AND status IN ('queued', 'running')",
+                            (kind,)).fetchone()[0]
+    finally:
+        conn.close()
+
+def wait_for_command(command_id, timeout):
+    """Poll until the command finishes or timeout passes; returns its latest row"""
+    deadline = time.time() + timeout
+    while True:
+        command = command_status(command_id)
+        if command is None or command['status'] in ('done', 'failed') or time.time() >= deadline:
+            return command
+        time.sleep(WORK_QUEUE_POLL_SECONDS)
+
+def claim_command():
+    """Take the oldest queued command as (id, kind, payload, created_at), or None"""
+    conn = queue_db()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT id, kind, payload, created_at FROM commands WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        if row:
+            conn.execute("UPDATE commands SET status = 'running', started_at = ? WHERE id = ?", (time.time(), row['id']))
+            acquire_lease(f"command/{row['id']}", conn)
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return (row['id'], row['kind'], json.loads(row['payload']), row['created_at']) if row else None
+
+def finish_command(command_id, result, status='done'):
+    conn = queue_db()
+    try:
+        conn.execute("UPDATE commands SET status = ?, result = ?, finished_at = ? WHERE id = ?",
+                     (status, json.dumps(result, default=str), time.time(), command_id))
+        conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (f"command/{command_id}", WORKER_ID))
+    finally:
+        conn.close()
+
+# Pre-warm: scheduled jobs fire PREWARM_LEAD_SECONDS before scheduled_time so Chrome launch,
+# cookies and navigation are done early; each poster then holds at its submit step until the
+# scheduled instant (see trace_step). 0 starts jobs exactly at scheduled_time. A holding poster
+# keeps its browser slot and scheduler thread, but the hold is left out of the governor's
+# slot-time estimate (it is waiting, not working).
+PREWARM_LEAD_SECONDS = int(os.environ.get('PREWARM_LEAD_SECONDS', '60'))
+# Pre-warmed platforms of one post run side by side, at most this many browsers at once. The
+# first PREWARM_MAX_BROWSERS hold until the due time, so any platforms beyond that only start
+# once one of them has posted, i.e. late; keep it at least the number of platforms per post
+# (and BROWSER_MAX_CONCURRENT at least as high, or the extra ones queue for a slot instead).
+PREWARM_MAX_BROWSERS = int(os.environ.get('PREWARM_MAX_BROWSERS', '4'))
+
+def job_run_date(scheduled_time):
+    """When the scheduler should start a post: PREWARM_LEAD_SECONDS ahead of its due time"""
+    return max(datetime.now(), scheduled_time - timedelta(seconds=PREWARM_LEAD_SECONDS))
 
 # Initialize Groq client
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
+# Point at a compatible server (e.g. benchmarks/groq_stub.py) instead of api.groq.com
+GROQ_BASE_URL = os.environ.get('GROQ_BASE_URL') or None
+
+PLATFORMS = ['linkedin', 'twitter', 'instagram', 'facebook', 'pinterest', 'youtube', 'youtubepost']
+
+# Pages each poster opens: 'home' to attach cookies to the domain, then 'app' to post.
+# 'profile' is where verify_published() starts looking for a post before a retry. Where the
+# account's own page has a per-account URL, it is reached from there: 'profile_link' is a link
+# to follow (Twitter's profile tab), 'profile_redirect' a (pattern, replacement) applied to the
+# URL 'profile' redirects to (YouTube Studio lands on /channel/<id>).
+# benchmarks/mock_sites.py swaps these for local mock pages.
+PLATFORM_URLS = {
+    'linkedin': {'home': 'https://www.linkedin.com', 'app': 'https://www.linkedin.com/feed/',
+                 'profile': 'https://www.linkedin.com/in/me/recent-activity/all/'},
+    'twitter': {'home': 'https://twitter.com', 'app': 'https://twitter.com/home', 'profile': 'https://twitter.com/home',
+                'profile_link': "//a[@data-testid='AppTabBar_Profile_Link']"},
+    'instagram': {'home': 'https://www.instagram.com', 'app': 'https://www.instagram.com'},
+    'facebook': {'home': 'https://www.facebook.com', 'app': 'https://www.facebook.com', 'profile': 'https://www.facebook.com/me'},
+    'pinterest': {'home': 'https://www.pinterest.com', 'app': 'https://www.pinterest.com'},
+    # Studio's content list includes private and unlisted uploads, which the public channel does not
+    'youtube': {'home': 'https://www.youtube.com', 'app': 'https://www.youtube.com', 'profile': 'https://studio.youtube.com/',
+                'profile_redirect': (r'^https://studio\.youtube\.com/channel/([\w-]+)', r'https://studio.youtube.com/channel/\1/videos/upload')},
+    'youtubepost': {'home': 'https://www.youtube.com', 'app': 'https://www.youtube.com', 'profile': 'https://studio.youtube.com/',
+                    'profile_redirect': (r'^https://studio\.youtube\.com/channel/([\w-]+)', r'https://www.youtube.com/channel/\1/community')},
+}
+# Platforms whose own page can't show whether a post went out, so a retry after an attempt that
+# may have posted needs force: Instagram's grid shows images, not captions, and Pinterest's
+# boards don't reliably show pin titles
+UNVERIFIABLE_PLATFORMS = {'instagram', 'pinterest'}
+MEDIA_REQUIRED = {'instagram': 'Instagram', 'pinterest': 'Pinterest', 'youtube': 'YouTube'}
+
+def has_display():
+    """True if a headed Chrome can open a window on this host"""
+    if not sys.platform.startswith('linux'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+def _parse_platform_list(value):
+    value = value.strip().lower()
+    if value == 'all':
+        return set(PLATFORMS)
+    return {p.strip() for p in value.split(',') if p.strip()}
+
+# Platforms that run in new headless mode unless a request says otherwise.
+# HEADLESS_PLATFORMS=all or e.g. "linkedin,twitter"; without a display, everything is headless.
+HEADLESS_PLATFORMS = _parse_platform_list(os.environ.get('HEADLESS_PLATFORMS', '' if has_display() else 'all'))
+
+def parse_headless_flag(value):
+    """Map a form value to True/False, or None to use the per-platform default"""
+    if value is None or value == '':
+        return None
+    return str(value).lower() in ('true', 'on', '1', 'yes')
+
+def resolve_headless(platform, requested=None):
+    """Headless setting for one platform: explicit request first, then HEADLESS_PLATFORMS"""
+    if requested is not None:
+        return requested
+    return platform in HEADLESS_PLATFORMS
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
 def generate_caption_with_groq(prompt, platform=None):
     """Generate professional caption using Groq AI for specific platform"""
+    started = time.time()
     try:
-        client = Groq(api_key=GROQ_API_KEY)
+        client = Groq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL)
         
         platform_instructions = {
             'linkedin': "Create a professional, business-focused caption for LinkedIn. Use industry insights and thought leadership. No emojis. Keep it concise and impactful. Add 3-5 relevant professional hashtags at the end.",
@@ -105,15 +476,668 @@ def generate_caption_with_groq(prompt, platform=None):
         )
         caption = chat_completion.choices[0].message.content.strip()
         caption = caption.strip('"').strip("'").strip()
+        inc_counter('groq_requests_total', platform=platform or 'generic', outcome='success')
+        observe_histogram('groq_request_seconds', time.time() - started, outcome='success')
         return caption
     except Exception as e:
+        inc_counter('groq_requests_total', platform=platform or 'generic', outcome='error')
+        observe_histogram('groq_request_seconds', time.time() - started, outcome='error')
         return f"Error generating caption: {str(e)}"
 
-def get_chrome_driver(headless=True):
+# Minimal Prometheus-style metrics kept in-process and served on /metrics
+METRIC_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+_metrics_lock = threading.Lock()
+_metric_help = {}
+_counters = {}
+_gauges = {}
+_histograms = {}
+
+def describe_metric(name, metric_type, help_text):
+    _metric_help[name] = (metric_type, help_text)
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+def inc_counter(name, amount=1, **labels):
+    """Increment a counter series"""
+    key = (name, _label_key(labels))
+    with _metrics_lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def set_gauge(name, value, **labels):
+    """Set a gauge series to its current value"""
+    key = (name, _label_key(labels))
+    with _metrics_lock:
+        _gauges[key] = value
+
+def clear_gauge(name, **labels):
+    """Drop a gauge series whose subject (e.g. a driver) is gone"""
+    with _metrics_lock:
+        _gauges.pop((name, _label_key(labels)), None)
+
+def observe_histogram(name, value, **labels):
+    """Record one observation in a histogram series"""
+    key = (name, _label_key(labels))
+    with _metrics_lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = {'buckets': [0] * len(METRIC_BUCKETS), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(METRIC_BUCKETS):
+            if value <= bound:
+                series['buckets'][i] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+def drain_metrics():
+    """Take and reset every counter and histogram series; a poster worker ships these to its parent"""
+    with _metrics_lock:
+        counters = [[name, list(labels), value] for (name, labels), value in _counters.items()]
+        histograms = [[name, list(labels), series] for (name, labels), series in _histograms.items()]
+        _counters.clear()
+        _histograms.clear()
+    return {'counters': counters, 'histograms': histograms}
+
+def merge_metrics(delta):
+    """Add series drained in a worker process to this process's metrics"""
+    with _metrics_lock:
+        for name, labels, value in delta.get('counters', []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            _counters[key] = _counters.get(key, 0) + value
+        for name, labels, series in delta.get('histograms', []):
+            key = (name, tuple(tuple(pair) for pair in labels))
+            mine = _histograms.setdefault(key, {'buckets': [0] * len(METRIC_BUCKETS), 'sum': 0.0, 'count': 0})
+            mine['buckets'] = [a + b for a, b in zip(mine['buckets'], series['buckets'])]
+            mine['sum'] += series['sum']
+            mine['count'] += series['count']
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ''
+    inner = ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in pairs)
+    return '{' + inner + '}'
+
+def render_metrics():
+    """Render every series in the Prometheus text exposition format"""
+    lines = []
+    with _metrics_lock:
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+        histograms = sorted((k, dict(v, buckets=list(v['buckets']))) for k, v in _histograms.items())
+    
+    described = set()
+    def header(name):
+        if name in described or name not in _metric_help:
+            return
+        described.add(name)
+        metric_type, help_text = _metric_help[name]
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+    
+    for (name, labels), value in counters:
+        header(name)
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), value in gauges:
+        header(name)
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), series in histograms:
+        header(name)
+        for bound, count in zip(METRIC_BUCKETS, series['buckets']):
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {count}")
+        lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {series['count']}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {series['sum']:.6f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+    return "\n".join(lines) + "\n"
+
+describe_metric('poster_run_seconds', 'histogram', 'Wall time of one post_to_* run')
+describe_metric('poster_step_seconds', 'histogram', 'Wall time of each posting step (launch, navigate, cookies, upload, caption, submit, ...)')
+describe_metric('poster_helper_seconds', 'histogram', 'Time spent inside selector waits, clicks and uploads')
+describe_metric('groq_requests_total', 'counter', 'Caption generation calls to Groq')
+describe_metric('groq_request_seconds', 'histogram', 'Latency of Groq caption calls')
+describe_metric('scheduler_lag_seconds', 'histogram', "Delay between a scheduled post's planned start (scheduled_time less the pre-warm lead) and the executor picking it up")
+describe_metric('prewarm_lead_seconds', 'histogram', 'How long before scheduled_time the executor picked a scheduled post up')
+describe_metric('publish_lag_seconds', 'histogram', 'Delay between scheduled_time and the submit step of a scheduled post')
+describe_metric('circuit_transitions_total', 'counter', 'Circuit breaker state changes per account')
+describe_metric('browser_queue_depth', 'gauge', 'Poster runs waiting for a browser slot')
+describe_metric('browsers_active', 'gauge', 'Browser slots currently held')
+describe_metric('browser_rss_mb', 'gauge', 'Resident memory of every Chrome/chromedriver process the app started')
+describe_metric('browser_queue_wait_seconds', 'histogram', 'Time a poster run waited for a browser slot')
+describe_metric('browser_rejections_total', 'counter', 'Requests turned away because the browser queue was saturated')
+describe_metric('poster_timeouts_total', 'counter', 'Poster runs killed for exceeding their hard budget, or whose worker died')
+describe_metric('chrome_driver_rss_mb', 'gauge', 'Resident memory of each live driver (chromedriver plus its Chrome processes)')
+describe_metric('chrome_driver_peak_rss_mb', 'gauge', 'Peak resident memory of the last driver that quit, per platform')
+describe_metric('poster_worker_recycles_total', 'counter', 'Poster worker processes replaced for memory or age')
+
+# Per-thread post trace: each trace_step() closes the previous step and opens a new one,
+# so a poster only marks where steps begin. The step open when it returns gets the outcome.
+# _trace_local is created alongside _log_local above so log records can read the current step.
+
+_worker_send = None
+
+def start_post_trace(platform, first_step='prepare', submit_at=None):
+    now = time.time()
+    _trace_local.trace = {'platform': platform, 'started': now, 'step': first_step, 'step_started': now, 'steps': {},
+                          'drivers': [], 'events': deque(maxlen=FLIGHT_RECORDER_EVENTS),
+                          'submit_at': submit_at, 'publish_lag': None}
+
+def current_platform():
+    trace = getattr(_trace_local, 'trace', None)
+    return trace['platform'] if trace else None
+
+def _close_step(trace, now, outcome):
+    elapsed = now - trace['step_started']
+    trace['steps'][trace['step']] = trace['steps'].get(trace['step'], 0) + elapsed
+    trace['events'].append({'t': round(now - trace['started'], 3), 'kind': 'step', 'step': trace['step'],
+                            'seconds': round(elapsed, 3), 'outcome': outcome})
+    observe_histogram('poster_step_seconds', elapsed, platform=trace['platform'], step=trace['step'], outcome=outcome)
+
+def record_event(kind, **fields):
+    """Append an event (selector wait, upload, ...) to this thread's flight recorder buffer"""
+    trace = getattr(_trace_local, 'trace', None)
+    if trace is None:
+        return
+    trace['events'].append(dict(fields, t=round(time.time() - trace['started'], 3), kind=kind, step=trace['step']))
+
+def trace_step(step):
+    """Mark the start of a posting step for this thread's trace (no-op outside a trace)"""
+    trace = getattr(_trace_local, 'trace', None)
+    if trace is None:
+        return
+    now = time.time()
+    _close_step(trace, now, 'ok')
+    if step == 'submit' and trace['submit_at'] is not None:
+        # Scheduled run: a pre-warmed poster waits here for the scheduled instant
+        if trace['submit_at'] > now:
+            trace['step'] = 'hold'
+            trace['step_started'] = now
+            _report_step('hold')
+            time.sleep(trace['submit_at'] - now)
+            now = time.time()
+            _close_step(trace, now, 'ok')
+        trace['publish_lag'] = now - trace['submit_at']
+        observe_histogram('publish_lag_seconds', max(trace['publish_lag'], 0), platform=trace['platform'])
+    trace['step'] = step
+    trace['step_started'] = now
+    _report_step(step)
+
+def _report_step(step):
+    # In a poster worker, tell the parent which step is running so a timeout can name it
+    if _worker_send is not None:
+        _worker_send({'type': 'step', 'step': step})
+
+def _step_commands(drivers):
+    """{step: WebDriver commands sent in it} over every driver of the run"""
+    counts = {}
+    for driver in drivers:
+        for step, count in getattr(driver, 'step_commands', {}).items():
+            counts[step] = counts.get(step, 0) + count
+    return counts
+
+def finish_post_trace(result):
+    """Close the trace with the poster's result; returns {'total': s, 'failed_step': ..., 'steps': {...}}"""
+    trace = getattr(_trace_local, 'trace', None)
+    if trace is None:
+        return None
+    _trace_local.trace = None
+    now = time.time()
+    outcome = 'success' if result.get('success') else 'failure'
+    _close_step(trace, now, outcome)
+    total = now - trace['started']
+    observe_histogram('poster_run_seconds', total, platform=trace['platform'], outcome=outcome)
+    timings = {
+        'total': round(total, 3),
+        'failed_step': None if result.get('success') else trace['step'],
+        'steps': {step: round(seconds, 3) for step, seconds in trace['steps'].items()},
+        'commands': sum(getattr(d, 'command_count', 0) for d in trace['drivers']),
+        'step_commands': _step_commands(trace['drivers']),
+        'publish_lag': None if trace['publish_lag'] is None else round(trace['publish_lag'], 3),
+        'peak_rss_mb': _peak_rss(trace['drivers'])
+    }
+    if result.get('success'):
+        _quit_drivers(trace['drivers'])
+    else:
+        result['flight_record'] = save_flight_record(trace, result, timings)
+    return timings
+
+# Flight recorder: every trace keeps its last FLIGHT_RECORDER_EVENTS events (steps with timings,
+# selectors tried). Only failed runs are written out, together with a downscaled screenshot and
+# a DOM snippet. The capture happens before the browser quits, while the run still holds its
+# browser slot, and gives up after FLIGHT_RECORDER_CAPTURE_TIMEOUT seconds so a hung Chrome
+# cannot hold the slot for long.
+FLIGHT_RECORDER_EVENTS = int(os.environ.get('FLIGHT_RECORDER_EVENTS', '50'))
+FLIGHT_RECORDER_MAX_RECORDS = int(os.environ.get('FLIGHT_RECORDER_MAX_RECORDS', '50'))
+FLIGHT_RECORDER_SCREENSHOTS = os.environ.get('FLIGHT_RECORDER_SCREENSHOTS', '1') != '0'
+FLIGHT_RECORDER_CAPTURE_TIMEOUT = float(os.environ.get('FLIGHT_RECORDER_CAPTURE_TIMEOUT', '10'))
+FLIGHT_RECORDER_SCREENSHOT_WIDTH = 640
+FLIGHT_RECORDER_DOM_CHARS = 20000
+
+_flight_recorder_lock = threading.Lock()
+
+def _peak_rss(drivers):
+    peaks = [peak for peak in (sample_driver(d) for d in drivers) if peak is not None]
+    return round(max(peaks), 1) if peaks else None
+
+def _quit_drivers(drivers):
+    for driver in drivers:
+        try:
+            getattr(driver, '_quit_now', driver.quit)()
+        except Exception:
+            pass
+
+def _downscale_screenshot(png_bytes):
+    """Shrink a screenshot to FLIGHT_RECORDER_SCREENSHOT_WIDTH as JPEG; returns (bytes, extension)"""
+    if not PIL_AVAILABLE:
+        return png_bytes, 'png'
+    image = Image.open(io.BytesIO(png_bytes)).convert('RGB')
+    image.thumbnail((FLIGHT_RECORDER_SCREENSHOT_WIDTH, FLIGHT_RECORDER_SCREENSHOT_WIDTH * 4))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=60)
+    return buffer.getvalue(), 'jpg'
+
+def _capture_browser_state(driver, record_dir):
+    """URL, title, DOM snippet and screenshot of the browser the run failed in"""
+    state = {}
+    try:
+        state['url'] = driver.current_url
+        state['title'] = driver.title
+        dom = driver.execute_script(
+            "return document.body ? document.body.outerHTML.slice(0, arguments[0]) : '';", FLIGHT_RECORDER_DOM_CHARS)
+        with open(os.path.join(record_dir, 'dom.html'), 'w', encoding='utf-8') as f:
+            f.write(dom or '')
+        state['dom'] = 'dom.html'
+        if FLIGHT_RECORDER_SCREENSHOTS:
+            image, extension = _downscale_screenshot(driver.get_screenshot_as_png())
+            with open(os.path.join(record_dir, f"screenshot.{extension}"), 'wb') as f:
+                f.write(image)
+            state['screenshot'] = f"screenshot.{extension}"
+    except Exception as e:
+        state['capture_error'] = f"{e.__class__.__name__}: {str(e)[:200]}"
+    return state
+
+def _capture_with_timeout(driver, record_dir):
+    """_capture_browser_state, or a capture_error if it takes longer than FLIGHT_RECORDER_CAPTURE_TIMEOUT"""
+    captured = {}
+    # Daemon: if the capture hangs, quitting the driver ends its WebDriver call
+    thread = threading.Thread(target=lambda: captured.update(_capture_browser_state(driver, record_dir)),
+                              name='flight-recorder', daemon=True)
+    thread.start()
+    thread.join(FLIGHT_RECORDER_CAPTURE_TIMEOUT)
+    if thread.is_alive():
+        return {'capture_error': f"capture timed out after {FLIGHT_RECORDER_CAPTURE_TIMEOUT:.0f}s"}
+    return captured
+
+def _prune_flight_records(folder):
+    """Keep only the newest FLIGHT_RECORDER_MAX_RECORDS records on disk"""
+    records = sorted(name for name in os.listdir(folder) if os.path.isdir(os.path.join(folder, name)))
+    for name in records[:max(0, len(records) - FLIGHT_RECORDER_MAX_RECORDS)]:
+        shutil.rmtree(os.path.join(folder, name), ignore_errors=True)
+
+def _write_flight_record(record, record_dir, drivers):
+    try:
+        os.makedirs(record_dir, exist_ok=True)
+        if drivers:
+            record['browser'] = _capture_with_timeout(drivers[-1], record_dir)
+        with open(os.path.join(record_dir, 'record.json'), 'w') as f:
+            json.dump(record, f, indent=2, default=str)
+        with _flight_recorder_lock:
+            _prune_flight_records(os.path.dirname(record_dir))
+    except Exception as e:
+        log.warning("Could not write flight record %s: %s", record_dir, e)
+    finally:
+        _quit_drivers(drivers)
+
+def save_flight_record(trace, result, timings):
+    """Persist a failed run's trace and quit its browsers; returns the record's folder"""
+    context = getattr(_log_local, 'context', None) or {}
+    post_id = context.get('post_id')
+    stamp = datetime.fromtimestamp(trace['started']).strftime('%Y%m%d-%H%M%S-%f')
+    name = '_'.join(part for part in (stamp, trace['platform'], post_id) if part)
+    record_dir = os.path.join(app.config['FLIGHT_RECORDS_FOLDER'], secure_filename(name))
+    record = {
+        'platform': trace['platform'],
+        'post_id': post_id,
+        'started': datetime.fromtimestamp(trace['started']).isoformat(),
+        'message': result.get('message'),
+        'timings': timings,
+        'headless': [getattr(d, 'headless', None) for d in trace['drivers']],
+        'events': list(trace['events'])
+    }
+    _write_flight_record(record, record_dir, list(trace['drivers']))
+    with log_context(platform=trace['platform']):
+        log.warning("Failed at %s; flight record in %s", timings['failed_step'], record_dir)
+    return record_dir
+
+# On-demand profiling: an admin can run one post or caption request under a sampling profiler
+# by sending profile=1 with an X-Admin-Token header matching ADMIN_TOKEN. Runs that don't ask
+# start no sampler. Stacks are written in collapsed form (flamegraph.pl, speedscope, inferno).
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL_MS', '5')) / 1000
+
+# Frames that mean the thread is blocked on WebDriver/HTTP I/O or deliberately waiting
+_IO_FRAMES = ('socket.py', 'ssl.py', 'http/client.py', 'urllib3', 'httpx', 'httpcore', 'remote_connection.py')
+_WAIT_FRAMES = ('threading.py', 'queue.py', 'selenium/webdriver/support/wait.py')
+
+def profile_requested(value):
+    """True for profile=1/true/on/yes in a form or JSON body"""
+    return str(value).lower() in ('true', 'on', '1', 'yes')
+
+def profiling_denied():
+    """None if the request may be profiled, otherwise the error response"""
+    token = request.headers.get('X-Admin-Token', '')
+    if ADMIN_TOKEN and hmac.compare_digest(token, ADMIN_TOKEN):
+        return None
+    return jsonify({"success": False, "message": "Profiling requires a valid X-Admin-Token"}), 403
+
+class SamplingProfiler:
+    """Sample one thread's Python stack every PROFILE_INTERVAL seconds from a helper thread"""
+    
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.categories = {'python': 0, 'io': 0, 'waiting': 0}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+    
+    def start(self):
+        self.started = time.time()
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.time() - self.started
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._sample(frame)
+    
+    def _sample(self, leaf):
+        frames = []
+        frame = leaf
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        files = [f.f_code.co_filename.replace('\\', '/') for f in frames]
+        if any(marker in path for path in files for marker in _IO_FRAMES):
+            category = 'io'
+        elif any(marker in files[0] for marker in _WAIT_FRAMES) or \
+                'sleep(' in linecache.getline(leaf.f_code.co_filename, leaf.f_lineno):
+            category = 'waiting'
+        else:
+            category = 'python'
+        stack = ';'.join(f"{f.f_code.co_name} ({os.path.basename(f.f_code.co_filename)}:{f.f_lineno})"
+                         for f in reversed(frames))
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.categories[category] += 1
+        self.samples += 1
+    
+    def save(self, name):
+        """Write <name>.collapsed and <name>.json to the profiles folder; returns the summary"""
+        os.makedirs(app.config['PROFILES_FOLDER'], exist_ok=True)
+        base = os.path.join(app.config['PROFILES_FOLDER'], secure_filename(name))
+        with open(f"{base}.collapsed", 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        
+        leaves = {}
+        for stack, count in self.stacks.items():
+            leaf = stack.rsplit(';', 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        total = max(self.samples, 1)
+        summary = {
+            'collapsed': f"{base}.collapsed",
+            'duration': round(self.duration, 3),
+            'samples': self.samples,
+            'interval_ms': self.interval * 1000,
+            'breakdown': {category: round(count / total, 3) for category, count in self.categories.items()},
+            'top': [{'frame': leaf, 'share': round(count / total, 3)}
+                    for leaf, count in sorted(leaves.items(), key=lambda item: -item[1])[:15]]
+        }
+        with open(f"{base}.json", 'w') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+@contextmanager
+def profile_run(name):
+    """Profile the calling thread inside the block; the yielded dict is filled with the summary"""
+    profiler = SamplingProfiler(threading.get_ident())
+    report = {}
+    profiler.start()
+    # The sampler only sees this process, so profiled posters are not sent to a worker
+    _trace_local.profiling = True
+    try:
+        yield report
+    finally:
+        _trace_local.profiling = False
+        profiler.stop()
+        stamp = datetime.fromtimestamp(profiler.started).strftime('%Y%m%d-%H%M%S')
+        try:
+            report.update(profiler.save(f"{stamp}_{name}"))
+        except Exception as e:
+            report['error'] = str(e)
+        breakdown = ", ".join(f"{k}={v:.0%}" for k, v in report.get('breakdown', {}).items())
+        log.info("Profiled %s: %s samples (%s) -> %s", name, report.get('samples', 0), breakdown, report.get('collapsed'))
+
+# Browser governor: every poster run and publish check holds a slot while its Chrome is up.
+# Slots are capped by count (BROWSER_MAX_CONCURRENT) and by the measured RSS of the browsers
+# already running (BROWSER_MAX_RSS_MB, needs psutil; 0 disables it). Excess runs wait in a
+# priority queue, and /post is turned away once BROWSER_QUEUE_LIMIT runs at interactive
+# priority or above are already waiting. Unless set, the memory cap is BROWSER_MEMORY_SHARE of
+# the host's RAM, leaving the rest to the app, its workers and the OS.
+BROWSER_MAX_CONCURRENT = int(os.environ.get('BROWSER_MAX_CONCURRENT', '3'))
+BROWSER_MEMORY_SHARE = float(os.environ.get('BROWSER_MEMORY_SHARE', '0.6'))
+
+def default_browser_rss_mb():
+    """BROWSER_MEMORY_SHARE of total RAM in MB, or 0 (no memory cap) without psutil"""
+    if not PSUTIL_AVAILABLE:
+        return 0
+    return round(psutil.virtual_memory().total / (1024 * 1024) * BROWSER_MEMORY_SHARE)
+
+BROWSER_MAX_RSS_MB = float(os.environ.get('BROWSER_MAX_RSS_MB') or default_browser_rss_mb())
+BROWSER_RSS_ESTIMATE_MB = float(os.environ.get('BROWSER_RSS_ESTIMATE_MB', '350'))
+BROWSER_QUEUE_LIMIT = int(os.environ.get('BROWSER_QUEUE_LIMIT', '10'))
+BROWSER_QUEUE_TIMEOUT = float(os.environ.get('BROWSER_QUEUE_TIMEOUT', '600'))
+# Lower runs first: posts that are due, then someone waiting on /post, then retries, then
+# catch-up of posts more than BACKFILL_AFTER_SECONDS overdue (e.g. after downtime)
+PRIORITY_SCHEDULED = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_RETRY = 2
+PRIORITY_BACKFILL = 3
+PRIORITY_NAMES = {PRIORITY_SCHEDULED: 'scheduled', PRIORITY_INTERACTIVE: 'interactive',
+                  PRIORITY_RETRY: 'retry', PRIORITY_BACKFILL: 'backfill'}
+BACKFILL_AFTER_SECONDS = float(os.environ.get('BACKFILL_AFTER_SECONDS', '300'))
+# On startup, posts that came due while no scheduler was running are still posted (as backfill)
+# if they are at most BACKFILL_MAX_AGE_SECONDS overdue; older ones are marked missed
+BACKFILL_MAX_AGE_SECONDS = float(os.environ.get('BACKFILL_MAX_AGE_SECONDS', str(6 * 3600)))
+# Aging: every BROWSER_AGING_SECONDS spent waiting counts as one class more urgent, so a
+# backlog is served eventually however much new work arrives
+BROWSER_AGING_SECONDS = float(os.environ.get('BROWSER_AGING_SECONDS', '120'))
+# Per-class caps on top of the browser budget, e.g. BROWSER_CLASS_LIMITS=backfill=1,retry=2.
+# By default backfill leaves one browser free for on-time and interactive posts.
+BROWSER_CLASS_LIMITS = {PRIORITY_BACKFILL: max(1, BROWSER_MAX_CONCURRENT - 1)}
+for _limit in filter(None, os.environ.get('BROWSER_CLASS_LIMITS', '').split(',')):
+    _name, _, _value = _limit.partition('=')
+    _class = next((k for k, v in PRIORITY_NAMES.items() if v == _name.strip()), None)
+    if _class is not None and _value.strip().isdigit():
+        BROWSER_CLASS_LIMITS[_class] = int(_value)
+
+def browsers_rss_mb():
+    """Resident memory of every process this app started (chromedriver and Chrome), in MB"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        return None
+    total = 0
+    for process in children:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+class BrowserGovernor:
+    """Hand out browser slots in aged priority order, within the count, memory and per-class caps"""
+    
+    def __init__(self, max_concurrent, max_rss_mb, class_limits=None):
+        self.max_concurrent = max_concurrent
+        self.max_rss_mb = max_rss_mb
+        self.class_limits = class_limits or {}
+        self.active = 0
+        self.active_by_class = {}
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._order = itertools.count()
+        self._hold_seconds = 60.0
+        self._local = threading.local()
+    
+    def _has_room(self, priority):
+        limit = self.class_limits.get(priority)
+        return limit is None or self.active_by_class.get(priority, 0) < limit
+    
+    def _next(self):
+        # Waiting entries age at the same rate, so ordering by (priority + arrival / aging) is
+        # the same as ordering by their aged priority now
+        return min((entry for entry in self._waiting if self._has_room(entry[2])), default=None)
+    
+    def _memory_ok(self):
+        # One browser is always allowed, or an oversized one could never run
+        if not self.max_rss_mb or self.active == 0:
+            return True
+        rss = browsers_rss_mb()
+        return rss is None or rss + BROWSER_RSS_ESTIMATE_MB <= self.max_rss_mb
+    
+    def _publish(self):
+        set_gauge('browser_queue_depth', len(self._waiting))
+        set_gauge('browsers_active', self.active)
+    
+    def acquire(self, priority, timeout=None):
+        """Wait for a slot; False if timeout ran out first"""
+        started = time.time()
+        entry = (priority + started / BROWSER_AGING_SECONDS, next(self._order), priority)
+        with self._cond:
+            self._waiting.append(entry)
+            self._publish()
+            try:
+                while True:
+                    if self._next() == entry and self.active < self.max_concurrent and self._memory_ok():
+                        self._waiting.remove(entry)
+                        self.active += 1
+                        self.active_by_class[priority] = self.active_by_class.get(priority, 0) + 1
+                        self._cond.notify_all()
+                        return True
+                    remaining = None if timeout is None else timeout - (time.time() - started)
+                    if remaining is not None and remaining <= 0:
+                        self._waiting.remove(entry)
+                        self._cond.notify_all()
+                        return False
+                    # Memory frees up without a release, so look again at least every second
+                    self._cond.wait(1 if remaining is None else min(1, remaining))
+            finally:
+                self._publish()
+                observe_histogram('browser_queue_wait_seconds', time.time() - started, priority=priority)
+    
+    def release(self, held_seconds, priority):
+        with self._cond:
+            self.active -= 1
+            self.active_by_class[priority] -= 1
+            self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held_seconds
+            self._publish()
+            self._cond.notify_all()
+    
+    @contextmanager
+    def slot(self, priority, timeout=None):
+        """Hold a slot for the block; yields False (and holds nothing) if none came free in time"""
+        if not self.acquire(priority, timeout):
+            yield False
+            return
+        started = time.time()
+        self._local.excluded = 0
+        try:
+            yield True
+        finally:
+            self.release(max(0, time.time() - started - self._local.excluded), priority)
+    
+    def exclude(self, seconds):
+        """Leave seconds of this thread's slot (a pre-warm hold) out of the slot-time estimate"""
+        self._local.excluded = getattr(self._local, 'excluded', 0) + seconds
+    
+    def saturation(self):
+        """(status, retry_after) when new interactive work should be refused, else None"""
+        with self._cond:
+            # Retries and backfill queue behind a new /post (give or take aging), so only count what is ahead
+            waiting = sum(1 for entry in self._waiting if entry[2] <= PRIORITY_INTERACTIVE)
+            retry_after = max(1, int((waiting + 1) * self._hold_seconds / self.max_concurrent))
+        if waiting >= BROWSER_QUEUE_LIMIT:
+            return 429, retry_after
+        if self.max_rss_mb and (browsers_rss_mb() or 0) >= self.max_rss_mb:
+            return 503, retry_after
+        return None
+    
+    def snapshot(self):
+        with self._cond:
+            classes = {name: {"active": self.active_by_class.get(priority, 0),
+                              "waiting": sum(1 for entry in self._waiting if entry[2] == priority),
+                              "limit": self.class_limits.get(priority)}
+                       for priority, name in PRIORITY_NAMES.items()}
+            return {"active": self.active, "waiting": len(self._waiting), "max_concurrent": self.max_concurrent,
+                    "max_rss_mb": self.max_rss_mb or None, "rss_mb": browsers_rss_mb(), "classes": classes}
+
+browser_governor = BrowserGovernor(BROWSER_MAX_CONCURRENT, BROWSER_MAX_RSS_MB, BROWSER_CLASS_LIMITS)
+
+def execution_priority(post, attempts):
+    """Governor class for a scheduled sub-job: retry, backfill when long overdue, else scheduled"""
+    if attempts:
+        return PRIORITY_RETRY
+    try:
+        overdue = (datetime.now() - datetime.fromisoformat(post['scheduled_time'])).total_seconds()
+    except (KeyError, ValueError):
+        return PRIORITY_SCHEDULED
+    return PRIORITY_BACKFILL if overdue > BACKFILL_AFTER_SECONDS else PRIORITY_SCHEDULED
+
+def browser_backpressure():
+    """(response, status) with Retry-After if the browser queue is saturated, else None"""
+    if APP_ROLE == 'web':
+        # The browsers live in the scheduler workers; judge by the posts already queued for them (about a minute each)
+        waiting = queued_commands('post')
+        nodes = max(1, len(worker_statuses()))
+        retry_after = max(1, int((waiting + 1) * 60 / (BROWSER_MAX_CONCURRENT * nodes)))
+        saturated = (429, retry_after) if waiting >= BROWSER_QUEUE_LIMIT * nodes else None
+    else:
+        saturated = browser_governor.saturation()
+    if not saturated:
+        return None
+    status, retry_after = saturated
+    inc_counter('browser_rejections_total', status=status)
+    reason = "Too many posts queued for a browser" if status == 429 else "Browsers are using all the memory allowed"
+    response = jsonify({"success": False, "message": f"{reason}; try again in {retry_after}s", "retry_after": retry_after})
+    response.headers['Retry-After'] = str(retry_after)
+    return response, status
+
+# Memory-saving Chrome flags, picked with CHROME_MEMORY_PROFILE. 'lean' only turns off
+# background services the posters never use; 'minimal' also caps renderers and caches.
+CHROME_MEMORY_PROFILES = {
+    'default': [],
+    'lean': ['--disable-extensions', '--disable-background-networking', '--disable-component-update',
+             '--disable-default-apps', '--disable-sync', '--no-first-run',
+             '--disable-features=Translate,MediaRouter,OptimizationHints'],
+}
+CHROME_MEMORY_PROFILES['minimal'] = CHROME_MEMORY_PROFILES['lean'] + [
+    '--renderer-process-limit=1', '--process-per-site', '--disable-site-isolation-trials',
+    '--disk-cache-size=1', '--media-cache-size=1', '--js-flags=--max-old-space-size=512']
+CHROME_MEMORY_PROFILE = os.environ.get('CHROME_MEMORY_PROFILE', 'lean')
+
+def get_chrome_driver(headless=True, platform=None):
     """Create Chrome driver with optimized settings for file uploads"""
+    trace_step('launch')
     options = Options()
     
-    # Critical: Keep headless mode OFF for file uploads to work reliably
+    # New headless runs the full browser; uploads go through CDP (see enable_headless_uploads)
     if headless:
         options.add_argument('--headless=new')
     
@@ -129,6 +1153,13 @@ def get_chrome_driver(headless=True):
     # Disable GPU for stability
     options.add_argument('--disable-gpu')
     
+    for flag in CHROME_MEMORY_PROFILES.get(CHROME_MEMORY_PROFILE, CHROME_MEMORY_PROFILES['lean']):
+        options.add_argument(flag)
+    
+    profile_dir = account_profile_dir(platform or current_platform())
+    if profile_dir:
+        options.add_argument(f'--user-data-dir={profile_dir}')
+    
     # Allow file access (CRITICAL for file uploads)
     options.add_argument('--allow-file-access-from-files')
     options.add_argument('--enable-local-file-accesses')
@@ -144,127 +1175,754 @@ def get_chrome_driver(headless=True):
     options.add_experimental_option("prefs", prefs)
     
     driver = webdriver.Chrome(options=options)
+    track_commands(driver)
+    watch_driver(driver, current_platform() or 'check')
+    quit_driver = driver.quit
+    
+    def quit_and_forget():
+        forget_driver(driver)
+        quit_driver()
+    driver.quit = quit_and_forget
     
     # Set page load timeout
     driver.set_page_load_timeout(60)
     
+    # In-page waits (wait_for_element_js) run as async scripts
+    driver.set_script_timeout(60)
+    
+    driver.headless = headless
+    if headless:
+        enable_headless_uploads(driver)
+    
+    trace = getattr(_trace_local, 'trace', None)
+    if trace is not None:
+        trace['drivers'].append(driver)
+        # The poster's quit() is deferred to finish_post_trace so a failed run can still be captured
+        driver._quit_now = driver.quit
+        driver.quit = lambda: None
+    
     return driver
 
+# Sites often open the picker by calling click() on a file input that was never
+# attached to the document. Attach such inputs (hidden) so the upload helpers can find them.
+_ATTACH_DETACHED_FILE_INPUTS_JS = """
+(function () {
+    var originalClick = HTMLInputElement.prototype.click;
+    HTMLInputElement.prototype.click = function () {
+        if (this.type === 'file' && !this.isConnected) {
+            this.style.display = 'none';
+            (document.body || document.documentElement).appendChild(this);
+        }
+        return originalClick.apply(this, arguments);
+    };
+})();
+"""
+
+def enable_headless_uploads(driver):
+    """Stop native file choosers from opening and expose detached file inputs via CDP"""
+    try:
+        driver.execute_cdp_cmd('Page.enable', {})
+        driver.execute_cdp_cmd('Page.setInterceptFileChooserDialog', {'enabled': True})
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': _ATTACH_DETACHED_FILE_INPUTS_JS})
+        return True
+    except Exception as e:
+        log.warning("Could not enable headless uploads: %s", e)
+        return False
+
+def cdp_set_file_input(driver, index, absolute_path):
+    """Set the index-th file input's files through DevTools; works without a display or native dialog"""
+    result = driver.execute_cdp_cmd('Runtime.evaluate', {
+        'expression': f"document.querySelectorAll(\"input[type='file']\")[{int(index)}]"
+    })
+    object_id = result.get('result', {}).get('objectId')
+    if not object_id:
+        raise NoSuchElementException(f"File input #{index} not found via CDP")
+    driver.execute_cdp_cmd('DOM.setFileInputFiles', {'files': [absolute_path], 'objectId': object_id})
+    return True
+
+def driver_rss_mb(driver):
+    """Resident memory of chromedriver plus every Chrome process it spawned, in MB"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except Exception:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+# Chrome memory watchdog: every live driver is sampled every CHROME_WATCHDOG_INTERVAL seconds
+# (needs psutil) and exported as chrome_driver_rss_mb. Drivers are never reused between posts,
+# so recycling happens one level up: a worker process whose driver went past CHROME_MAX_RSS_MB
+# is replaced once its post finishes (see PosterWorkerPool).
+CHROME_WATCHDOG_INTERVAL = float(os.environ.get('CHROME_WATCHDOG_INTERVAL', '5'))
+CHROME_MAX_RSS_MB = float(os.environ.get('CHROME_MAX_RSS_MB', '1500'))
+
+_live_drivers_lock = threading.Lock()
+_live_drivers = {}
+_watchdog_thread = None
+_recycle_reason = None
+
+def watch_driver(driver, platform):
+    """Start sampling a new driver's memory"""
+    global _watchdog_thread
+    try:
+        pid = driver.service.process.pid
+    except Exception:
+        pid = None
+    with _live_drivers_lock:
+        _live_drivers[id(driver)] = {'driver': driver, 'platform': platform, 'pid': pid,
+                                     'rss_mb': None, 'peak_rss_mb': None, 'over_limit': False}
+        if PSUTIL_AVAILABLE and _watchdog_thread is None:
+            _watchdog_thread = threading.Thread(target=_watchdog_loop, name='chrome-watchdog', daemon=True)
+            _watchdog_thread.start()
+
+def forget_driver(driver):
+    """Stop sampling a driver that is quitting; returns its peak RSS in MB"""
+    with _live_drivers_lock:
+        entry = _live_drivers.pop(id(driver), None)
+    if entry is None:
+        return None
+    _report_memory(entry, None)
+    if entry['peak_rss_mb'] is not None:
+        set_gauge('chrome_driver_peak_rss_mb', round(entry['peak_rss_mb'], 1), platform=entry['platform'])
+    return entry['peak_rss_mb']
+
+def sample_driver(driver):
+    """Sample one driver now; returns its peak RSS so far in MB (None without psutil)"""
+    global _recycle_reason
+    with _live_drivers_lock:
+        entry = _live_drivers.get(id(driver))
+    if entry is None:
+        return None
+    rss = driver_rss_mb(driver)
+    if rss is None:
+        return entry['peak_rss_mb']
+    entry['rss_mb'] = rss
+    entry['peak_rss_mb'] = max(rss, entry['peak_rss_mb'] or 0)
+    if rss > CHROME_MAX_RSS_MB and not entry['over_limit']:
+        entry['over_limit'] = True
+        _recycle_reason = {'kind': 'memory', 'detail': f"{entry['platform']} driver reached {rss:.0f} MB"}
+        log.warning("Chrome for %s is using %.0f MB (limit %.0f MB)", entry['platform'], rss, CHROME_MAX_RSS_MB)
+    _report_memory(entry, rss)
+    return entry['peak_rss_mb']
+
+def _report_memory(entry, rss):
+    # In a poster worker the parent exports the gauge; rss None means the driver is gone
+    if _worker_send is not None:
+        _worker_send({'type': 'memory', 'platform': entry['platform'], 'pid': entry['pid'], 'rss_mb': rss})
+    else:
+        export_driver_memory(entry['platform'], entry['pid'], rss)
+
+def export_driver_memory(platform, pid, rss):
+    if rss is None:
+        clear_gauge('chrome_driver_rss_mb', platform=platform, pid=pid)
+    else:
+        set_gauge('chrome_driver_rss_mb', round(rss, 1), platform=platform, pid=pid)
+
+def _watchdog_loop():
+    while True:
+        time.sleep(CHROME_WATCHDOG_INTERVAL)
+        with _live_drivers_lock:
+            drivers = [entry['driver'] for entry in _live_drivers.values()]
+        for driver in drivers:
+            try:
+                sample_driver(driver)
+            except Exception as e:
+                log.debug("Memory sample failed: %s", e)
+
+def track_commands(driver):
+    """Count every WebDriver HTTP command the driver sends, overall and per step"""
+    driver.command_count = 0
+    driver.step_commands = {}
+    driver.step_stack = []
+    original_execute = driver.execute
+    
+    def counted_execute(driver_command, params=None):
+        driver.command_count += 1
+        if driver.step_stack:
+            # Steps nest (an upload clicks and waits), so only the innermost one gets the command
+            step = driver.step_stack[-1]
+            driver.step_commands[step] = driver.step_commands.get(step, 0) + 1
+        return original_execute(driver_command, params)
+    
+    driver.execute = counted_execute
+    return driver
+
+@contextmanager
+def count_step(driver, step):
+    """Attribute the commands sent inside the block (outside nested steps) to step and time it"""
+    stack = getattr(driver, 'step_stack', None)
+    if stack is not None:
+        stack.append(step)
+    started = time.time()
+    try:
+        yield
+    finally:
+        observe_histogram('poster_helper_seconds', time.time() - started, platform=current_platform(), helper=step)
+        if stack is not None:
+            stack.pop()
+
+def print_command_summary(driver):
+    """Print total and per-step WebDriver command counts for a posting run"""
+    if not hasattr(driver, 'command_count') or not log.isEnabledFor(logging.DEBUG):
+        return
+    steps = ", ".join(f"{step}={count}" for step, count in driver.step_commands.items())
+    log.debug("WebDriver commands: %s total (%s)", driver.command_count, steps)
+
+# Accounts: each brand is an account with its own sign-in per platform, either a cookie set
+# (ACCOUNTS_DIR/<account>/<platform>_cookies.json) or a Chrome profile that stays signed in
+# (ACCOUNTS_DIR/<account>/<platform>_profile/). The 'default' account is the files next to
+# app.py, where the get_*_cookies.py scripts save them. Posts carry the account they go out as;
+# one account's runs of a site are serialized, on every node sharing WORK_QUEUE_DB (through a
+# lease, polled every ACCOUNT_LEASE_POLL_SECONDS), while different accounts run side by side.
+# ACCOUNTS_DIR, DEFAULT_ACCOUNT, ACCOUNT_NAME and account_file() come from account_paths.py.
+ACCOUNT_LEASE_POLL_SECONDS = float(os.environ.get('ACCOUNT_LEASE_POLL_SECONDS', '1'))
+_account_local = threading.local()
+_account_sessions_lock = threading.Lock()
+_account_sessions = {}
+
+def current_account():
+    return getattr(_account_local, 'account', None) or DEFAULT_ACCOUNT
+
+@contextmanager
+def use_account(account):
+    """Post as account in this thread inside the block"""
+    previous = getattr(_account_local, 'account', None)
+    _account_local.account = account
+    try:
+        yield
+    finally:
+        _account_local.account = previous
+
+def account_site(platform):
+    """YouTube posts and videos sign in with the same session"""
+    return 'youtube' if platform == 'youtubepost' else platform
+
+def account_profile_dir(platform, account=None):
+    """The account's Chrome profile for a platform, or None to use a throwaway one"""
+    if not platform:
+        return None
+    path = account_file(account or current_account(), f"{account_site(platform)}_profile")
+    return os.path.abspath(path) if os.path.isdir(path) else None
+
+def list_accounts():
+    """{account: [platforms it has a cookie set or profile for]}"""
+    names = [DEFAULT_ACCOUNT]
+    if os.path.isdir(ACCOUNTS_DIR):
+        names += sorted(name for name in os.listdir(ACCOUNTS_DIR) if name != DEFAULT_ACCOUNT
+                        and ACCOUNT_NAME.match(name) and os.path.isdir(os.path.join(ACCOUNTS_DIR, name)))
+    return {name: [p for p in PLATFORMS
+                   if os.path.exists(account_file(name, f"{account_site(p)}_cookies.json")) or account_profile_dir(p, name)]
+            for name in names}
+
+def known_account(account):
+    return account == DEFAULT_ACCOUNT or (bool(ACCOUNT_NAME.match(account))
+                                          and os.path.isdir(os.path.join(ACCOUNTS_DIR, account)))
+
+@contextmanager
+def account_session(platform):
+    """Hold the current account's session for a site; a profile can only be open in one Chrome.
+    Yields False if another node kept it for BROWSER_QUEUE_TIMEOUT"""
+    account, site = current_account(), account_site(platform)
+    with _account_sessions_lock:
+        lock = _account_sessions.setdefault((account, site), threading.RLock())
+    with lock:
+        name = f"account/{account}/{site}"
+        held = getattr(_account_local, 'leases', None)
+        if held is None:
+            held = _account_local.leases = set()
+        if name in held:
+            yield True
+            return
+        deadline = time.time() + BROWSER_QUEUE_TIMEOUT
+        while not acquire_lease(name):
+            if time.time() >= deadline:
+                log.warning("Another node kept the %s session of %s for %.0fs", site, account, BROWSER_QUEUE_TIMEOUT)
+                yield False
+                return
+            time.sleep(ACCOUNT_LEASE_POLL_SECONDS)
+        held.add(name)
+        try:
+            yield True
+        finally:
+            held.discard(name)
+            release_lease(name)
+
+@contextmanager
+def account_browser(platform, priority):
+    """The account's session for a site, then a browser slot; yields False if either did not come free in time"""
+    with account_session(platform) as signed_in:
+        if not signed_in:
+            yield False
+            return
+        with browser_governor.slot(priority, BROWSER_QUEUE_TIMEOUT) as admitted:
+            yield admitted
+
 def load_cookies(driver, platform):
-    """Load cookies from JSON file"""
-    cookie_file = f"{platform}_cookies.json"
+    """Load the current account's cookies for a platform from its JSON file"""
+    trace_step('cookies')
+    cookie_file = account_file(current_account(), f"{platform}_cookies.json")
     if not os.path.exists(cookie_file):
-        return False
+        # A profile keeps its own session, so the cookie set is optional then
+        return account_profile_dir(platform) is not None
     
     try:
         with open(cookie_file, 'r') as f:
             cookies = json.load(f)
         
+        failed = []
         for cookie in cookies:
             try:
                 driver.add_cookie(cookie)
-            except Exception as e:
-                print(f"Error adding cookie: {e}")
+            except Exception:
+                failed.append(cookie.get('name', '?'))
+        if failed:
+            log.debug("Skipped %s of %s cookies: %s", len(failed), len(cookies), ', '.join(failed))
         return True
     except Exception as e:
-        print(f"Error loading cookies: {e}")
+        log.warning("Error loading cookies: %s", e)
         return False
 
 def safe_click(driver, element, method="default"):
     """Safely click an element using multiple methods"""
-    try:
-        if method == "default":
-            element.click()
-        elif method == "js":
-            driver.execute_script("arguments[0].click();", element)
-        elif method == "action":
-            ActionChains(driver).move_to_element(element).click().perform()
-        return True
-    except Exception as e:
-        print(f"Click method '{method}' failed: {e}")
+    with count_step(driver, 'click'):
+        try:
+            if method == "default":
+                element.click()
+            elif method == "js":
+                result = dom_click(driver, element)
+                if not result.get('clicked'):
+                    raise WebDriverException(result.get('error', 'element not clickable'))
+            elif method == "action":
+                ActionChains(driver).move_to_element(element).click().perform()
+            return True
+        except Exception as e:
+            log.debug("Click method '%s' failed: %s", method, e)
+            return False
+
+def _to_locator(selector):
+    """Turn a selector string into a (By, value) locator; XPath unless it looks like CSS"""
+    if isinstance(selector, tuple):
+        return selector
+    if selector.startswith('/') or selector.startswith('('):
+        return (By.XPATH, selector)
+    return (By.CSS_SELECTOR, selector)
+
+def _any_element(locators, condition):
+    """Expected condition that checks every locator on each poll, in priority order"""
+    def _check(driver):
+        for locator in locators:
+            try:
+                for element in driver.find_elements(*locator):
+                    if condition == 'present':
+                        return element
+                    if not element.is_displayed():
+                        continue
+                    if condition == 'clickable' and not element.is_enabled():
+                        continue
+                    return element
+            except Exception:
+                continue
         return False
+    return _check
+
+# Resolves with the first matching element, or null after the timeout. Runs
+# entirely in the page: a MutationObserver re-checks on every DOM/attribute
+# change, with a slow interval as a backstop for CSS-only visibility changes.
+_WAIT_FOR_ELEMENT_JS = """
+var locators = arguments[0], condition = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var finished = false, observer = null, backstop = null, timer = null;
+
+function matches(locator) {
+    if (locator[0] === 'xpath') {
+        var snap = document.evaluate(locator[1], document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var out = [];
+        for (var i = 0; i < snap.snapshotLength; i++) { out.push(snap.snapshotItem(i)); }
+        return out;
+    }
+    return Array.prototype.slice.call(document.querySelectorAll(locator[1]));
+}
+
+function ready(el) {
+    if (condition === 'present') { return true; }
+    var style = window.getComputedStyle(el);
+    if (!el.getClientRects().length || style.visibility === 'hidden') { return false; }
+    if (condition === 'clickable') {
+        return !el.disabled && el.getAttribute('aria-disabled') !== 'true';
+    }
+    return true;
+}
+
+function check() {
+    for (var i = 0; i < locators.length; i++) {
+        var found;
+        try { found = matches(locators[i]); } catch (e) { continue; }
+        for (var j = 0; j < found.length; j++) {
+            if (ready(found[j])) { return found[j]; }
+        }
+    }
+    return null;
+}
+
+function finish(el) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearInterval(backstop);
+    clearTimeout(timer);
+    done(el);
+}
+
+var first = check();
+if (first) { finish(first); return; }
+
+observer = new MutationObserver(function () {
+    var el = check();
+    if (el) { finish(el); }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+backstop = setInterval(function () {
+    var el = check();
+    if (el) { finish(el); }
+}, 250);
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+def wait_for_element_js(driver, selectors, timeout=10, condition='clickable'):
+    """Wait in-page with a MutationObserver; a single execute_async_script round trip.
+
+    Returns the element or None on timeout. Raises WebDriverException if the
+    script could not run (navigation, script timeout, CSP), so callers can fall
+    back to polling.
+    """
+    locators = []
+    for by, value in (_to_locator(s) for s in selectors):
+        locators.append(['xpath' if by == By.XPATH else 'css', value])
+    return driver.execute_async_script(_WAIT_FOR_ELEMENT_JS, locators, condition, int(timeout * 1000))
+
+# Adaptive timeouts: every wait's coded timeout is only its default. Once a wait has
+# TIMEOUT_MIN_SAMPLES successful observations for a platform, its budget becomes the
+# TIMEOUT_PERCENTILE latency times TIMEOUT_MARGIN, clamped between a floor and
+# TIMEOUT_CEILING_FACTOR x the default. Waits are keyed by platform and "<step>/<name>".
+# After a timeout the wait falls back to its default until it succeeds again. Nodes sharing the
+# performance folder pool their samples: each save merges this node's new samples into the file
+# under a file lock, re-reading it first if another node has written it since.
+ADAPTIVE_TIMEOUTS = os.environ.get('ADAPTIVE_TIMEOUTS', '1') != '0'
+TIMEOUT_PERCENTILE = 95
+TIMEOUT_MARGIN = float(os.environ.get('TIMEOUT_MARGIN', '1.5'))
+TIMEOUT_MIN_SAMPLES = 20
+TIMEOUT_FLOOR_SECONDS = 3
+TIMEOUT_CEILING_FACTOR = 3
+TIMEOUT_SAMPLES_KEPT = 200
+
+_wait_lock = threading.Lock()
+_wait_file_lock = StoreLock(os.path.join(app.config['PERFORMANCE_FOLDER'], 'wait_samples.json.lock'))
+_wait_samples = None
+_wait_stamp = None
+_wait_pending = {}
+_wait_defaults = {}
+_wait_misses = set()
+_worker_waits = []
+
+def _wait_samples_path():
+    return os.path.join(app.config['PERFORMANCE_FOLDER'], 'wait_samples.json')
+
+def _read_wait_samples():
+    samples = {}
+    try:
+        with open(_wait_samples_path(), 'r') as f:
+            for platform, waits in json.load(f).items():
+                for key, values in waits.items():
+                    samples[(platform, key)] = deque(values, maxlen=TIMEOUT_SAMPLES_KEPT)
+    except (OSError, ValueError):
+        pass
+    return samples
+
+def _load_wait_samples():
+    """Observed wait latencies keyed by (platform, wait key); call with _wait_lock held"""
+    global _wait_samples, _wait_stamp
+    if _wait_samples is None:
+        _wait_stamp = _file_stamp(_wait_samples_path())
+        _wait_samples = _read_wait_samples()
+    return _wait_samples
+
+def save_wait_samples():
+    """Persist the observed wait latencies so budgets survive restarts, merged with other nodes'"""
+    global _wait_samples, _wait_stamp
+    try:
+        os.makedirs(app.config['PERFORMANCE_FOLDER'], exist_ok=True)
+        with _wait_file_lock, _wait_lock:
+            if not _wait_pending:
+                return
+            samples = _load_wait_samples()
+            if _file_stamp(_wait_samples_path()) != _wait_stamp:
+                # Another node saved since: start from its file and add what was observed here
+                samples = _read_wait_samples()
+                for key, values in _wait_pending.items():
+                    samples.setdefault(key, deque(maxlen=TIMEOUT_SAMPLES_KEPT)).extend(values)
+                _wait_samples = samples
+            data = {}
+            for (platform, key), values in samples.items():
+                data.setdefault(platform, {})[key] = [round(s, 3) for s in values]
+            with open(_wait_samples_path() + '.tmp', 'w') as f:
+                json.dump(data, f)
+            os.replace(_wait_samples_path() + '.tmp', _wait_samples_path())
+            _wait_stamp = _file_stamp(_wait_samples_path())
+            _wait_pending.clear()
+    except OSError as e:
+        log.warning("Could not save wait samples: %s", e)
+
+def wait_key(name):
+    """'<current step>/<name>' for the wait being started"""
+    trace = getattr(_trace_local, 'trace', None)
+    return f"{trace['step'] if trace else '-'}/{name}"
+
+def _budget(samples, default):
+    if len(samples) < TIMEOUT_MIN_SAMPLES:
+        return default
+    ordered = sorted(samples)
+    high = ordered[min(len(ordered) - 1, int(len(ordered) * TIMEOUT_PERCENTILE / 100))]
+    floor = min(TIMEOUT_FLOOR_SECONDS, default)
+    return round(min(max(high * TIMEOUT_MARGIN, floor), default * TIMEOUT_CEILING_FACTOR), 2)
+
+def timeout_budget(key, default):
+    """Timeout to use for a wait on the current platform; the default until enough history exists"""
+    platform = current_platform()
+    if not ADAPTIVE_TIMEOUTS or platform is None:
+        return default
+    with _wait_lock:
+        _wait_defaults[(platform, key)] = default
+        samples = list(_load_wait_samples().get((platform, key), ()))
+        missed = (platform, key) in _wait_misses
+    return max(_budget(samples, default), default) if missed else _budget(samples, default)
+
+def observe_wait(key, seconds, found=True):
+    """Record how long a successful wait took on the current platform, or that it timed out"""
+    platform = current_platform()
+    if platform is None:
+        return
+    if POSTER_WORKER:
+        _worker_waits.append([key, seconds, found])
+    _record_wait(platform, key, seconds, found)
+
+def _record_wait(platform, key, seconds, found):
+    with _wait_lock:
+        if not found:
+            _wait_misses.add((platform, key))
+            return
+        _wait_misses.discard((platform, key))
+        samples = _load_wait_samples()
+        if (platform, key) not in samples:
+            samples[(platform, key)] = deque(maxlen=TIMEOUT_SAMPLES_KEPT)
+        samples[(platform, key)].append(seconds)
+        _wait_pending.setdefault((platform, key), deque(maxlen=TIMEOUT_SAMPLES_KEPT)).append(seconds)
+
+def timeout_budgets():
+    """Current budget, default and sample stats for every wait seen so far"""
+    with _wait_lock:
+        entries = {k: list(v) for k, v in _load_wait_samples().items()}
+        defaults = dict(_wait_defaults)
+    budgets = {}
+    for (platform, key) in sorted(set(entries) | set(defaults)):
+        samples = entries.get((platform, key), [])
+        default = defaults.get((platform, key))
+        ordered = sorted(samples)
+        budgets.setdefault(platform, {})[key] = {
+            'default': default,
+            'budget': _budget(samples, default) if default is not None else None,
+            'samples': len(samples),
+            'p50': round(ordered[len(ordered) // 2], 3) if ordered else None,
+            'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3) if ordered else None
+        }
+    return budgets
+
+class AdaptiveWait(WebDriverWait):
+    """WebDriverWait whose timeout is the learned budget for this platform, step and wait name"""
+    
+    def __init__(self, driver, name, default):
+        self.key = wait_key(name)
+        super().__init__(driver, timeout_budget(self.key, default))
+    
+    def until(self, method, message=''):
+        started = time.time()
+        try:
+            value = super().until(method, message)
+        except TimeoutException:
+            observe_wait(self.key, None, found=False)
+            raise
+        observe_wait(self.key, time.time() - started)
+        return value
+
+def wait_for_any(driver, selectors, timeout=10, condition='clickable', use_observer=True, name=None):
+    """Wait for whichever selector matches first; returns the element or None.
+
+    All candidates are watched by a single wait, so the worst case is one
+    timeout instead of one per selector. condition is 'present', 'visible'
+    or 'clickable'. Earlier selectors win when several match at once. The
+    in-page observer is tried first; WebDriverWait polling covers whatever
+    time is left if the script fails. timeout is the default budget; the
+    adaptive budget for name (first selector if omitted) replaces it.
+    """
+    key = wait_key(name or selectors[0])
+    budget = timeout_budget(key, timeout)
+    with count_step(driver, 'wait'):
+        started = time.time()
+        element = _wait_for_any(driver, selectors, budget, condition, use_observer)
+    elapsed = time.time() - started
+    observe_wait(key, elapsed, found=element is not None)
+    record_event('wait', selectors=list(selectors), condition=condition, timeout=budget,
+                 found=element is not None, seconds=round(elapsed, 3))
+    return element
+
+def _wait_for_any(driver, selectors, timeout, condition, use_observer):
+    deadline = time.time() + timeout
+    if use_observer:
+        try:
+            return wait_for_element_js(driver, selectors, timeout, condition)
+        except WebDriverException as e:
+            log.debug("Observer wait failed, polling instead: %s", e.__class__.__name__)
+    
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        return None
+    
+    locators = [_to_locator(s) for s in selectors]
+    try:
+        return WebDriverWait(driver, remaining).until(_any_element(locators, condition))
+    except TimeoutException:
+        return None
+
+# Batched DOM helpers: each does its locate/unhide/scroll/click work in a single
+# injected script and returns a plain dict, so a step costs one round trip.
+
+_CLICK_JS = """
+var el = arguments[0], scroll = arguments[1];
+try {
+    if (scroll) { el.scrollIntoView({block: 'center'}); }
+    el.click();
+    return {clicked: true, tag: el.tagName.toLowerCase(), text: (el.innerText || '').slice(0, 40)};
+} catch (e) {
+    return {clicked: false, error: String(e)};
+}
+"""
+
+_FOCUS_JS = """
+var el = arguments[0];
+el.scrollIntoView({block: 'center'});
+el.focus();
+el.click();
+return {focused: document.activeElement === el || el.contains(document.activeElement)};
+"""
+
+_UNHIDE_FILE_INPUTS_JS = """
+var inputs = Array.prototype.slice.call(document.querySelectorAll("input[type='file']"));
+inputs.forEach(function (input) {
+    input.style.opacity = '1';
+    input.style.display = 'block';
+    input.style.visibility = 'visible';
+    input.style.height = 'auto';
+    input.style.width = 'auto';
+    input.removeAttribute('hidden');
+});
+return {count: inputs.length, inputs: inputs};
+"""
+
+def dom_click(driver, element, scroll=True):
+    """Scroll an element into view and click it in one script; returns {'clicked': bool, ...}"""
+    return driver.execute_script(_CLICK_JS, element, scroll) or {'clicked': False}
+
+def dom_focus(driver, element):
+    """Scroll to, focus and click an input in one script, ready for typing"""
+    return driver.execute_script(_FOCUS_JS, element) or {'focused': False}
+
+def dom_unhide_file_inputs(driver):
+    """Locate every file input and make it interactable; returns {'count': n, 'inputs': [...]}"""
+    return driver.execute_script(_UNHIDE_FILE_INPUTS_JS) or {'count': 0, 'inputs': []}
 
 def find_and_upload_file(driver, file_path, wait_time=15):
     """Universal file upload function with multiple strategies"""
-    print(f"\n🔍 Searching for file input...")
-    print(f"📁 File to upload: {file_path}")
-    print(f"📊 File exists: {os.path.exists(file_path)}")
+    log.debug("Searching for file input")
     
     if not os.path.exists(file_path):
-        print(f"❌ File does not exist: {file_path}")
+        log.error("File does not exist: %s", file_path)
         return False
     
     # Convert to absolute path
     absolute_path = os.path.abspath(file_path)
-    print(f"📍 Absolute path: {absolute_path}")
+    log.debug("Uploading %s", absolute_path)
     
-    try:
-        # Strategy 1: Look for visible file inputs
-        file_inputs = driver.find_elements(By.XPATH, "//input[@type='file']")
-        print(f"Found {len(file_inputs)} file input(s)")
-        
-        for idx, file_input in enumerate(file_inputs):
-            try:
-                # Make input visible if hidden
-                driver.execute_script("""
-                    arguments[0].style.opacity = '1';
-                    arguments[0].style.display = 'block';
-                    arguments[0].style.visibility = 'visible';
-                    arguments[0].style.height = 'auto';
-                    arguments[0].style.width = 'auto';
-                    arguments[0].removeAttribute('hidden');
-                """, file_input)
+    with count_step(driver, 'upload'):
+        try:
+            # Strategy 1: Unhide every file input already on the page (one script)
+            found = dom_unhide_file_inputs(driver)
+            log.debug("Found %s file input(s)", found['count'])
+            
+            for idx, file_input in enumerate(found['inputs']):
+                try:
+                    file_input.send_keys(absolute_path)
+                    log.info("File uploaded via input #%s", idx)
+                    return True
+                except Exception as e:
+                    log.warning("Input #%s failed: %s", idx, e)
                 
-                # Send file path
-                file_input.send_keys(absolute_path)
-                print(f"✅ File uploaded via input #{idx}")
-                return True
-            except Exception as e:
-                print(f"⚠️  Input #{idx} failed: {e}")
-                continue
-        
-        # Strategy 2: Wait for new file input to appear
-        print("Waiting for file input to appear...")
-        file_input = WebDriverWait(driver, wait_time).until(
-            EC.presence_of_element_located((By.XPATH, "//input[@type='file']"))
-        )
-        
-        # Ensure it's interactable
-        driver.execute_script("""
-            arguments[0].style.opacity = '1';
-            arguments[0].style.display = 'block';
-            arguments[0].style.visibility = 'visible';
-        """, file_input)
-        
-        file_input.send_keys(absolute_path)
-        print(f"✅ File uploaded via waited input")
-        return True
-        
-    except Exception as e:
-        print(f"❌ All file upload strategies failed: {e}")
-        return False
+                if getattr(driver, 'headless', False):
+                    try:
+                        cdp_set_file_input(driver, idx, absolute_path)
+                        log.info("File uploaded via CDP on input #%s", idx)
+                        return True
+                    except Exception as e:
+                        log.warning("CDP upload on input #%s failed: %s", idx, e)
+            
+            # Strategy 2: Wait for a file input to appear, then unhide it
+            log.debug("Waiting for file input to appear")
+            if not wait_for_any(driver, ["//input[@type='file']"], timeout=wait_time, condition='present'):
+                raise TimeoutException("No file input appeared")
+            
+            found = dom_unhide_file_inputs(driver)
+            if not found['inputs']:
+                raise NoSuchElementException("File input disappeared")
+            
+            found['inputs'][0].send_keys(absolute_path)
+            log.info("File uploaded via waited input")
+            return True
+            
+        except Exception as e:
+            log.error("All file upload strategies failed: %s", e)
+            return False
 
 def post_to_linkedin(caption, image_path=None, headless=False):
     """Post to LinkedIn - FIXED for Chrome updates"""
     driver = get_chrome_driver(headless=headless)
     
     try:
-        print("\n=== LinkedIn Posting ===")
-        driver.get('https://www.linkedin.com')
+        log.info("LinkedIn posting started")
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['linkedin']['home'])
         time.sleep(2)
         
         if not load_cookies(driver, 'linkedin'):
             return {"success": False, "message": "LinkedIn cookies not found"}
         
-        driver.get('https://www.linkedin.com/feed/')
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['linkedin']['app'])
         time.sleep(4)
         
         if 'login' in driver.current_url.lower():
             return {"success": False, "message": "LinkedIn authentication failed"}
         
-        print("✓ Logged in")
+        log.info("Logged in")
         
         # Click Start a post
+        trace_step('open_composer')
         try:
             start_post_selectors = [
                 "//button[contains(@class, 'artdeco-button') and contains(., 'Start a post')]",
@@ -272,35 +1930,23 @@ def post_to_linkedin(caption, image_path=None, headless=False):
                 ".share-box-feed-entry__trigger"
             ]
             
-            start_post = None
-            for selector in start_post_selectors:
-                try:
-                    if selector.startswith('.'):
-                        start_post = WebDriverWait(driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                    else:
-                        start_post = WebDriverWait(driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                    break
-                except:
-                    continue
+            start_post = wait_for_any(driver, start_post_selectors, timeout=5)
             
             if not start_post:
                 return {"success": False, "message": "Could not find post button"}
             
             safe_click(driver, start_post, "js")
             time.sleep(3)
-            print("✓ Opened post dialog")
+            log.info("Opened post dialog")
             
         except Exception as e:
             return {"success": False, "message": f"Error opening post dialog: {str(e)}"}
         
         # Upload image if provided
+        trace_step('upload')
         if image_path and os.path.exists(image_path):
             try:
-                print("📸 Uploading image...")
+                log.info("Uploading image")
                 
                 # Click media button
                 media_button_selectors = [
@@ -309,29 +1955,21 @@ def post_to_linkedin(caption, image_path=None, headless=False):
                     "//button[contains(., 'Photo')]"
                 ]
                 
-                media_button = None
-                for selector in media_button_selectors:
-                    try:
-                        media_button = WebDriverWait(driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        break
-                    except:
-                        continue
+                media_button = wait_for_any(driver, media_button_selectors, timeout=5)
                 
                 if media_button:
                     safe_click(driver, media_button, "js")
                     time.sleep(2)
-                    print("✓ Media button clicked")
+                    log.info("Media button clicked")
                     
                     # Upload file
                     if find_and_upload_file(driver, image_path, wait_time=10):
-                        print("✓ Image uploaded")
+                        log.info("Image uploaded")
                         time.sleep(5)
                         
                         # Click Next if present
                         try:
-                            next_button = WebDriverWait(driver, 5).until(
+                            next_button = AdaptiveWait(driver, 'next_button', 5).until(
                                 EC.element_to_be_clickable((By.XPATH, "//button[.//span[contains(text(), 'Next')]]"))
                             )
                             safe_click(driver, next_button, "js")
@@ -339,12 +1977,13 @@ def post_to_linkedin(caption, image_path=None, headless=False):
                         except:
                             pass
                     else:
-                        print("⚠️  Image upload failed, continuing with text only")
+                        log.warning("Image upload failed, continuing with text only")
                 
             except Exception as e:
-                print(f"⚠️  Image upload error: {e}, continuing with text only")
+                log.warning("Image upload error: %s, continuing with text only", e)
         
         # Enter caption
+        trace_step('caption')
         try:
             caption_selectors = [
                 "//div[contains(@class, 'ql-editor') and @contenteditable='true']",
@@ -352,27 +1991,20 @@ def post_to_linkedin(caption, image_path=None, headless=False):
                 "//div[@data-placeholder='What do you want to talk about?']"
             ]
             
-            caption_box = None
-            for selector in caption_selectors:
-                try:
-                    caption_box = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    break
-                except:
-                    continue
+            caption_box = wait_for_any(driver, caption_selectors, timeout=5, condition='present')
             
             if caption_box:
                 caption_box.click()
                 time.sleep(1)
                 caption_box.send_keys(caption)
                 time.sleep(2)
-                print("✓ Caption entered")
+                log.info("Caption entered")
             
         except Exception as e:
-            print(f"⚠️  Caption entry error: {e}")
+            log.warning("Caption entry error: %s", e)
         
         # Click Post
+        trace_step('submit')
         try:
             post_button_selectors = [
                 "//button[.//span[contains(@class, 'artdeco-button__text') and text()='Post']]",
@@ -380,22 +2012,12 @@ def post_to_linkedin(caption, image_path=None, headless=False):
                 "//button[contains(., 'Post') and contains(@class, 'share-actions')]"
             ]
             
-            post_button = None
-            for selector in post_button_selectors:
-                try:
-                    post_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    break
-                except:
-                    continue
+            post_button = wait_for_any(driver, post_button_selectors, timeout=10)
             
             if post_button:
-                driver.execute_script("arguments[0].scrollIntoView(true);", post_button)
-                time.sleep(1)
                 safe_click(driver, post_button, "js")
                 time.sleep(5)
-                print("✓ Posted")
+                log.info("Posted")
                 return {"success": True, "message": "Posted to LinkedIn successfully"}
             else:
                 return {"success": False, "message": "Could not find post button"}
@@ -406,6 +2028,7 @@ def post_to_linkedin(caption, image_path=None, headless=False):
     except Exception as e:
         return {"success": False, "message": f"LinkedIn error: {str(e)}"}
     finally:
+        print_command_summary(driver)
         driver.quit()
 
 def post_to_twitter(caption, image_path=None, headless=False):
@@ -413,47 +2036,52 @@ def post_to_twitter(caption, image_path=None, headless=False):
     driver = get_chrome_driver(headless=headless)
     
     try:
-        print("\n=== Twitter Posting ===")
-        driver.get('https://twitter.com')
+        log.info("Twitter posting started")
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['twitter']['home'])
         time.sleep(2)
         
         if not load_cookies(driver, 'twitter'):
             return {"success": False, "message": "Twitter cookies not found"}
         
-        driver.get('https://twitter.com/home')
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['twitter']['app'])
         time.sleep(4)
         
         if 'login' in driver.current_url.lower():
             return {"success": False, "message": "Twitter authentication failed"}
         
-        print("✓ Logged in")
+        log.info("Logged in")
         
         # Click tweet box
+        trace_step('open_composer')
         try:
-            tweet_box = WebDriverWait(driver, 10).until(
+            tweet_box = AdaptiveWait(driver, 'tweet_box', 10).until(
                 EC.presence_of_element_located((By.XPATH, "//div[@data-testid='tweetTextarea_0']"))
             )
             tweet_box.click()
             time.sleep(2)
-            print("✓ Tweet box clicked")
+            log.info("Tweet box clicked")
         except:
             return {"success": False, "message": "Could not find tweet box"}
         
         # Upload image if provided
+        trace_step('upload')
         if image_path and os.path.exists(image_path):
             try:
-                print("📸 Uploading image...")
+                log.info("Uploading image")
                 
                 if find_and_upload_file(driver, image_path, wait_time=10):
-                    print("✓ Image uploaded")
+                    log.info("Image uploaded")
                     time.sleep(6)
                 else:
-                    print("⚠️  Image upload failed")
+                    log.warning("Image upload failed")
                     
             except Exception as e:
-                print(f"⚠️  Image upload error: {e}")
+                log.warning("Image upload error: %s", e)
         
         # Enter caption
+        trace_step('caption')
         try:
             tweet_box = driver.find_element(By.XPATH, "//div[@data-testid='tweetTextarea_0']")
             tweet_box.click()
@@ -464,18 +2092,19 @@ def post_to_twitter(caption, image_path=None, headless=False):
                 time.sleep(0.05)
             
             time.sleep(2)
-            print("✓ Caption entered")
+            log.info("Caption entered")
         except Exception as e:
-            print(f"⚠️  Caption entry error: {e}")
+            log.warning("Caption entry error: %s", e)
         
         # Click Tweet button
+        trace_step('submit')
         try:
-            tweet_button = WebDriverWait(driver, 10).until(
+            tweet_button = AdaptiveWait(driver, 'tweet_button', 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[@data-testid='tweetButtonInline']"))
             )
             safe_click(driver, tweet_button, "js")
             time.sleep(5)
-            print("✓ Posted")
+            log.info("Posted")
             
             return {"success": True, "message": "Posted to Twitter successfully"}
             
@@ -485,6 +2114,7 @@ def post_to_twitter(caption, image_path=None, headless=False):
     except Exception as e:
         return {"success": False, "message": f"Twitter error: {str(e)}"}
     finally:
+        print_command_summary(driver)
         driver.quit()
 
 def post_to_instagram(caption, image_path=None, headless=False):
@@ -495,22 +2125,25 @@ def post_to_instagram(caption, image_path=None, headless=False):
     driver = get_chrome_driver(headless=headless)
     
     try:
-        print("\n=== Instagram Posting ===")
-        driver.get('https://www.instagram.com')
+        log.info("Instagram posting started")
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['instagram']['home'])
         time.sleep(3)
         
         if not load_cookies(driver, 'instagram'):
             return {"success": False, "message": "Instagram cookies not found"}
         
-        driver.get('https://www.instagram.com')
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['instagram']['app'])
         time.sleep(5)
         
         if 'login' in driver.current_url.lower():
             return {"success": False, "message": "Instagram authentication failed"}
         
-        print("✓ Logged in")
+        log.info("Logged in")
         
         # Click Create
+        trace_step('open_composer')
         try:
             create_selectors = [
                 "//a[contains(@href, '/create/')]",
@@ -519,64 +2152,59 @@ def post_to_instagram(caption, image_path=None, headless=False):
                 "//span[text()='Create']/ancestor::a"
             ]
             
-            create_button = None
-            for selector in create_selectors:
-                try:
-                    create_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    break
-                except:
-                    continue
+            create_button = wait_for_any(driver, create_selectors, timeout=5)
             
             if not create_button:
                 return {"success": False, "message": "Could not find Create button"}
             
             safe_click(driver, create_button, "js")
             time.sleep(4)
-            print("✓ Create clicked")
+            log.info("Create clicked")
             
         except Exception as e:
             return {"success": False, "message": f"Error clicking create: {str(e)}"}
         
         # Upload image
+        trace_step('upload')
         try:
-            print("📸 Uploading image...")
+            log.info("Uploading image")
             
             if find_and_upload_file(driver, image_path, wait_time=10):
-                print("✓ Image uploaded")
+                log.info("Image uploaded")
                 time.sleep(6)
             else:
-                return {"success": False, "message": "Failed to upload image"}
+                return {"success": False, "message": "Failed to upload image", "upload_failed": True}
             
         except Exception as e:
-            return {"success": False, "message": f"Image upload error: {str(e)}"}
+            return {"success": False, "message": f"Image upload error: {str(e)}", "upload_failed": True}
         
         # Click Next (crop)
+        trace_step('edit')
         try:
-            next_button = WebDriverWait(driver, 15).until(
+            next_button = AdaptiveWait(driver, 'crop_next_button', 15).until(
                 EC.element_to_be_clickable((By.XPATH, "//div[@role='button' and text()='Next']"))
             )
             safe_click(driver, next_button, "js")
             time.sleep(4)
-            print("✓ First Next")
+            log.info("First Next")
         except Exception as e:
             return {"success": False, "message": f"First Next error: {str(e)}"}
         
         # Click Next (filter)
         try:
-            next_button = WebDriverWait(driver, 15).until(
+            next_button = AdaptiveWait(driver, 'filter_next_button', 15).until(
                 EC.element_to_be_clickable((By.XPATH, "//div[@role='button' and text()='Next']"))
             )
             safe_click(driver, next_button, "js")
             time.sleep(5)
-            print("✓ Second Next")
+            log.info("Second Next")
         except Exception as e:
             return {"success": False, "message": f"Second Next error: {str(e)}"}
         
         # Enter caption with improved method
+        trace_step('caption')
         try:
-            print("📝 Entering caption...")
+            log.info("Entering caption")
             time.sleep(3)
             
             caption_selectors = [
@@ -585,27 +2213,13 @@ def post_to_instagram(caption, image_path=None, headless=False):
                 "//p[@contenteditable='true']"
             ]
             
-            caption_input = None
-            for selector in caption_selectors:
-                try:
-                    caption_input = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    break
-                except:
-                    continue
+            caption_input = wait_for_any(driver, caption_selectors, timeout=10, condition='present')
             
             if not caption_input:
                 return {"success": False, "message": "Could not find caption input"}
             
-            # Scroll into view
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", caption_input)
-            time.sleep(1)
-            
-            # Focus and enter text
-            driver.execute_script("arguments[0].focus();", caption_input)
-            time.sleep(0.5)
-            caption_input.click()
+            # Scroll into view and focus
+            dom_focus(driver, caption_input)
             time.sleep(1)
             
             # Use JavaScript to set text reliably
@@ -632,22 +2246,32 @@ def post_to_instagram(caption, image_path=None, headless=False):
             
             # Verify
             current_text = driver.execute_script("return arguments[0].value || arguments[0].textContent || arguments[0].innerText;", caption_input)
-            print(f"✓ Caption verified: {current_text[:50]}...")
+            log.info("Caption verified: %s", current_text[:50])
             
         except Exception as e:
             return {"success": False, "message": f"Caption entry failed: {str(e)}"}
         
         # Click Share
+        trace_step('submit')
         try:
             time.sleep(2)
             
-            share_button = WebDriverWait(driver, 10).until(
+            share_button = AdaptiveWait(driver, 'share_button', 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//div[@role='button' and text()='Share']"))
             )
             
             safe_click(driver, share_button, "js")
-            time.sleep(8)
-            print("✓ Posted")
+            shared_at = time.time()
+            # Instagram confirms the share in the dialog; wait for that instead of a fixed 8 s
+            confirmation = ["//*[contains(text(), 'has been shared')]", "//img[@alt='Animated checkmark']"]
+            if not wait_for_any(driver, confirmation, timeout=8, condition='present', name='share_confirmation'):
+                # The text check is English-only and the budget adapts, so without a confirmation
+                # still give the share the old 8 s before the browser closes, and say it is unchecked
+                time.sleep(max(0, 8 - (time.time() - shared_at)))
+                log.warning("No share confirmation seen")
+                return {"success": True, "unverified": True,
+                        "message": "Shared on Instagram, but no confirmation was seen"}
+            log.info("Posted")
             
             return {"success": True, "message": "Posted to Instagram successfully"}
             
@@ -657,6 +2281,7 @@ def post_to_instagram(caption, image_path=None, headless=False):
     except Exception as e:
         return {"success": False, "message": f"Instagram error: {str(e)}"}
     finally:
+        print_command_summary(driver)
         driver.quit()
 
 def post_to_facebook(caption, image_path=None, headless=False):
@@ -664,75 +2289,81 @@ def post_to_facebook(caption, image_path=None, headless=False):
     driver = get_chrome_driver(headless=headless)
     
     try:
-        print("\n=== Facebook Posting ===")
-        driver.get('https://www.facebook.com')
+        log.info("Facebook posting started")
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['facebook']['home'])
         time.sleep(3)
         
         if not load_cookies(driver, 'facebook'):
             return {"success": False, "message": "Facebook cookies not found"}
         
-        driver.get('https://www.facebook.com')
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['facebook']['app'])
         time.sleep(5)
         
         if 'login' in driver.current_url.lower():
             return {"success": False, "message": "Facebook authentication failed"}
         
-        print("✓ Logged in")
+        log.info("Logged in")
         
         # Click post box
+        trace_step('open_composer')
         try:
-            post_box = WebDriverWait(driver, 10).until(
+            post_box = AdaptiveWait(driver, 'post_box', 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), \"What's on your mind\")]"))
             )
             post_box.click()
             time.sleep(5)
-            print("✓ Post box opened")
+            log.info("Post box opened")
         except:
             return {"success": False, "message": "Could not open post dialog"}
         
         # Enter caption
+        trace_step('caption')
         try:
-            caption_box = WebDriverWait(driver, 10).until(
+            caption_box = AdaptiveWait(driver, 'caption_box', 10).until(
                 EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true' and @role='textbox']"))
             )
             caption_box.click()
             time.sleep(1)
             caption_box.send_keys(caption)
             time.sleep(2)
-            print("✓ Caption entered")
+            log.info("Caption entered")
         except Exception as e:
-            print(f"⚠️  Caption error: {e}")
+            log.warning("Caption error: %s", e)
         
         # Upload image
+        trace_step('upload')
         if image_path and os.path.exists(image_path):
             try:
-                print("📸 Uploading image...")
+                log.info("Uploading image")
                 time.sleep(2)
                 
-                photo_button = WebDriverWait(driver, 10).until(
+                photo_button = AdaptiveWait(driver, 'photo_button', 10).until(
                     EC.element_to_be_clickable((By.XPATH, "//div[@aria-label='Photo/video']"))
                 )
                 safe_click(driver, photo_button, "js")
                 time.sleep(2)
                 
                 if find_and_upload_file(driver, image_path, wait_time=10):
-                    print("✓ Image uploaded")
+                    log.info("Image uploaded")
                     time.sleep(8)
                 else:
-                    print("⚠️  Image upload failed")
+                    log.warning("Image upload failed")
                     
             except Exception as e:
-                print(f"⚠️  Image upload error: {e}")
+                log.warning("Image upload error: %s", e)
         
         # Click Post
+        trace_step('submit')
         try:
             time.sleep(3)
-            post_button = WebDriverWait(driver, 10).until(
+            post_button = AdaptiveWait(driver, 'post_button', 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//span[text()='Post']/ancestor::div[@role='button']"))
             )
             safe_click(driver, post_button, "js")
             time.sleep(6)
-            print("✓ Posted")
+            log.info("Posted")
             
             return {"success": True, "message": "Posted to Facebook successfully"}
         except:
@@ -741,6 +2372,7 @@ def post_to_facebook(caption, image_path=None, headless=False):
     except Exception as e:
         return {"success": False, "message": f"Facebook error: {str(e)}"}
     finally:
+        print_command_summary(driver)
         driver.quit()
 
 def post_to_pinterest(title, image_path=None, link=None, description="", headless=False):
@@ -751,50 +2383,58 @@ def post_to_pinterest(title, image_path=None, link=None, description="", headles
     driver = get_chrome_driver(headless=headless)
     
     try:
-        print("\n=== Pinterest Posting ===")
-        driver.get('https://www.pinterest.com')
+        log.info("Pinterest posting started")
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['pinterest']['home'])
         time.sleep(3)
         
         if not load_cookies(driver, 'pinterest'):
             return {"success": False, "message": "Pinterest cookies not found"}
         
-        driver.get('https://www.pinterest.com')
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['pinterest']['app'])
         time.sleep(5)
         
         if 'login' in driver.current_url.lower():
             return {"success": False, "message": "Pinterest authentication failed"}
         
-        print("✓ Logged in")
+        log.info("Logged in")
         
+        # Click Create Pin
+        trace_step('open_composer')
         try:
-            create_pin_button = WebDriverWait(driver, 10).until(
+            create_pin_button = AdaptiveWait(driver, 'create_pin_button', 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//div[contains(text(), 'Create Pin')]"))
             )
             create_pin_button.click()
             time.sleep(3)
-            print("✓ Create Pin clicked")
+            log.info("Create Pin clicked")
         except:
             return {"success": False, "message": "Could not find Create Pin button"}
         
+        # Upload image
+        trace_step('upload')
         try:
-            print("📸 Uploading image...")
+            log.info("Uploading image")
             if find_and_upload_file(driver, image_path, wait_time=10):
-                print("✓ Image uploaded")
+                log.info("Image uploaded")
                 time.sleep(8)
             else:
-                return {"success": False, "message": "Image upload failed"}
+                return {"success": False, "message": "Image upload failed", "upload_failed": True}
         except:
-            return {"success": False, "message": "Image upload error"}
+            return {"success": False, "message": "Image upload error", "upload_failed": True}
         
+        # Enter title
+        trace_step('caption')
         try:
-            title_input = WebDriverWait(driver, 10).until(
+            title_input = AdaptiveWait(driver, 'title_input', 10).until(
                 EC.presence_of_element_located((By.XPATH, "//input[@id='storyboard-selector-title']"))
             )
             title_input.click()
             time.sleep(1)
             title_input.send_keys(title[:100])
             time.sleep(2)
-            print("✓ Title entered")
+            log.info("Title entered")
         except:
             return {"success": False, "message": "Title entry failed"}
         
@@ -807,13 +2447,15 @@ def post_to_pinterest(title, image_path=None, link=None, description="", headles
             except:
                 pass
         
+        # Click Publish
+        trace_step('submit')
         try:
-            publish_button = WebDriverWait(driver, 10).until(
+            publish_button = AdaptiveWait(driver, 'publish_button', 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'lIkAnG') and text()='Publish']"))
             )
             safe_click(driver, publish_button, "js")
             time.sleep(8)
-            print("✓ Posted")
+            log.info("Posted")
             
             return {"success": True, "message": "Posted to Pinterest successfully"}
         except:
@@ -822,6 +2464,7 @@ def post_to_pinterest(title, image_path=None, link=None, description="", headles
     except Exception as e:
         return {"success": False, "message": f"Pinterest error: {str(e)}"}
     finally:
+        print_command_summary(driver)
         driver.quit()
 
 def post_to_youtube_post(caption, image_path=None, headless=False):
@@ -829,65 +2472,61 @@ def post_to_youtube_post(caption, image_path=None, headless=False):
     driver = get_chrome_driver(headless=headless)
     
     try:
-        print("\n=== YouTube Community Post ===")
-        driver.get('https://www.youtube.com')
+        log.info("YouTube Community posting started")
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['youtube']['home'])
         time.sleep(3)
         
         if not load_cookies(driver, 'youtube'):
             return {"success": False, "message": "YouTube cookies not found"}
         
-        driver.get('https://www.youtube.com')
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['youtube']['app'])
         time.sleep(5)
         
         if 'accounts.google.com' in driver.current_url.lower():
             return {"success": False, "message": "YouTube authentication failed"}
         
-        print("✓ Logged in")
+        log.info("Logged in")
         
         # Click Create
+        trace_step('open_composer')
         try:
             create_selectors = [
                 "//button[@aria-label='Create']",
                 "//ytd-topbar-menu-button-renderer[@id='upload-button']//button"
             ]
             
-            create_button = None
-            for selector in create_selectors:
-                try:
-                    create_button = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    break
-                except:
-                    continue
+            create_button = wait_for_any(driver, create_selectors, timeout=10, condition='present')
             
             if not create_button:
                 return {"success": False, "message": "Could not find Create button"}
             
             safe_click(driver, create_button, "js")
             time.sleep(3)
-            print("✓ Create clicked")
+            log.info("Create clicked")
             
         except Exception as e:
             return {"success": False, "message": f"Error clicking Create: {str(e)}"}
         
         # Click Create post
         try:
-            create_post_option = WebDriverWait(driver, 10).until(
+            create_post_option = AdaptiveWait(driver, 'create_post_option', 10).until(
                 EC.presence_of_element_located((By.XPATH, "//yt-formatted-string[text()='Create post']"))
             )
             
             safe_click(driver, create_post_option, "js")
             time.sleep(5)
-            print("✓ Create post clicked")
+            log.info("Create post clicked")
             
         except Exception as e:
             return {"success": False, "message": f"Error clicking Create post: {str(e)}"}
         
         # Upload image if provided
+        trace_step('upload')
         if image_path and os.path.exists(image_path):
             try:
-                print("📸 Uploading image...")
+                log.info("Uploading image")
                 time.sleep(3)
                 
                 # Click image button
@@ -896,31 +2535,25 @@ def post_to_youtube_post(caption, image_path=None, headless=False):
                     "//button[contains(@aria-label, 'Image') or contains(@aria-label, 'Photo')]"
                 ]
                 
-                for selector in upload_button_selectors:
-                    try:
-                        buttons = driver.find_elements(By.XPATH, selector)
-                        for button in buttons:
-                            if button.is_displayed() and button.is_enabled():
-                                safe_click(driver, button, "js")
-                                time.sleep(3)
-                                break
-                        break
-                    except:
-                        continue
+                upload_button = wait_for_any(driver, upload_button_selectors, timeout=5)
+                if upload_button:
+                    safe_click(driver, upload_button, "js")
+                    time.sleep(3)
                 
                 # Upload file
                 if find_and_upload_file(driver, image_path, wait_time=10):
-                    print("✓ Image uploaded")
+                    log.info("Image uploaded")
                     time.sleep(10)
                 else:
-                    print("⚠️  Image upload failed")
+                    log.warning("Image upload failed")
                     
             except Exception as e:
-                print(f"⚠️  Image upload error: {e}")
+                log.warning("Image upload error: %s", e)
         
         # Enter caption
+        trace_step('caption')
         try:
-            print("📝 Entering caption...")
+            log.info("Entering caption")
             time.sleep(2)
             
             caption_selectors = [
@@ -928,25 +2561,12 @@ def post_to_youtube_post(caption, image_path=None, headless=False):
                 "//div[@contenteditable='true' and @role='textbox']"
             ]
             
-            caption_box = None
-            for selector in caption_selectors:
-                try:
-                    caption_box = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    if caption_box.is_displayed():
-                        break
-                except:
-                    continue
+            caption_box = wait_for_any(driver, caption_selectors, timeout=10, condition='visible')
             
             if not caption_box:
                 return {"success": False, "message": "Could not find caption text box"}
             
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", caption_box)
-            time.sleep(1)
-            driver.execute_script("arguments[0].focus();", caption_box)
-            time.sleep(0.5)
-            caption_box.click()
+            dom_focus(driver, caption_box)
             time.sleep(1)
             
             # Type caption
@@ -955,12 +2575,13 @@ def post_to_youtube_post(caption, image_path=None, headless=False):
                 time.sleep(0.03)
             
             time.sleep(2)
-            print("✓ Caption entered")
+            log.info("Caption entered")
             
         except Exception as e:
             return {"success": False, "message": f"Caption entry error: {str(e)}"}
         
         # Click Post
+        trace_step('submit')
         try:
             time.sleep(2)
             
@@ -969,25 +2590,14 @@ def post_to_youtube_post(caption, image_path=None, headless=False):
                 "//button[contains(., 'Post')]"
             ]
             
-            post_button = None
-            for selector in post_button_selectors:
-                try:
-                    buttons = driver.find_elements(By.XPATH, selector)
-                    for btn in buttons:
-                        if btn.is_displayed() and btn.is_enabled():
-                            post_button = btn
-                            break
-                    if post_button:
-                        break
-                except:
-                    continue
+            post_button = wait_for_any(driver, post_button_selectors, timeout=10)
             
             if not post_button:
                 return {"success": False, "message": "Could not find Post button"}
             
             safe_click(driver, post_button, "js")
             time.sleep(8)
-            print("✓ Posted")
+            log.info("Posted")
             
             return {"success": True, "message": "Posted to YouTube Community successfully"}
             
@@ -997,6 +2607,7 @@ def post_to_youtube_post(caption, image_path=None, headless=False):
     except Exception as e:
         return {"success": False, "message": f"YouTube Post error: {str(e)}"}
     finally:
+        print_command_summary(driver)
         driver.quit()
 
 def post_to_youtube(title, description, video_path, visibility='public', headless=False):
@@ -1007,24 +2618,33 @@ def post_to_youtube(title, description, video_path, visibility='public', headles
     driver = get_chrome_driver(headless=headless)
     
     try:
-        print("\n=== YouTube Video Upload ===")
-        driver.get('https://www.youtube.com')
+        log.info("YouTube video upload started")
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['youtube']['home'])
         time.sleep(3)
         
         if not load_cookies(driver, 'youtube'):
             return {"success": False, "message": "YouTube cookies not found"}
         
-        driver.get('https://www.youtube.com')
+        trace_step('navigate')
+        driver.get(PLATFORM_URLS['youtube']['app'])
         time.sleep(5)
         
         if 'accounts.google.com' in driver.current_url.lower():
             return {"success": False, "message": "YouTube authentication failed"}
         
         # Click Create
+        trace_step('open_composer')
         try:
-            create_button = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//button[@aria-label='Create']"))
-            )
+            create_selectors = [
+                "//button[@aria-label='Create']",
+                "//ytd-topbar-menu-button-renderer[@id='upload-button']//button"
+            ]
+            
+            create_button = wait_for_any(driver, create_selectors, timeout=10, condition='present')
+            if not create_button:
+                return {"success": False, "message": "Could not find Create button"}
+            
             safe_click(driver, create_button, "js")
             time.sleep(3)
         except Exception as e:
@@ -1032,7 +2652,7 @@ def post_to_youtube(title, description, video_path, visibility='public', headles
         
         # Click Upload video
         try:
-            upload_option = WebDriverWait(driver, 10).until(
+            upload_option = AdaptiveWait(driver, 'upload_option', 10).until(
                 EC.presence_of_element_located((By.XPATH, "//yt-formatted-string[text()='Upload video']"))
             )
             safe_click(driver, upload_option, "js")
@@ -1040,33 +2660,27 @@ def post_to_youtube(title, description, video_path, visibility='public', headles
         except Exception as e:
             return {"success": False, "message": f"Error clicking Upload video: {str(e)}"}
         
-        # Upload file
+        # Upload file - the browser keeps sending bytes while we fill in the form below
+        trace_step('upload')
         try:
             if find_and_upload_file(driver, video_path, wait_time=15):
-                print("✓ Video uploaded")
-                time.sleep(10)
+                log.info("Video upload started")
             else:
-                return {"success": False, "message": "Video upload failed"}
+                return {"success": False, "message": "Video upload failed", "upload_failed": True}
         except:
-            return {"success": False, "message": "Video upload error"}
+            return {"success": False, "message": "Video upload error", "upload_failed": True}
         
         # Enter title
+        trace_step('caption')
         try:
-            title_input = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//div[@id='textbox' and @contenteditable='true']"))
-            )
+            title_input = wait_for_any(driver, ["//div[@id='textbox' and @contenteditable='true']"], timeout=15, condition='visible')
+            if not title_input:
+                return {"success": False, "message": "Title entry error: title box not found"}
             title_input.click()
-            time.sleep(1)
             title_input.send_keys(Keys.CONTROL + "a")
-            time.sleep(0.5)
             title_input.send_keys(Keys.DELETE)
+            title_input.send_keys(title[:100])
             time.sleep(0.5)
-            
-            for char in title[:100]:
-                title_input.send_keys(char)
-                time.sleep(0.03)
-            
-            time.sleep(2)
         except Exception as e:
             return {"success": False, "message": f"Title entry error: {str(e)}"}
         
@@ -1077,153 +2691,1084 @@ def post_to_youtube(title, description, video_path, visibility='public', headles
                 if len(desc_inputs) > 1:
                     desc_input = desc_inputs[1]
                     desc_input.click()
-                    time.sleep(1)
-                    
-                    for char in description[:5000]:
-                        desc_input.send_keys(char)
-                        time.sleep(0.02)
-                    
-                    time.sleep(2)
+                    desc_input.send_keys(description[:5000])
+                    time.sleep(0.5)
             except Exception as e:
-                print(f"⚠️  Description entry error: {e}")
+                log.warning("Description entry error: %s", e)
         
         # Select "No, it's not made for kids"
+        trace_step('details')
         try:
-            not_for_kids = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//tp-yt-paper-radio-button[@name='VIDEO_MADE_FOR_KIDS_NOT_MFK']"))
-            )
-            safe_click(driver, not_for_kids, "js")
-            time.sleep(2)
+            not_for_kids = wait_for_any(driver, ["//tp-yt-paper-radio-button[@name='VIDEO_MADE_FOR_KIDS_NOT_MFK']"], timeout=10, condition='present')
+            if not_for_kids:
+                safe_click(driver, not_for_kids, "js")
+            else:
+                log.warning("Kids option not found")
         except Exception as e:
-            print(f"⚠️  Kids option error: {e}")
+            log.warning("Kids option error: %s", e)
         
-        # Click Next 3 times
+        # Click Next 3 times (Studio allows this while the upload is still running)
         for i in range(3):
             try:
-                next_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[@id='next-button']"))
-                )
+                next_button = wait_for_any(driver, ["//button[@id='next-button']"], timeout=10)
+                if not next_button:
+                    raise TimeoutException("Next button not clickable")
                 safe_click(driver, next_button, "js")
-                time.sleep(3)
+                # Let the stepper switch pages so the next wait doesn't catch the same button
+                time.sleep(1)
             except Exception as e:
-                print(f"⚠️  Next button {i+1} error: {e}")
+                log.warning("Next button %s error: %s", i+1, e)
         
         # Select visibility
         try:
             visibility_map = {'public': 'PUBLIC', 'unlisted': 'UNLISTED', 'private': 'PRIVATE'}
             visibility_value = visibility_map.get(visibility.lower(), 'PUBLIC')
             
-            visibility_option = WebDriverWait(driver, 10).until(
+            visibility_option = AdaptiveWait(driver, 'visibility_option', 10).until(
                 EC.presence_of_element_located((By.XPATH, f"//tp-yt-paper-radio-button[@name='{visibility_value}']"))
             )
             safe_click(driver, visibility_option, "js")
-            time.sleep(2)
         except Exception as e:
-            print(f"⚠️  Visibility error: {e}")
+            log.warning("Visibility error: %s", e)
+        
+        # Publishing and then quitting the browser mid-upload would abort the upload,
+        # so hold Publish until Studio reports the bytes are up. Budget ~1 s per MB.
+        trace_step('upload_wait')
+        upload_timeout = max(120, os.path.getsize(video_path) / (1024 * 1024))
+        if not wait_for_youtube_upload(driver, upload_timeout):
+            return {"success": False, "message": "Publishing error: video upload did not finish in time"}
         
         # Click Publish
+        trace_step('submit')
         try:
-            publish_button = WebDriverWait(driver, 15).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[@id='done-button']"))
-            )
+            publish_button = wait_for_any(driver, ["//button[@id='done-button']"], timeout=15)
+            if not publish_button:
+                raise TimeoutException("Publish button not clickable")
             safe_click(driver, publish_button, "js")
-            time.sleep(10)
+            
+            # Wait for the "Video published" dialog instead of a fixed pause
+            if not wait_for_any(driver, ["ytcp-video-share-dialog", "ytcp-uploads-still-processing-dialog"], timeout=15, condition='visible'):
+                log.warning("Publish confirmation not seen")
             
             return {"success": True, "message": f"Video uploaded to YouTube successfully as {visibility}"}
             
         except Exception as e:
-            return {"success": False, "message": f"Publishing error: {str(e)}"}
-        
-    except Exception as e:
-        return {"success": False, "message": f"YouTube error: {str(e)}"}
+            return {"success": False, "message": f"Publishing error: {str(e)}"}
+        
+    except Exception as e:
+        return {"success": False, "message": f"YouTube error: {str(e)}"}
+    finally:
+        print_command_summary(driver)
+        driver.quit()
+
+_YOUTUBE_UPLOAD_PROGRESS_JS = """
+var progress = document.querySelector('ytcp-video-upload-progress');
+var label = document.querySelector('ytcp-video-upload-progress .progress-label');
+return {
+    present: !!progress,
+    uploading: progress ? progress.hasAttribute('uploading') : false,
+    label: label ? (label.innerText || label.textContent || '').trim() : ''
+};
+"""
+
+def read_youtube_upload_progress(driver):
+    """Read YouTube Studio's upload progress label; returns percent and whether the upload finished"""
+    state = driver.execute_script(_YOUTUBE_UPLOAD_PROGRESS_JS) or {}
+    label = state.get('label', '')
+    lowered = label.lower()
+    match = re.search(r'(\d{1,3})\s*%', label)
+    state['percent'] = int(match.group(1)) if match else None
+    # Once the bytes are up Studio switches the label to processing/checks; publishing is safe from then on
+    state['uploaded'] = bool(label) and not state.get('uploading') and 'uploading' not in lowered and (
+        'upload complete' in lowered or 'processing' in lowered or 'checks' in lowered or 'finished' in lowered
+    )
+    return state
+
+def wait_for_youtube_upload(driver, timeout, poll_interval=2):
+    """Block until Studio reports the video bytes are uploaded; True if it did within timeout"""
+    deadline = time.time() + timeout
+    last_label = None
+    missing_polls = 0
+    while time.time() < deadline:
+        try:
+            state = read_youtube_upload_progress(driver)
+        except WebDriverException as e:
+            log.warning("Could not read upload progress: %s", e)
+            return False
+        
+        if state.get('uploaded'):
+            log.info("Upload finished: %s", state.get('label'))
+            return True
+        
+        if not state.get('present'):
+            # No progress widget at all: nothing to wait on, fall through to Publish
+            missing_polls += 1
+            if missing_polls >= 3:
+                log.warning("Upload progress not shown, continuing")
+                return True
+        elif state.get('label') != last_label:
+            last_label = state.get('label')
+            log.debug("Upload progress: %s", last_label)
+        
+        time.sleep(poll_interval)
+    return False
+
+# Performance history: every platform run is appended as one JSON line to
+# performance/history-YYYY-MM.jsonl and folded into hourly and daily rollups
+# (performance/rollups.json) that /performance-history serves for trend queries. Every process
+# re-reads the file whenever another one has rewritten it, and writers (several scheduler nodes
+# may share the folder) hold a file lock from that re-read until their own write, so no run is lost.
+ROLLUP_RETENTION = {'hour': timedelta(days=14), 'day': timedelta(days=400)}
+_performance_lock = threading.Lock()
+_performance_file_lock = StoreLock(os.path.join(app.config['PERFORMANCE_FOLDER'], 'rollups.json.lock'))
+_rollups = None
+_rollups_stamp = None
+
+def _rollups_path():
+    return os.path.join(app.config['PERFORMANCE_FOLDER'], 'rollups.json')
+
+def _file_stamp(path):
+    """(mtime, size) of a file, or None if it doesn't exist; changes whenever it is rewritten"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _current_rollups():
+    """The rollups, re-read if rollups.json changed since this process last loaded or wrote it;
+    call with _performance_lock held"""
+    global _rollups, _rollups_stamp
+    stamp = _file_stamp(_rollups_path())
+    if _rollups is None or stamp != _rollups_stamp:
+        _rollups = _load_rollups()
+        _rollups_stamp = stamp
+    return _rollups
+
+def _rollup_bucket(when, granularity):
+    return when.strftime('%Y-%m-%dT%H:00' if granularity == 'hour' else '%Y-%m-%d')
+
+def _add_to_rollups(rollups, record):
+    when = datetime.fromisoformat(record['finished_at'])
+    for granularity in ROLLUP_RETENTION:
+        key = f"{record['platform']}|{_rollup_bucket(when, granularity)}"
+        bucket = rollups[granularity].get(key)
+        if bucket is None:
+            bucket = rollups[granularity][key] = {
+                'count': 0, 'successes': 0, 'duration_sum': 0.0, 'duration_max': 0.0,
+                'duration_buckets': [0] * len(METRIC_BUCKETS), 'lag_count': 0, 'lag_sum': 0.0, 'lag_max': 0.0,
+                'step_sums': {}
+            }
+        duration = record['duration']
+        bucket['count'] += 1
+        bucket['successes'] += 1 if record['success'] else 0
+        bucket['duration_sum'] += duration
+        bucket['duration_max'] = max(bucket['duration_max'], duration)
+        for i, bound in enumerate(METRIC_BUCKETS):
+            if duration <= bound:
+                bucket['duration_buckets'][i] += 1
+                break
+        if record.get('lag') is not None:
+            bucket['lag_count'] += 1
+            bucket['lag_sum'] += record['lag']
+            bucket['lag_max'] = max(bucket['lag_max'], record['lag'])
+        if record.get('publish_lag') is not None:
+            bucket['publish_lag_count'] = bucket.get('publish_lag_count', 0) + 1
+            bucket['publish_lag_sum'] = bucket.get('publish_lag_sum', 0.0) + record['publish_lag']
+            bucket['publish_lag_max'] = max(bucket.get('publish_lag_max', record['publish_lag']), record['publish_lag'])
+        for step, seconds in (record.get('steps') or {}).items():
+            bucket['step_sums'][step] = bucket['step_sums'].get(step, 0) + seconds
+
+def _prune_rollups(rollups):
+    now = datetime.now()
+    for granularity, retention in ROLLUP_RETENTION.items():
+        cutoff = _rollup_bucket(now - retention, granularity)
+        for key in [k for k in rollups[granularity] if k.split('|', 1)[1] < cutoff]:
+            del rollups[granularity][key]
+
+def _history_files():
+    folder = app.config['PERFORMANCE_FOLDER']
+    if not os.path.isdir(folder):
+        return []
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                  if name.startswith('history-') and name.endswith('.jsonl'))
+
+def _load_rollups():
+    """Rollups from disk, rebuilt from the history files if missing or unreadable"""
+    path = _rollups_path()
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            log.warning("Performance rollups unreadable, rebuilding from history")
+    rollups = {granularity: {} for granularity in ROLLUP_RETENTION}
+    for history in _history_files():
+        with open(history, 'r') as f:
+            for line in f:
+                try:
+                    _add_to_rollups(rollups, json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+    _prune_rollups(rollups)
+    return rollups
+
+def record_performance(platform, result, post_data):
+    """Append one run to the history and update its hourly/daily rollups"""
+    global _rollups_stamp
+    timings = result.get('timings') or {}
+    now = datetime.now()
+    lag = None
+    if post_data.get('scheduled_time'):
+        try:
+            lag = round((now - datetime.fromisoformat(post_data['scheduled_time'])).total_seconds(), 3)
+        except ValueError:
+            pass
+    record = {
+        'platform': platform,
+        'post_id': post_data.get('id'),
+        'finished_at': now.isoformat(timespec='seconds'),
+        'success': bool(result.get('success')),
+        'duration': timings.get('total', 0),
+        'steps': timings.get('steps', {}),
+        'failed_step': timings.get('failed_step'),
+        'commands': timings.get('commands'),
+        'step_commands': timings.get('step_commands'),
+        'lag': lag,
+        'publish_lag': timings.get('publish_lag'),
+        'headless_fallback': result.get('headless_fallback', False),
+        'peak_rss_mb': timings.get('peak_rss_mb')
+    }
+    try:
+        os.makedirs(app.config['PERFORMANCE_FOLDER'], exist_ok=True)
+        with _performance_file_lock, _performance_lock:
+            rollups = _current_rollups()
+            with open(os.path.join(app.config['PERFORMANCE_FOLDER'], f"history-{now.strftime('%Y-%m')}.jsonl"), 'a') as f:
+                f.write(json.dumps(record) + "\n")
+            _add_to_rollups(rollups, record)
+            _prune_rollups(rollups)
+            path = _rollups_path()
+            with open(path + '.tmp', 'w') as f:
+                json.dump(rollups, f)
+            os.replace(path + '.tmp', path)
+            _rollups_stamp = _file_stamp(path)
+    except Exception as e:
+        log.warning("Could not record performance history: %s", e)
+
+def _bucket_percentile(bucket, pct):
+    """Upper bound of the histogram bucket holding the pct-th percentile duration"""
+    target = bucket['count'] * pct / 100.0
+    seen = 0
+    for bound, count in zip(METRIC_BUCKETS, bucket['duration_buckets']):
+        seen += count
+        if seen >= target:
+            return min(bound, bucket['duration_max'])
+    return bucket['duration_max']
+
+def _average_duration(points):
+    runs = sum(p['count'] for p in points)
+    return sum(p['duration_avg'] * p['count'] for p in points) / runs if runs else None
+
+def performance_series(granularity='day', days=7, platform=None):
+    """Per-platform rollup series for the last `days` days, oldest first, with a duration trend"""
+    with _performance_lock:
+        rollups = json.loads(json.dumps(_current_rollups().get(granularity, {})))
+    cutoff = _rollup_bucket(datetime.now() - timedelta(days=days), granularity)
+    
+    platforms = {}
+    for key in sorted(rollups):
+        name, bucket_start = key.split('|', 1)
+        if bucket_start < cutoff or (platform and name != platform):
+            continue
+        bucket = rollups[key]
+        count = bucket['count']
+        platforms.setdefault(name, {'series': []})['series'].append({
+            'bucket': bucket_start,
+            'count': count,
+            'success_rate': round(bucket['successes'] / count, 3),
+            'duration_avg': round(bucket['duration_sum'] / count, 3),
+            'duration_p50': _bucket_percentile(bucket, 50),
+            'duration_p95': _bucket_percentile(bucket, 95),
+            'duration_max': round(bucket['duration_max'], 3),
+            'lag_avg': round(bucket['lag_sum'] / bucket['lag_count'], 3) if bucket['lag_count'] else None,
+            'lag_max': round(bucket['lag_max'], 3) if bucket['lag_count'] else None,
+            'publish_lag_avg': round(bucket['publish_lag_sum'] / bucket['publish_lag_count'], 3)
+                               if bucket.get('publish_lag_count') else None,
+            'publish_lag_max': round(bucket['publish_lag_max'], 3) if bucket.get('publish_lag_count') else None,
+            'steps': {step: round(total / count, 3) for step, total in bucket['step_sums'].items()}
+        })
+    
+    # Trend: average duration of the newer half of the window relative to the older half
+    for data in platforms.values():
+        half = len(data['series']) // 2
+        before, after = _average_duration(data['series'][:half]), _average_duration(data['series'][half:])
+        data['duration_change'] = round(after / before - 1, 3) if before and after else None
+    return platforms
+
+def post_to_platform(platform, post_data, media_path, headless=None, profile=False, priority=PRIORITY_INTERACTIVE,
+                     probe=None, submit_at=None):
+    """Run one platform's poster for a post; post_data holds captions, per-platform fields and the account.
+    probe is the caller's half-open breaker probe token, if it already holds one. submit_at (a timestamp)
+    holds the submit step until then and records the publish lag; only on-time scheduled runs pass it."""
+    account = post_data.get('account') or DEFAULT_ACCOUNT
+    if account != current_account():
+        with use_account(account), log_context(account=account):
+            return post_to_platform(platform, post_data, media_path, headless, profile, priority, probe, submit_at)
+    if profile:
+        with profile_run('_'.join(filter(None, [post_data.get('id'), platform]))) as report:
+            result = post_to_platform(platform, post_data, media_path, headless, priority=priority, probe=probe,
+                                      submit_at=submit_at)
+        result['profile'] = report
+        return result
+
+    captions = post_data.get('captions', {})
+    headless = resolve_headless(platform, headless)
+    
+    if platform == 'linkedin':
+        args = (post_to_linkedin, captions.get('linkedin', ''), media_path)
+    elif platform == 'twitter':
+        args = (post_to_twitter, captions.get('twitter', ''), media_path)
+    elif platform == 'instagram':
+        args = (post_to_instagram, captions.get('instagram', ''), media_path)
+    elif platform == 'facebook':
+        args = (post_to_facebook, captions.get('facebook', ''), media_path)
+    elif platform == 'pinterest':
+        title = post_data.get('pinterest_title') or captions.get('pinterest', '')
+        args = (post_to_pinterest, title, media_path, post_data.get('pinterest_link', ''), captions.get('pinterest', ''))
+    elif platform == 'youtube':
+        title = post_data.get('youtube_title') or captions.get('youtube', '')
+        args = (post_to_youtube, title, post_data.get('youtube_description', ''), media_path, post_data.get('youtube_visibility', 'public'))
+    elif platform == 'youtubepost':
+        args = (post_to_youtube_post, captions.get('youtubepost', ''), media_path)
+    else:
+        return {"success": False, "message": f"Unknown platform: {platform}"}
+    
+    retry_at, probe = breaker_allow(platform, probe)
+    if retry_at:
+        return circuit_open_result(platform, retry_at)
+    
+    try:
+        poster, poster_args = args[0], args[1:]
+        budget = poster_budget(platform, media_path, submit_at)
+        result = _run_traced(platform, poster, poster_args, headless, submit_at, priority, budget)
+        
+        # Media that never reached the file input is the headless-specific risk and fails before
+        # anything is submitted, so posters flag it (upload_failed) and it is retried once headed
+        if headless and not result.get('success') and not result.get('timeout') \
+                and result.get('upload_failed') and has_display():
+            log.warning("Headless upload failed, retrying headed")
+            result = _run_traced(platform, poster, poster_args, False, submit_at, priority, budget)
+            result['headless_fallback'] = True
+        
+        breaker_record(platform, classify_failure(platform, result), result.get('message'), probe)
+    finally:
+        breaker_release(platform, probe)
+    record_performance(platform, result, post_data)
+    save_wait_samples()
+    return result
+
+def _run_traced(platform, poster, poster_args, headless, submit_at=None, priority=PRIORITY_INTERACTIVE, budget=None):
+    """Run a poster inside a post trace (in a worker process when isolated) and attach its step timings"""
+    with account_browser(platform, priority) as admitted:
+        if not admitted:
+            return {"success": False, "message": f"No browser slot or {platform} session came free within {BROWSER_QUEUE_TIMEOUT:.0f}s"}
+        if POSTER_ISOLATION and not getattr(_trace_local, 'profiling', False):
+            result = run_isolated(platform, poster, poster_args, headless, submit_at, budget or POSTER_HARD_TIMEOUT)
+        else:
+            result = _run_poster(platform, poster, poster_args, headless, submit_at)
+        browser_governor.exclude(result['timings']['steps'].get('hold', 0))
+    timings = result['timings']
+    steps = ", ".join(f"{step}={seconds:.1f}s" for step, seconds in timings['steps'].items())
+    with log_context(platform=platform):
+        log.info("Finished in %.1fs (%s)", timings['total'], steps)
+    return result
+
+def _run_poster(platform, poster, poster_args, headless, submit_at=None):
+    start_post_trace(platform, submit_at=submit_at)
+    result = {"success": False, "message": "Poster did not return"}
+    try:
+        result = poster(*poster_args, headless=headless)
+    except Exception as e:
+        result = {"success": False, "message": f"{platform} error: {str(e)}"}
+    finally:
+        timings = finish_post_trace(result)
+    result['timings'] = timings
+    return result
+
+# Poster isolation: each poster run happens in a reusable worker process (app.py started with
+# POSTER_WORKER=1) under a hard wall-clock budget. A run that overruns has its worker and the whole
+# Chrome tree under it killed and comes back as a timeout; the next run starts a fresh worker.
+# Metrics and wait samples recorded in the worker are shipped back with each result.
+POSTER_ISOLATION = os.environ.get('POSTER_ISOLATION', '1') != '0'
+POSTER_HARD_TIMEOUT = float(os.environ.get('POSTER_HARD_TIMEOUT', '600'))
+POSTER_WORKER_MAX_AGE = float(os.environ.get('POSTER_WORKER_MAX_AGE', '3600'))
+POSTER_WORKER_MAX_RSS_MB = float(os.environ.get('POSTER_WORKER_MAX_RSS_MB', '400'))
+
+def poster_budget(platform, media_path, submit_at=None):
+    """Hard wall-clock budget for one run: the base, plus the YouTube upload wait, plus any pre-warm hold"""
+    budget = POSTER_HARD_TIMEOUT
+    if platform == 'youtube' and media_path and os.path.exists(media_path):
+        budget += max(120, os.path.getsize(media_path) / (1024 * 1024))
+    if submit_at:
+        budget += max(0, submit_at - time.time())
+    return budget
+
+def kill_process_tree(pid):
+    """Kill a process and everything it started (chromedriver, Chrome and its helpers)"""
+    processes = []
+    if PSUTIL_AVAILABLE:
+        try:
+            root = psutil.Process(pid)
+            processes = root.children(recursive=True) + [root]
+        except psutil.Error:
+            pass
+    if os.name == 'posix':
+        # Workers lead their own session, so this also reaches Chrome processes that were re-parented
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    elif not processes:
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+
+class PosterWorker:
+    """One worker process; tasks and replies are JSON lines on its stdin/stdout"""
+    
+    def __init__(self):
+        kwargs = {'start_new_session': True} if os.name == 'posix' else {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        self.process = subprocess.Popen([sys.executable, os.path.abspath(__file__)], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True, bufsize=1,
+                                        env=dict(os.environ, POSTER_WORKER='1'), **kwargs)
+        self.started = time.time()
+        self.messages = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+    
+    def _read(self):
+        for line in self.process.stdout:
+            try:
+                self.messages.put(json.loads(line))
+            except ValueError:
+                continue
+        self.messages.put(None)
+    
+    def alive(self):
+        return self.process.poll() is None
+    
+    def recycle_reason(self):
+        """Why this worker should be replaced rather than reused ({'kind': 'age'|'memory', 'detail': ...}), or None"""
+        if time.time() - self.started > POSTER_WORKER_MAX_AGE:
+            return {'kind': 'age', 'detail': f"older than {POSTER_WORKER_MAX_AGE:.0f}s"}
+        if PSUTIL_AVAILABLE and POSTER_WORKER_MAX_RSS_MB:
+            # Between posts the tree should be just the interpreter (a failed run's flight record is
+            # captured and its Chrome quit before 'done' is sent); leftover Chrome shows up here
+            try:
+                root = psutil.Process(self.process.pid)
+                rss = sum(p.memory_info().rss for p in [root] + root.children(recursive=True)) / (1024 * 1024)
+            except psutil.Error:
+                return None
+            if rss > POSTER_WORKER_MAX_RSS_MB:
+                return {'kind': 'memory', 'detail': f"holding {rss:.0f} MB between posts"}
+        return None
+    
+    def run(self, task, budget):
+        """The worker's 'done' reply, or {'timeout': True} / {'died': True} with the last step it reported"""
+        step = None
+        try:
+            self.process.stdin.write(json.dumps(task) + "\n")
+            self.process.stdin.flush()
+        except OSError:
+            return {'died': True, 'step': step}
+        deadline = time.time() + budget
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return {'timeout': True, 'step': step}
+            try:
+                message = self.messages.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if message is None:
+                return {'died': True, 'step': step}
+            if message.get('type') == 'step':
+                step = message['step']
+                continue
+            if message.get('type') == 'memory':
+                export_driver_memory(message['platform'], message['pid'], message['rss_mb'])
+                continue
+            return message
+    
+    def kill(self):
+        kill_process_tree(self.process.pid)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            pass
+    
+    def close(self):
+        # Closing stdin ends the worker's loop
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+class PosterWorkerPool:
+    """Reuse idle workers; one that timed out or died is killed and replaced on the next run"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = []
+        self.busy = 0
+    
+    def run(self, task, budget):
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+            self.busy += 1
+        try:
+            if worker is None or not worker.alive():
+                worker = PosterWorker()
+            reply = worker.run(task, budget)
+        finally:
+            with self._lock:
+                self.busy -= 1
+        recycle = (reply.get('recycle') or worker.recycle_reason()) if reply.get('type') == 'done' else None
+        if recycle:
+            log.info("Recycling poster worker %s: %s", worker.process.pid, recycle['detail'])
+            inc_counter('poster_worker_recycles_total', reason=recycle['kind'])
+        if reply.get('type') == 'done' and not recycle:
+            with self._lock:
+                self._idle.append(worker)
+        else:
+            worker.kill()
+        return reply
+    
+    def snapshot(self):
+        with self._lock:
+            return {"idle": len(self._idle), "busy": self.busy}
+    
+    def shutdown(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+poster_workers = PosterWorkerPool()
+
+def run_isolated(platform, poster, poster_args, headless, submit_at, budget):
+    """Run _run_poster in a worker process; a run over budget is killed and reported as a timeout"""
+    with _wait_lock:
+        waits = {key: list(samples) for (p, key), samples in _load_wait_samples().items() if p == platform}
+        misses = [key for (p, key) in _wait_misses if p == platform]
+    task = {'platform': platform, 'poster': poster.__name__, 'args': list(poster_args), 'headless': headless,
+            'submit_at': submit_at, 'urls': PLATFORM_URLS.get(platform), 'waits': waits, 'wait_misses': misses,
+            'context': dict(getattr(_log_local, 'context', None) or {}), 'account': current_account()}
+    started = time.time()
+    reply = poster_workers.run(task, budget)
+    if reply.get('type') != 'done':
+        step = reply.get('step') or 'prepare'
+        reason = f"timed out after {budget:.0f}s" if reply.get('timeout') else "worker process died"
+        inc_counter('poster_timeouts_total', platform=platform, reason='timeout' if reply.get('timeout') else 'died')
+        return {"success": False, "timeout": True, "message": f"{platform} {reason} during {step}; browser killed",
+                "timings": {'total': round(time.time() - started, 3), 'failed_step': step, 'steps': {},
+                            'commands': None, 'step_commands': None, 'publish_lag': None}}
+    merge_metrics(reply.get('metrics', {}))
+    for key, seconds, found in reply.get('waits', []):
+        _record_wait(platform, key, seconds, found)
+    return reply['result']
+
+def poster_worker_main():
+    """Serve poster runs from the parent until it closes stdin"""
+    global _worker_send
+    # Replies get their own copy of stdout; everything else printed or logged goes to stderr
+    replies = os.fdopen(os.dup(1), 'w', buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    write_lock = threading.Lock()
+    
+    def send(message):
+        with write_lock:
+            replies.write(json.dumps(message, default=str) + "\n")
+    _worker_send = send
+    
+    for line in sys.stdin:
+        task = json.loads(line)
+        platform = task['platform']
+        if task.get('urls'):
+            PLATFORM_URLS[platform] = task['urls']
+        with _wait_lock:
+            samples = _load_wait_samples()
+            for key in [k for k in samples if k[0] == platform]:
+                del samples[key]
+            for key, values in task['waits'].items():
+                samples[(platform, key)] = deque(values, maxlen=TIMEOUT_SAMPLES_KEPT)
+            _wait_misses.difference_update([k for k in _wait_misses if k[0] == platform])
+            _wait_misses.update((platform, key) for key in task['wait_misses'])
+        del _worker_waits[:]
+        poster = globals().get(task['poster'])
+        with log_context(**task['context']), use_account(task.get('account')):
+            if not callable(poster) or not task['poster'].startswith('post_to_'):
+                result = {"success": False, "message": f"Unknown poster: {task['poster']}",
+                          "timings": {'total': 0, 'failed_step': 'prepare', 'steps': {}, 'commands': 0, 'step_commands': {},
+                                      'publish_lag': None}}
+            else:
+                result = _run_poster(platform, poster, task['args'], task['headless'], task['submit_at'])
+        send({'type': 'done', 'result': result, 'metrics': drain_metrics(), 'waits': list(_worker_waits),
+              'recycle': _recycle_reason})
+
+# Retries: failed sub-jobs are classified as retryable, selector, auth or fatal. Retryable and
+# selector ones are rescheduled with jittered exponential backoff until RETRY_MAX_ATTEMPTS
+# attempts in total. Patterns are matched against the lowercased result message, platform entries first.
+FAILURE_PATTERNS = {
+    '*': [
+        ('cookies not found', 'auth'),
+        ('authentication failed', 'auth'),
+        ('could not find', 'selector'),
+        ('could not open', 'selector'),
+        ('title box not found', 'selector'),
+        ('requires', 'fatal'),
+        ('unknown platform', 'fatal'),
+        ('file does not exist', 'fatal'),
+    ],
+    'youtube': [('did not finish in time', 'retryable')],
+}
+RETRY_MAX_ATTEMPTS = int(os.environ.get('RETRY_MAX_ATTEMPTS', '3'))
+RETRY_BASE_SECONDS = float(os.environ.get('RETRY_BASE_SECONDS', '30'))
+RETRY_MAX_SECONDS = float(os.environ.get('RETRY_MAX_SECONDS', '900'))
+RETRYABLE_FAILURES = ('retryable', 'selector')
+
+def classify_failure(platform, result):
+    """None for a success, otherwise 'retryable', 'selector', 'auth', 'fatal' or 'circuit' (not attempted)"""
+    if result.get('success'):
+        return None
+    if result.get('circuit_open'):
+        return 'circuit'
+    message = (result.get('message') or '').lower()
+    for pattern, failure_class in FAILURE_PATTERNS.get(platform, []) + FAILURE_PATTERNS['*']:
+        if pattern in message:
+            return failure_class
+    return 'retryable'
+
+def retry_delay(attempt):
+    """Backoff before retry number `attempt` (1-based): half fixed, half random, doubling each time"""
+    cap = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return cap / 2 + random.uniform(0, cap / 2)
+
+def needs_publish_check(previous):
+    """A failed attempt might have posted if it got as far as submitting (or never reported back)"""
+    if not previous or previous.get('success'):
+        return False
+    if 'timings' in previous:
+        return previous['timings'].get('failed_step') == 'submit'
+    return bool(previous.get('interrupted') or previous.get('unverified'))
+
+def _verification_text(platform, post_data):
+    captions = post_data.get('captions', {})
+    if platform == 'youtube':
+        text = post_data.get('youtube_title') or captions.get('youtube', '')
+    elif platform == 'pinterest':
+        text = post_data.get('pinterest_title') or captions.get('pinterest', '')
+    else:
+        text = captions.get(platform, '')
+    return ' '.join(text.split())[:60]
+
+def open_profile(driver, urls):
+    """Open the account's own page, following urls' profile_link/profile_redirect; False if not found"""
+    driver.get(urls['profile'])
+    if urls.get('profile_link'):
+        link = wait_for_any(driver, [urls['profile_link']], timeout=15, condition='present', name='profile_link')
+        href = link.get_attribute('href') if link else None
+        if not href:
+            return False
+        driver.get(href)
+    if urls.get('profile_redirect'):
+        pattern, replacement = urls['profile_redirect']
+        try:
+            match = WebDriverWait(driver, 15).until(lambda d: re.match(pattern, d.current_url))
+        except TimeoutException:
+            return False
+        driver.get(match.expand(replacement))
+    return True
+
+def verify_published(platform, post_data):
+    """Look for the post on the account's own page: True, False, or None if it can't be checked"""
+    urls = PLATFORM_URLS.get(platform, {})
+    text = _verification_text(platform, post_data)
+    if platform in UNVERIFIABLE_PLATFORMS or not urls.get('profile') or not text:
+        return None
+    
+    with account_browser(platform, PRIORITY_RETRY) as admitted:
+        if not admitted:
+            return None
+        driver = None
+        try:
+            driver = get_chrome_driver(headless=resolve_headless(platform, post_data.get('headless')), platform=platform)
+            driver.get(urls['home'])
+            if not load_cookies(driver, platform) or not open_profile(driver, urls):
+                return None
+            try:
+                WebDriverWait(driver, 15).until(lambda d: d.execute_script(
+                    "return !!document.body && document.body.innerText.replace(/\\s+/g, ' ').indexOf(arguments[0]) >= 0;", text))
+                return True
+            except TimeoutException:
+                return False
+        except Exception as e:
+            log.warning("Publish check failed: %s", e)
+            return None
+        finally:
+            if driver:
+                driver.quit()
+
+def retry_job_id(post_id, platform):
+    return f"{post_id}_{platform}_retry"
+
+def schedule_retry(post_id, platform, run_at):
+    """Queue the next automatic attempt of one sub-job at run_at; returns run_at"""
+    scheduler.add_job(
+        func=execute_scheduled_post,
+        trigger=DateTrigger(run_date=run_at),
+        args=[post_id, [platform]],
+        kwargs={'automatic': True},
+        id=retry_job_id(post_id, platform),
+        replace_existing=True
+    )
+    return run_at
+
+def sync_retries(post, current_time):
+    """Fire every automatic retry the post's sub-jobs are waiting for on this node too; the node
+    that scheduled one may have stopped, and the claim settles which node runs it"""
+    for platform, job in post.get('jobs', {}).items():
+        if job['status'] == 'failed' and job.get('retry_at') and scheduler.get_job(retry_job_id(post['id'], platform)) is None:
+            schedule_retry(post['id'], platform, max(current_time, datetime.fromisoformat(job['retry_at'])))
+
+# Circuit breakers, one per account: BREAKER_THRESHOLD auth or selector failures in a row open it.
+# While open, posts fail fast without launching Chrome and scheduled sub-jobs are deferred.
+# After BREAKER_COOLDOWN_SECONDS it is half-open and lets a single probe through; the probe's
+# outcome closes it again or restarts the cooldown. The probe is identified by a token that
+# breaker_allow() hands out and the caller passes back (a publish check and the post after it
+# share one), and a probe that never reports back is given up after BREAKER_PROBE_TIMEOUT.
+# Breakers live in WORK_QUEUE_DB, so every node counts toward and obeys the same one.
+BREAKER_THRESHOLD = int(os.environ.get('BREAKER_THRESHOLD', '3'))
+BREAKER_COOLDOWN_SECONDS = float(os.environ.get('BREAKER_COOLDOWN_SECONDS', '600'))
+BREAKER_PROBE_TIMEOUT = float(os.environ.get('BREAKER_PROBE_TIMEOUT', '900'))
+BREAKER_FAILURES = ('auth', 'selector')
+_breaker_lock = threading.Lock()
+_probe_tokens = itertools.count(1)
+
+def breaker_key(platform, account=None):
+    """The sign-in a platform posts with: the site, per account"""
+    account = account or current_account()
+    site = account_site(platform)
+    return site if account == DEFAULT_ACCOUNT else f"{account}/{site}"
+
+@contextmanager
+def _breaker(key):
+    """The account's breaker, read and saved back in one transaction so nodes never interleave"""
+    with _breaker_lock:
+        conn = queue_db()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT state FROM breakers WHERE key = ?", (key,)).fetchone()
+            breaker = json.loads(row['state']) if row else {'state': 'closed', 'failures': 0, 'reason': None,
+                                                            'opened_at': None, 'probe': None, 'probe_at': None}
+            stored = dict(breaker)
+            yield breaker
+            if breaker != stored:
+                conn.execute("INSERT INTO breakers (key, state) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET state = excluded.state",
+                             (key, json.dumps(breaker)))
+            conn.execute("COMMIT")
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.close()
+
+def _set_breaker_state(key, breaker, state):
+    breaker['state'] = state
+    inc_counter('circuit_transitions_total', account=key, state=state)
+    if state == 'open':
+        log.warning("Circuit %s for %s: %s", state, key, breaker['reason'])
+    else:
+        log.warning("Circuit %s for %s", state, key)
+
+def breaker_allow(platform, probe=None):
+    """(retry_at, probe): retry_at is None if the account may be used now, otherwise the datetime to
+    try again; probe is the token to pass back while this caller is the half-open probe"""
+    key = breaker_key(platform)
+    with _breaker(key) as breaker:
+        if breaker['state'] == 'closed':
+            return None, None
+        now = time.time()
+        reopens = breaker['opened_at'] + BREAKER_COOLDOWN_SECONDS
+        if breaker['state'] == 'open' and now >= reopens:
+            _set_breaker_state(key, breaker, 'half_open')
+        if breaker['probe'] is not None and now - breaker['probe_at'] > BREAKER_PROBE_TIMEOUT:
+            breaker['probe'] = None
+        # The probe may come back in with its token (publish check, then the post itself)
+        if breaker['state'] == 'half_open' and (breaker['probe'] is None or (probe is not None and breaker['probe'] == probe)):
+            breaker['probe'] = probe or f"{WORKER_ID}/{next(_probe_tokens)}"
+            breaker['probe_at'] = now
+            return None, breaker['probe']
+        return datetime.fromtimestamp(max(reopens, now + RETRY_BASE_SECONDS)), None
+
+def breaker_release(platform, probe):
+    """Give up a probe that ended without an outcome, so the next caller can probe"""
+    if probe is None:
+        return
+    with _breaker(breaker_key(platform)) as breaker:
+        if breaker['probe'] == probe:
+            breaker['probe'] = None
+
+def breaker_record(platform, failure_class, message=None, probe=None):
+    """Feed one outcome (a classify_failure() class, None for success) into the account's breaker"""
+    key = breaker_key(platform)
+    with _breaker(key) as breaker:
+        probing = probe is not None and breaker['probe'] == probe
+        if probing:
+            breaker['probe'] = None
+        if failure_class is None:
+            breaker.update(failures=0, reason=None, opened_at=None)
+            if breaker['state'] != 'closed':
+                _set_breaker_state(key, breaker, 'closed')
+        elif failure_class in BREAKER_FAILURES:
+            breaker['failures'] += 1
+            breaker['reason'] = message
+            if (probing and breaker['state'] == 'half_open') or \
+                    (breaker['state'] == 'closed' and breaker['failures'] >= BREAKER_THRESHOLD):
+                breaker['opened_at'] = time.time()
+                _set_breaker_state(key, breaker, 'open')
+
+def breaker_states():
+    """Every breaker that has seen a failure, for /scheduler-status"""
+    conn = queue_db()
+    try:
+        rows = conn.execute("SELECT key, state FROM breakers ORDER BY key").fetchall()
     finally:
-        driver.quit()
+        conn.close()
+    states = {}
+    for row in rows:
+        breaker = json.loads(row['state'])
+        state = {k: breaker[k] for k in ('state', 'failures', 'reason')}
+        if breaker['opened_at']:
+            state['opened_at'] = datetime.fromtimestamp(breaker['opened_at']).isoformat()
+            state['half_open_at'] = datetime.fromtimestamp(breaker['opened_at'] + BREAKER_COOLDOWN_SECONDS).isoformat()
+        states[row['key']] = state
+    return states
 
-def execute_scheduled_post(post_id):
-    """Execute a scheduled post"""
-    print(f"\n{'='*70}")
-    print(f"🚀 EXECUTING SCHEDULED POST: {post_id}")
-    print(f"{'='*70}")
-    
+def circuit_open_result(platform, retry_at):
+    """Result for a post that was not attempted because the account's breaker is open"""
+    with _breaker(breaker_key(platform)) as breaker:
+        reason = breaker['reason']
+    return {"success": False, "circuit_open": True, "retry_at": retry_at.isoformat(),
+            "message": f"{platform} paused after repeated failures ({reason}); next attempt at {retry_at.strftime('%H:%M:%S')}"}
+
+def execute_scheduled_post(post_id, platforms=None, force=False, automatic=False):
+    """Execute a scheduled post; platforms limits a retry to those sub-jobs, force skips the publish check,
+    automatic marks a retry scheduled by schedule_retry()"""
+    with log_context(post_id=post_id):
+        _execute_scheduled_post(post_id, platforms, force, automatic)
+
+def ensure_sub_jobs(post):
+    """Give each of the post's platforms its own sub-job record; older posts get them on first run"""
+    jobs = post.setdefault('jobs', {})
+    for platform in post['platforms']:
+        jobs.setdefault(platform, {'status': 'pending', 'attempts': 0, 'result': None})
+    return jobs
+
+def post_status_from_jobs(jobs):
+    """'completed' when every sub-job that ran succeeded, 'partial' when some did, otherwise 'failed'"""
+    # Skipped sub-jobs (e.g. no media for a media-only platform) are final and can't be retried
+    statuses = [job['status'] for job in jobs.values() if job['status'] != 'skipped']
+    if statuses and all(status == 'succeeded' for status in statuses):
+        return 'completed'
+    if any(status == 'succeeded' for status in statuses):
+        return 'partial'
+    return 'failed'
+
+def update_sub_job(post_id, platform, result, status=None, retry_at=None, attempted=True):
+    """Store one platform's outcome as soon as it finishes"""
     with scheduled_posts_lock:
         posts = load_scheduled_posts()
         post = next((p for p in posts if p['id'] == post_id), None)
-        
         if not post:
-            print(f"❌ Post {post_id} not found")
             return
-        
-        captions = post.get('captions', {})
-        platforms = post['platforms']
-        image_path = post.get('image_path')
-        pinterest_title = post.get('pinterest_title', '')
-        pinterest_link = post.get('pinterest_link', '')
-        youtube_title = post.get('youtube_title', '')
-        youtube_description = post.get('youtube_description', '')
-        youtube_visibility = post.get('youtube_visibility', 'public')
-        
-        # Verify media file
-        media_path = None
-        if image_path and os.path.exists(image_path):
-            media_path = os.path.abspath(image_path)
-            print(f"✓ Media file found: {media_path}")
-        
-        results = {}
-        
-        # CRITICAL: Use headless=False for scheduled posts
-        headless_mode = False
-        
-        if 'linkedin' in platforms:
-            results['linkedin'] = post_to_linkedin(captions.get('linkedin', ''), media_path, headless_mode)
-        
-        if 'twitter' in platforms:
-            results['twitter'] = post_to_twitter(captions.get('twitter', ''), media_path, headless_mode)
-        
-        if 'instagram' in platforms:
-            if media_path:
-                results['instagram'] = post_to_instagram(captions.get('instagram', ''), media_path, headless_mode)
-            else:
-                results['instagram'] = {"success": False, "message": "Instagram requires media"}
-        
-        if 'facebook' in platforms:
-            results['facebook'] = post_to_facebook(captions.get('facebook', ''), media_path, headless_mode)
-        
-        if 'pinterest' in platforms:
-            if media_path:
-                title = pinterest_title if pinterest_title else captions.get('pinterest', '')
-                results['pinterest'] = post_to_pinterest(title, media_path, pinterest_link, captions.get('pinterest', ''), headless_mode)
-            else:
-                results['pinterest'] = {"success": False, "message": "Pinterest requires media"}
-        
-        if 'youtube' in platforms:
-            if media_path:
-                title = youtube_title if youtube_title else captions.get('youtube', '')
-                results['youtube'] = post_to_youtube(title, youtube_description, media_path, youtube_visibility, headless_mode)
+        job = ensure_sub_jobs(post)[platform]
+        job['status'] = status or ('succeeded' if result.get('success') else 'failed')
+        if attempted:
+            job['attempts'] += 1
+        job['result'] = result
+        job['finished_at'] = datetime.now().isoformat()
+        job['retry_at'] = retry_at.isoformat() if retry_at else None
+        post.setdefault('results', {})[platform] = result
+        save_scheduled_posts(posts)
+
+def _run_sub_job(post_id, platform, post, media_path, previous=None, attempts=0, force=False):
+    account = post.get('account') or DEFAULT_ACCOUNT
+    with log_context(post_id=post_id, account=account), use_account(account):
+        result = None
+        # Never re-post blindly after an attempt that may have gone through
+        probe = None
+        if not force and needs_publish_check(previous):
+            retry_at, probe = breaker_allow(platform)
+            if retry_at:
+                result = circuit_open_result(platform, retry_at)
             else:
-                results['youtube'] = {"success": False, "message": "YouTube requires media"}
-        
-        if 'youtubepost' in platforms:
-            results['youtubepost'] = post_to_youtube_post(captions.get('youtubepost', ''), media_path, headless_mode)
-        
-        # Update post status
-        post['status'] = 'completed'
-        post['executed_at'] = datetime.now().isoformat()
-        post['results'] = results
-        
-        # Clean up media
-        if image_path and os.path.exists(image_path):
+                published = verify_published(platform, post)
+                if published:
+                    breaker_record(platform, None, probe=probe)
+                    result = {"success": True, "message": "Already published (found on the account before retrying)", "verified": True}
+                    update_sub_job(post_id, platform, result)
+                    log.info("%s: %s", platform, result['message'])
+                    return result
+                if published is None:
+                    breaker_record(platform, 'fatal', probe=probe)
+                    result = {"success": False, "failure_class": 'fatal', "unverified": True,
+                              "message": "Previous attempt may have posted and it could not be checked; retry with force to post again"}
+                    update_sub_job(post_id, platform, result)
+                    log.warning("%s: %s", platform, result['message'])
+                    return result
+        
+        if result is None:
             try:
-                os.remove(image_path)
-                print(f"🗑️  Cleaned up: {image_path}")
+                priority = execution_priority(post, attempts)
+                # Retries and backfill run after the due time: there is nothing to hold for, and their lag
+                # would skew publish_lag_seconds
+                submit_at = None
+                if priority == PRIORITY_SCHEDULED and post.get('scheduled_time'):
+                    submit_at = datetime.fromisoformat(post['scheduled_time']).timestamp()
+                result = post_to_platform(platform, post, media_path, post.get('headless'), post.get('profile', False),
+                                          priority, probe, submit_at)
             except Exception as e:
-                print(f"⚠️  Cleanup failed: {e}")
+                result = {"success": False, "message": f"{platform} error: {str(e)}"}
+            finally:
+                breaker_release(platform, probe)
+        
+        retry_at = None
+        failure = classify_failure(platform, result)
+        if failure:
+            result['failure_class'] = failure
+            if failure == 'circuit':
+                # Not attempted: wait for the breaker instead of spending a retry
+                retry_at = schedule_retry(post_id, platform, datetime.fromisoformat(result['retry_at']))
+            elif failure in RETRYABLE_FAILURES and attempts + 1 < RETRY_MAX_ATTEMPTS:
+                retry_at = schedule_retry(post_id, platform, datetime.now() + timedelta(seconds=retry_delay(attempts + 1)))
+                log.info("%s: retry %s/%s at %s", platform, attempts + 2, RETRY_MAX_ATTEMPTS, retry_at.strftime('%H:%M:%S'))
+        update_sub_job(post_id, platform, result, retry_at=retry_at, attempted=failure != 'circuit')
+        level = logging.INFO if result.get('success') else logging.WARNING
+        log.log(level, "%s: %s", platform, result.get('message'))
+        return result
+
+def claimable(job, platforms, automatic, now):
+    """Whether this execution may take a sub-job: the scheduled run takes pending ones, an automatic
+    retry only failed ones whose retry is due, and a retry someone asked for pending or failed ones"""
+    if platforms is None:
+        return job['status'] == 'pending'
+    if automatic:
+        return job['status'] == 'failed' and bool(job.get('retry_at')) \
+            and datetime.fromisoformat(job['retry_at']) <= now + timedelta(seconds=1)
+    return job['status'] in ('pending', 'failed')
+
+def _execute_scheduled_post(post_id, platforms=None, force=False, automatic=False):
+    log.info("Executing scheduled post %s", post_id)
+    
+    # Claim the sub-jobs this execution is for under the lock, then post without holding it
+    with scheduled_posts_lock:
+        posts = load_scheduled_posts()
+        post = next((p for p in posts if p['id'] == post_id), None)
         
-        save_scheduled_posts(posts)
+        if not post:
+            log.error("Post %s not found", post_id)
+            return
         
-        print(f"\n✅ COMPLETED: {post_id}")
-        for platform, result in results.items():
-            status = "✅" if result.get('success') else "❌"
-            print(f"{status} {platform}: {result.get('message')}")
+        # Succeeded and running sub-jobs are never picked up, so resuming a post cannot double-post them;
+        # the lease settles which node runs a sub-job when several fire the same post
+        jobs = ensure_sub_jobs(post)
+        now = datetime.now()
+        targets = [p for p in PLATFORMS if p in jobs and (platforms is None or p in platforms)
+                   and claimable(jobs[p], platforms, automatic, now) and acquire_lease(job_lease(post_id, p))]
+        if not targets:
+            log.info("No pending or failed platforms for %s", post_id)
+            return
+
+        first_run = post['status'] == 'scheduled'
+        previous = {platform: jobs[platform].get('result') for platform in targets}
+        attempts = {platform: jobs[platform]['attempts'] for platform in targets}
+        for platform in targets:
+            jobs[platform]['status'] = 'running'
+        post['status'] = 'running'
+        save_scheduled_posts(posts)
+    
+    image_path = post.get('image_path')
+    if first_run:
+        try:
+            now = datetime.now()
+            scheduled_time = datetime.fromisoformat(post['scheduled_time'])
+            # Jobs are meant to start PREWARM_LEAD_SECONDS early, or when scheduled if that is later
+            planned = scheduled_time - timedelta(seconds=PREWARM_LEAD_SECONDS)
+            if post.get('created_at'):
+                planned = max(planned, datetime.fromisoformat(post['created_at']))
+            observe_histogram('scheduler_lag_seconds', max((now - planned).total_seconds(), 0))
+            observe_histogram('prewarm_lead_seconds', max((scheduled_time - now).total_seconds(), 0))
+        except (KeyError, ValueError):
+            pass
+    
+    # Verify media file
+    media_path = None
+    if image_path and os.path.exists(image_path):
+        media_path = os.path.abspath(image_path)
+        log.info("Media file found: %s", media_path)
+    
+    runnable = []
+    for platform in targets:
+        if platform in MEDIA_REQUIRED and not media_path:
+            update_sub_job(post_id, platform, {"success": False, "message": f"{MEDIA_REQUIRED[platform]} requires media"}, 'skipped')
+        else:
+            runnable.append(platform)
+    
+    try:
+        if len(runnable) > 1 and datetime.fromisoformat(post['scheduled_time']) > datetime.now():
+            # Pre-warmed: run platforms side by side so each reaches its submit step before the due time
+            if len(runnable) > PREWARM_MAX_BROWSERS:
+                log.warning("%s platforms but PREWARM_MAX_BROWSERS is %s: the rest will start after the due time",
+                            len(runnable), PREWARM_MAX_BROWSERS)
+            with ThreadPoolExecutor(max_workers=min(len(runnable), PREWARM_MAX_BROWSERS)) as pool:
+                for platform in runnable:
+                    pool.submit(_run_sub_job, post_id, platform, post, media_path,
+                                previous[platform], attempts[platform], force)
+        else:
+            for platform in runnable:
+                _run_sub_job(post_id, platform, post, media_path, previous[platform], attempts[platform], force)
+    finally:
+        with scheduled_posts_lock:
+            posts = load_scheduled_posts()
+            post = next((p for p in posts if p['id'] == post_id), None)
+            if post:
+                jobs = ensure_sub_jobs(post)
+                for platform in targets:
+                    if jobs[platform]['status'] == 'running':
+                        jobs[platform]['status'] = 'failed'
+                # Another execution (e.g. a retry of a different platform) may still be running
+                if any(job['status'] == 'running' for job in jobs.values()):
+                    post['status'] = 'running'
+                else:
+                    post['status'] = post_status_from_jobs(jobs)
+                post['executed_at'] = datetime.now().isoformat()
+                
+                # Media is kept while any sub-job can still be retried
+                if image_path and not any(job['status'] == 'failed' for job in jobs.values()) and os.path.exists(image_path):
+                    try:
+                        os.remove(image_path)
+                        log.info("Cleaned up: %s", image_path)
+                    except Exception as e:
+                        log.warning("Cleanup failed: %s", e)
+                
+                save_scheduled_posts(posts)
+                log.info("Finished scheduled post %s: %s", post_id, post['status'])
+            # Released under the lock so a retry claiming the same sub-job keeps its own lease
+            for platform in targets:
+                release_lease(job_lease(post_id, platform))
 
 @app.route('/')
 def index():
@@ -1239,6 +3784,14 @@ def generate_caption():
         if not prompt:
             return jsonify({"success": False, "message": "Prompt is required"})
         
+        if profile_requested(data.get('profile')):
+            denied = profiling_denied()
+            if denied:
+                return denied
+            with profile_run(f"caption_{platform or 'generic'}") as report:
+                caption = generate_caption_with_groq(prompt, platform)
+            return jsonify({"success": True, "caption": caption, "profile": report})
+        
         caption = generate_caption_with_groq(prompt, platform)
         return jsonify({"success": True, "caption": caption})
     except Exception as e:
@@ -1257,6 +3810,14 @@ def generate_all_captions():
         if not platforms:
             return jsonify({"success": False, "message": "At least one platform must be selected"})
         
+        if profile_requested(data.get('profile')):
+            denied = profiling_denied()
+            if denied:
+                return denied
+            with profile_run('captions_all') as report:
+                captions = {platform: generate_caption_with_groq(prompt, platform) for platform in platforms}
+            return jsonify({"success": True, "captions": captions, "profile": report})
+        
         captions = {}
         for platform in platforms:
             captions[platform] = generate_caption_with_groq(prompt, platform)
@@ -1270,10 +3831,18 @@ def post():
     try:
         data = request.form
         platforms = request.form.getlist('platforms[]')
-        headless = request.form.get('headless') == 'true'
-        
-        # OVERRIDE: Force headless=False for reliability
-        headless = False
+        headless = parse_headless_flag(request.form.get('headless'))
+        profile = profile_requested(request.form.get('profile'))
+        if profile:
+            denied = profiling_denied()
+            if denied:
+                return denied
+        busy = browser_backpressure()
+        if busy:
+            return busy
+        account = request.form.get('account') or DEFAULT_ACCOUNT
+        if not known_account(account):
+            return jsonify({"success": False, "message": f"Unknown account: {account}"})
         
         captions = {}
         for platform in platforms:
@@ -1301,50 +3870,52 @@ def post():
                 file.save(media_path)
                 media_path = os.path.abspath(media_path)
         
-        results = {}
-        
-        if 'linkedin' in platforms:
-            results['linkedin'] = post_to_linkedin(captions.get('linkedin', ''), media_path, headless)
-        
-        if 'twitter' in platforms:
-            results['twitter'] = post_to_twitter(captions.get('twitter', ''), media_path, headless)
-        
-        if 'instagram' in platforms:
-            results['instagram'] = post_to_instagram(captions.get('instagram', ''), media_path, headless)
-        
-        if 'facebook' in platforms:
-            results['facebook'] = post_to_facebook(captions.get('facebook', ''), media_path, headless)
-        
-        if 'pinterest' in platforms:
-            title = pinterest_title if pinterest_title else captions.get('pinterest', '')
-            description = captions.get('pinterest', '')
-            results['pinterest'] = post_to_pinterest(title, media_path, pinterest_link, description, headless)
-        
-        if 'youtube' in platforms:
-            title = youtube_title if youtube_title else captions.get('youtube', '')
-            description = youtube_description
-            results['youtube'] = post_to_youtube(title, description, media_path, youtube_visibility, headless)
-        
-        if 'youtubepost' in platforms:
-            results['youtubepost'] = post_to_youtube_post(captions.get('youtubepost', ''), media_path, headless)
-        
-        if media_path and os.path.exists(media_path):
-            try:
-                os.remove(media_path)
-            except:
-                pass
-        
-        return jsonify({"success": True, "results": results})
+        post_data = {
+            'captions': captions,
+            'pinterest_title': pinterest_title,
+            'pinterest_link': pinterest_link,
+            'youtube_title': youtube_title,
+            'youtube_description': youtube_description,
+            'youtube_visibility': youtube_visibility,
+            'account': account
+        }
         
+        return command_response(run_command('post', post_data=post_data, platforms=platforms, media_path=media_path,
+                                            headless=headless, profile=profile))
+    
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+def post_now(post_data, platforms, media_path=None, headless=None, profile=False):
+    """Post to each selected platform right away, then remove the uploaded media"""
+    results = {}
+    for platform in PLATFORMS:
+        if platform in platforms:
+            results[platform] = post_to_platform(platform, post_data, media_path, headless, profile)
+    
+    if media_path and os.path.exists(media_path):
+        try:
+            os.remove(media_path)
+        except:
+            pass
+    
+    return {"success": True, "results": results}
+
 @app.route('/schedule-post', methods=['POST'])
 def schedule_post():
     try:
         data = request.form
         platforms = request.form.getlist('platforms[]')
         schedule_datetime = request.form.get('schedule_datetime')
+        headless = parse_headless_flag(request.form.get('headless'))
+        profile = profile_requested(request.form.get('profile'))
+        if profile:
+            denied = profiling_denied()
+            if denied:
+                return denied
+        account = request.form.get('account') or DEFAULT_ACCOUNT
+        if not known_account(account):
+            return jsonify({"success": False, "message": f"Unknown account: {account}"})
         
         pinterest_title = data.get('pinterest_title', '')
         pinterest_link = data.get('pinterest_link', '')
@@ -1396,35 +3967,43 @@ def schedule_post():
             'youtube_title': youtube_title,
             'youtube_description': youtube_description,
             'youtube_visibility': youtube_visibility,
+            'headless': headless,
+            'profile': profile,
+            'account': account,
             'status': 'scheduled',
             'created_at': datetime.now().isoformat()
         }
         
-        with scheduled_posts_lock:
-            posts = load_scheduled_posts()
-            posts.append(post_data)
-            save_scheduled_posts(posts)
-        
-        try:
-            scheduler.add_job(
-                func=execute_scheduled_post,
-                trigger=DateTrigger(run_date=scheduled_time),
-                args=[post_id],
-                id=post_id,
-                replace_existing=True
-            )
-        except Exception as e:
-            return jsonify({"success": False, "message": f"Error scheduling job: {str(e)}"})
-        
-        return jsonify({
-            "success": True,
-            "message": f"Post scheduled for {scheduled_time.strftime('%Y-%m-%d %H:%M')}",
-            "post_id": post_id
-        })
-        
+        return command_response(run_command('schedule', post_data=post_data))
+    
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+def add_scheduled_post(post_data):
+    """Store a new scheduled post and queue its job"""
+    with scheduled_posts_lock:
+        posts = load_scheduled_posts()
+        posts.append(post_data)
+        save_scheduled_posts(posts)
+    
+    scheduled_time = datetime.fromisoformat(post_data['scheduled_time'])
+    try:
+        scheduler.add_job(
+            func=execute_scheduled_post,
+            trigger=DateTrigger(run_date=job_run_date(scheduled_time)),
+            args=[post_data['id']],
+            id=post_data['id'],
+            replace_existing=True
+        )
+    except Exception as e:
+        return {"success": False, "message": f"Error scheduling job: {str(e)}"}
+    
+    return {
+        "success": True,
+        "message": f"Post scheduled for {scheduled_time.strftime('%Y-%m-%d %H:%M')}",
+        "post_id": post_data['id']
+    }
+
 @app.route('/get-scheduled-posts', methods=['GET'])
 def get_scheduled_posts():
     try:
@@ -1453,67 +4032,302 @@ def get_scheduled_posts():
 @app.route('/cancel-scheduled-post/<post_id>', methods=['DELETE'])
 def cancel_scheduled_post(post_id):
     try:
-        with scheduled_posts_lock:
-            posts = load_scheduled_posts()
-            post = next((p for p in posts if p['id'] == post_id), None)
-            
-            if not post:
-                return jsonify({"success": False, "message": "Post not found"})
-            
+        return command_response(run_command('cancel', post_id=post_id))
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+def cancel_post(post_id):
+    """Remove a scheduled post, its job and its media"""
+    with scheduled_posts_lock:
+        posts = load_scheduled_posts()
+        post = next((p for p in posts if p['id'] == post_id), None)
+        
+        if not post:
+            return {"success": False, "message": "Post not found"}
+        
+        try:
+            scheduler.remove_job(post_id)
+        except:
+            pass
+        
+        if post.get('image_path') and os.path.exists(post['image_path']):
             try:
-                scheduler.remove_job(post_id)
+                os.remove(post['image_path'])
             except:
                 pass
-            
-            if post.get('image_path') and os.path.exists(post['image_path']):
-                try:
-                    os.remove(post['image_path'])
-                except:
-                    pass
-            
-            posts = [p for p in posts if p['id'] != post_id]
-            save_scheduled_posts(posts)
-            
-        return jsonify({"success": True, "message": "Scheduled post cancelled"})
         
+        posts = [p for p in posts if p['id'] != post_id]
+        save_scheduled_posts(posts)
+    
+    return {"success": True, "message": "Scheduled post cancelled"}
+
+@app.route('/retry-scheduled-post/<post_id>', methods=['POST'])
+def retry_scheduled_post(post_id):
+    try:
+        data = request.get_json(silent=True) or {}
+        platforms = data.get('platforms') or request.form.getlist('platforms[]') or None
+        force = bool(data.get('force')) or request.form.get('force') in ('1', 'true', 'on')
+        return command_response(run_command('retry', post_id=post_id, platforms=platforms, force=force))
+    
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+def retry_post(post_id, platforms=None, force=False):
+    """Queue a new run of a post's pending/failed sub-jobs (limited to platforms if given)"""
+    with scheduled_posts_lock:
+        posts = load_scheduled_posts()
+        post = next((p for p in posts if p['id'] == post_id), None)
+        
+        if not post:
+            return {"success": False, "message": "Post not found"}
+        if post['status'] == 'scheduled':
+            return {"success": False, "message": "Post has not run yet"}
+        
+        jobs = ensure_sub_jobs(post)
+        retry = [p for p, job in jobs.items() if job['status'] in ('pending', 'failed')
+                 and (platforms is None or p in platforms)]
+        if not retry:
+            return {"success": False, "message": "No failed platforms to retry"}
+    
+    scheduler.add_job(
+        func=execute_scheduled_post,
+        args=[post_id, retry, force],
+        id=f"{post_id}_retry",
+        replace_existing=True
+    )
+    return {"success": True, "message": f"Retrying {', '.join(retry)}", "platforms": retry}
+
 @app.route('/delete-completed-post/<post_id>', methods=['DELETE'])
 def delete_completed_post(post_id):
     try:
-        with scheduled_posts_lock:
-            posts = load_scheduled_posts()
-            post = next((p for p in posts if p['id'] == post_id), None)
-            
-            if not post:
-                return jsonify({"success": False, "message": "Post not found"})
-            
-            if post.get('image_path') and os.path.exists(post['image_path']):
-                try:
-                    os.remove(post['image_path'])
-                except:
-                    pass
-            
-            posts = [p for p in posts if p['id'] != post_id]
-            save_scheduled_posts(posts)
-            
-        return jsonify({"success": True, "message": "Post deleted successfully"})
+        return command_response(run_command('delete', post_id=post_id))
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+def delete_post(post_id):
+    """Remove a finished post and its media"""
+    with scheduled_posts_lock:
+        posts = load_scheduled_posts()
+        post = next((p for p in posts if p['id'] == post_id), None)
         
+        if not post:
+            return {"success": False, "message": "Post not found"}
+        
+        if post.get('image_path') and os.path.exists(post['image_path']):
+            try:
+                os.remove(post['image_path'])
+            except:
+                pass
+        
+        posts = [p for p in posts if p['id'] != post_id]
+        save_scheduled_posts(posts)
+    
+    return {"success": True, "message": "Post deleted successfully"}
+
+COMMAND_HANDLERS = {
+    'post': post_now,
+    'schedule': add_scheduled_post,
+    'cancel': cancel_post,
+    'retry': retry_post,
+    'delete': delete_post,
+}
+
+def run_command(kind, **payload):
+    """Run a command in this process, or hand it to the scheduler worker from a web-only process"""
+    if APP_ROLE != 'web':
+        return COMMAND_HANDLERS[kind](**payload)
+    command_id = enqueue_command(kind, payload)
+    command = wait_for_command(command_id, WEB_COMMAND_WAIT_SECONDS)
+    if command['status'] in ('done', 'failed'):
+        return command['result']
+    return {"success": True, "queued": True, "command_id": command_id,
+            "message": f"Queued for the scheduler worker; see /commands/{command_id}"}
+
+def command_response(result):
+    return jsonify(result), 202 if result.get('queued') else 200
+
+def _run_queued_command(command_id, kind, payload):
+    with log_context(command=command_id):
+        try:
+            finish_command(command_id, COMMAND_HANDLERS[kind](**payload))
+        except Exception as e:
+            log.error("Command %s failed: %s", kind, e)
+            finish_command(command_id, {"success": False, "message": str(e)}, 'failed')
+
+# Commands run on their own threads: scheduler threads can all be waiting for browsers after downtime
+COMMAND_THREADS = int(os.environ.get('COMMAND_THREADS', '8'))
+command_pool = ThreadPoolExecutor(max_workers=COMMAND_THREADS, thread_name_prefix='command')
+
+def consume_commands():
+    """Scheduler worker loop: hand each queued command to a command thread"""
+    while True:
+        try:
+            claimed = claim_command()
+        except sqlite3.Error as e:
+            log.warning("Work queue unavailable: %s", e)
+            claimed = None
+        if claimed is None:
+            time.sleep(WORK_QUEUE_POLL_SECONDS)
+            continue
+        command_id, kind, payload, created_at = claimed
+        if kind not in COMMAND_HANDLERS:
+            finish_command(command_id, {"success": False, "message": f"Unknown command: {kind}"}, 'failed')
+            continue
+        waited = time.time() - created_at
+        if kind in EXPIRING_COMMANDS and waited > COMMAND_TTL_SECONDS:
+            log.warning("Command %s (%s) expired after %.0fs in the queue", command_id, kind, waited)
+            finish_command(command_id, {"success": False, "expired": True,
+                                        "message": f"Not posted: no scheduler worker picked it up within {COMMAND_TTL_SECONDS:.0f}s"}, 'failed')
+            continue
+        command_pool.submit(_run_queued_command, command_id, kind, payload)
+
+def scheduler_snapshot():
+    """Scheduler, breaker, browser and worker state for /scheduler-status"""
+    return {
+        "worker_id": WORKER_ID,
+        "scheduler_running": scheduler.running,
+        "active_jobs": len(scheduler.get_jobs()),
+        "circuit_breakers": breaker_states(),
+        "browsers": browser_governor.snapshot(),
+        "poster_workers": poster_workers.snapshot()
+    }
+
+def publish_worker_status():
+    """Share this node's status and metrics with web processes, and prune old commands and nodes"""
+    rss = browsers_rss_mb()
+    if rss is not None:
+        set_gauge('browser_rss_mb', round(rss, 1))
+    status = dict(scheduler_snapshot(), metrics=render_metrics(), timeout_budgets=timeout_budgets(), pid=os.getpid())
+    conn = queue_db()
+    try:
+        conn.execute("INSERT OR REPLACE INTO worker_status (name, updated_at, status) VALUES (?, ?, ?)",
+                     (WORKER_ID, time.time(), json.dumps(status, default=str)))
+        conn.execute("DELETE FROM commands WHERE status IN ('done', 'failed') AND finished_at < ?",
+                     (time.time() - WORK_QUEUE_KEEP_DAYS * 86400,))
+        conn.execute("DELETE FROM worker_status WHERE updated_at < ?", (time.time() - 86400,))
+    finally:
+        conn.close()
+
+def worker_statuses():
+    """{worker id: last published status} for the nodes that reported within LEASE_TTL_SECONDS"""
+    conn = queue_db()
+    try:
+        rows = conn.execute("SELECT name, updated_at, status FROM worker_status WHERE updated_at >= ? ORDER BY name",
+                            (time.time() - LEASE_TTL_SECONDS,)).fetchall()
+    finally:
+        conn.close()
+    return {row['name']: dict(json.loads(row['status']), reported_seconds_ago=round(time.time() - row['updated_at'], 1))
+            for row in rows}
+
+def node_metrics(statuses):
+    """Every node's metrics text as one exposition, each series labelled with its node"""
+    lines, seen = [], set()
+    for node, status in statuses.items():
+        for line in status.get('metrics', '').splitlines():
+            if line.startswith('#'):
+                if line not in seen:
+                    seen.add(line)
+                    lines.append(line)
+                continue
+            name, _, rest = line.partition(' ')
+            label = f'node="{node}"'
+            name = name.replace('{', '{' + label + ',', 1) if '{' in name else f'{name}{{{label}}}'
+            lines.append(f"{name} {rest}")
+    return '\n'.join(lines) + '\n' if lines else ''
+
+def heartbeat():
+    """Renew this node's leases and publish its status every WORKER_HEARTBEAT_SECONDS"""
+    while True:
+        try:
+            renew_leases()
+            publish_worker_status()
+        except sqlite3.Error as e:
+            log.warning("Heartbeat failed: %s", e)
+        time.sleep(WORKER_HEARTBEAT_SECONDS)
+
+def reclaim_abandoned_work():
+    """Take over sub-jobs and commands whose node stopped renewing their lease"""
+    with scheduled_posts_lock:
+        # Read the leases under the lock: claims happen under it too
+        live = live_leases()
+        posts = load_scheduled_posts()
+        reclaimed = 0
+        for post in posts:
+            jobs = post.get('jobs', {})
+            for platform, job in jobs.items():
+                if job['status'] != 'running' or job_lease(post['id'], platform) in live:
+                    continue
+                # Whatever was running may or may not have posted; the retry checks before posting again
+                job.update(status='failed', attempts=job['attempts'] + 1, finished_at=datetime.now().isoformat(),
+                           result={"success": False, "message": "Interrupted: the worker running it stopped", "interrupted": True})
+                post.setdefault('results', {})[platform] = job['result']
+                job['retry_at'] = None
+                if job['attempts'] < RETRY_MAX_ATTEMPTS:
+                    job['retry_at'] = schedule_retry(post['id'], platform, datetime.now()).isoformat()
+                reclaimed += 1
+                log.warning("Taking over %s/%s from a stopped worker", post['id'], platform)
+            if post['status'] == 'running' and not any(job['status'] == 'running' for job in jobs.values()):
+                post['status'] = post_status_from_jobs(jobs)
+        if reclaimed:
+            save_scheduled_posts(posts)
+    
+    conn = queue_db()
+    try:
+        # Commands may have half-run; never replay them blindly
+        failed = conn.execute("""UPDATE commands SET status = 'failed', finished_at = ?, result = ?
+            WHERE status = 'running' AND 'command/' || id NOT IN (SELECT name FROM leases WHERE expires_at >= ?)""",
+            (time.time(), json.dumps({"success": False, "message": "Interrupted: the worker running it stopped"}), time.time())).rowcount
+        conn.execute("DELETE FROM leases WHERE expires_at < ?", (time.time(),))
+    finally:
+        conn.close()
+    if failed:
+        log.warning("Marked %s interrupted commands as failed", failed)
+
+def run_worker():
+    """Entry point of the scheduler worker process (worker.py)"""
+    threading.Thread(target=consume_commands, name='work-queue', daemon=True).start()
+    log.info("Scheduler worker %s consuming %s", WORKER_ID, WORK_QUEUE_DB)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+
+@app.route('/accounts', methods=['GET'])
+def get_accounts():
+    try:
+        return jsonify({"success": True, "accounts": list_accounts()})
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+@app.route('/commands/<int:command_id>', methods=['GET'])
+def get_command(command_id):
+    try:
+        command = command_status(command_id)
+        if not command:
+            return jsonify({"success": False, "message": "Command not found"}), 404
+        return jsonify({"success": True, "command": command})
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
 def restore_scheduled_jobs():
     """Restore scheduled jobs on startup"""
-    print("\n" + "="*60)
-    print("RESTORING SCHEDULED JOBS")
-    print("="*60)
+    log.info("Restoring scheduled jobs")
+    
+    # A restarted node holds nothing; what it was running is taken over like any stopped node's work
+    conn = queue_db()
+    try:
+        conn.execute("DELETE FROM leases WHERE owner = ?", (WORKER_ID,))
+    finally:
+        conn.close()
+    reclaim_abandoned_work()
     
     with scheduled_posts_lock:
         posts = load_scheduled_posts()
         current_time = datetime.now()
         
         for post in posts:
+            sync_retries(post, current_time)
             if post['status'] == 'scheduled':
                 try:
                     scheduled_time = datetime.fromisoformat(post['scheduled_time'])
@@ -1521,68 +4335,148 @@ def restore_scheduled_jobs():
                     if scheduled_time > current_time:
                         scheduler.add_job(
                             func=execute_scheduled_post,
-                            trigger=DateTrigger(run_date=scheduled_time),
+                            trigger=DateTrigger(run_date=job_run_date(scheduled_time)),
+                            args=[post['id']],
+                            id=post['id'],
+                            replace_existing=True
+                        )
+                        log.debug("Restored job: %s", post['id'])
+                    elif (current_time - scheduled_time).total_seconds() <= BACKFILL_MAX_AGE_SECONDS:
+                        scheduler.add_job(
+                            func=execute_scheduled_post,
                             args=[post['id']],
                             id=post['id'],
+                            executor='backfill',
                             replace_existing=True
                         )
-                        print(f"✓ Restored job: {post['id']}")
+                        log.info("Backfilling overdue post: %s", post['id'])
                     else:
                         post['status'] = 'missed'
-                        print(f"✗ Missed: {post['id']}")
+                        log.warning("Missed: %s", post['id'])
                         
                 except Exception as e:
-                    print(f"✗ Error: {e}")
+                    log.error("Error restoring job: %s", e)
         
         save_scheduled_posts(posts)
-        print(f"Restored {len([p for p in posts if p['status'] == 'scheduled'])} jobs")
-        print("="*60 + "\n")
+        log.info("Restored %s jobs", len([p for p in posts if p['status'] == 'scheduled']))
 
 @app.route('/scheduler-status', methods=['GET'])
 def scheduler_status():
     """Debug endpoint"""
     try:
-        jobs = scheduler.get_jobs()
         posts = load_scheduled_posts()
-        
-        return jsonify({
-            "success": True,
-            "scheduler_running": scheduler.running,
-            "active_jobs": len(jobs),
-            "stored_posts": len(posts)
-        })
+        if APP_ROLE == 'web':
+            workers = worker_statuses()
+            if not workers:
+                return jsonify({"success": False, "message": "No scheduler worker has reported recently", "stored_posts": len(posts)})
+            for worker in workers.values():
+                worker.pop('metrics', None)
+                worker.pop('timeout_budgets', None)
+            status = {"workers": workers}
+        else:
+            status = scheduler_snapshot()
+
+        return jsonify(dict(status, success=True, role=APP_ROLE, stored_posts=len(posts)))
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)})
+
+@app.route('/profiles/<path:filename>', methods=['GET'])
+def get_profile(filename):
+    denied = profiling_denied()
+    if denied:
+        return denied
+    return send_from_directory(os.path.abspath(app.config['PROFILES_FOLDER']), filename)
+
+@app.route('/performance-history', methods=['GET'])
+def performance_history():
+    try:
+        granularity = request.args.get('granularity', 'day')
+        if granularity not in ROLLUP_RETENTION:
+            return jsonify({"success": False, "message": "granularity must be 'hour' or 'day'"})
+        days = float(request.args.get('days', 7))
+        platforms = performance_series(granularity, days, request.args.get('platform'))
+        return jsonify({"success": True, "granularity": granularity, "days": days, "platforms": platforms})
     except Exception as e:
         return jsonify({"success": False, "message": str(e)})
 
+@app.route('/timeout-budgets', methods=['GET'])
+def get_timeout_budgets():
+    if APP_ROLE == 'web':
+        # Samples and coded defaults live in the nodes that ran the waits; each publishes its budgets
+        nodes = {node: status.get('timeout_budgets', {}) for node, status in worker_statuses().items()}
+        return jsonify({"success": True, "adaptive": ADAPTIVE_TIMEOUTS, "nodes": nodes})
+    return jsonify({"success": True, "adaptive": ADAPTIVE_TIMEOUTS, "budgets": timeout_budgets()})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint"""
+    if APP_ROLE == 'web':
+        # Browser and scheduler series live in the workers; each publishes them with its status
+        return Response(render_metrics() + node_metrics(worker_statuses()), mimetype='text/plain; version=0.0.4')
+    rss = browsers_rss_mb()
+    if rss is not None:
+        set_gauge('browser_rss_mb', round(rss, 1))
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
 def check_missed_posts():
-    """Periodic check for missed posts"""
+    """Periodic check for missed posts, abandoned work, and posts and retries scheduled through other nodes"""
+    try:
+        reclaim_abandoned_work()
+    except sqlite3.Error as e:
+        log.warning("Could not check leases: %s", e)
+    
     with scheduled_posts_lock:
         posts = load_scheduled_posts()
         current_time = datetime.now()
         
         for post in posts:
+            try:
+                sync_retries(post, current_time)
+            except Exception as e:
+                log.error("Retry sync error: %s", e)
             if post['status'] == 'scheduled':
                 try:
                     scheduled_time = datetime.fromisoformat(post['scheduled_time'])
                     
                     if scheduled_time < current_time:
-                        print(f"[CHECK] Executing overdue post: {post['id']}")
-                        thread = threading.Thread(target=execute_scheduled_post, args=[post['id']])
-                        thread.start()
+                        log.info("Executing overdue post: %s", post['id'])
+                        scheduler.add_job(
+                            func=execute_scheduled_post,
+                            args=[post['id']],
+                            id=post['id'],
+                            executor='backfill',
+                            replace_existing=True
+                        )
+                    elif scheduler.get_job(post['id']) is None:
+                        scheduler.add_job(
+                            func=execute_scheduled_post,
+                            trigger=DateTrigger(run_date=job_run_date(scheduled_time)),
+                            args=[post['id']],
+                            id=post['id']
+                        )
                         
                 except Exception as e:
-                    print(f"[CHECK] Error: {e}")
+                    log.error("Missed-post check error: %s", e)
 
-scheduler.add_job(
-    func=check_missed_posts,
-    trigger='interval',
-    seconds=60,
-    id='missed_posts_check',
-    replace_existing=True
-)
+if RUNS_SCHEDULER:
+    scheduler.add_job(
+        func=check_missed_posts,
+        trigger='interval',
+        seconds=60,
+        id='missed_posts_check',
+        replace_existing=True
+    )
 
-restore_scheduled_jobs()
-atexit.register(lambda: scheduler.shutdown())
+if RUNS_SCHEDULER:
+    restore_scheduled_jobs()
+    threading.Thread(target=heartbeat, name='heartbeat', daemon=True).start()
+    atexit.register(lambda: scheduler.shutdown())
+    atexit.register(poster_workers.shutdown)
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    if POSTER_WORKER:
+        poster_worker_main()
+    elif APP_ROLE == 'scheduler':
+        run_worker()
+    else:
+        app.run(debug=True, port=5000)
\ No newline at end of file
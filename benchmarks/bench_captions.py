@@ -0,0 +1,117 @@
+"""
+Caption throughput benchmark
+Starts the Groq stub and the Flask app on local ports, then drives
+/generate-caption and /generate-all-captions at each concurrency level and
+reports throughput, tail latency and how errors / 429s surfaced to clients.
+
+Usage: python benchmarks/bench_captions.py [--concurrency 1,4,16] [--requests 100]
+                                           [--latency-ms 400] [--error-rate 0.02] [--rate-limit-rate 0.05]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from groq_stub import start_groq_stub
+
+ALL_PLATFORMS = ['linkedin', 'twitter', 'instagram', 'facebook', 'pinterest', 'youtube', 'youtubepost']
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def call(url, payload):
+    """POST JSON; returns (seconds, ok, caption_errors)"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    start = time.time()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            body = json.loads(response.read())
+    except Exception:
+        return time.time() - start, False, 0
+    elapsed = time.time() - start
+    captions = [body['caption']] if 'caption' in body else list(body.get('captions', {}).values())
+    caption_errors = sum(1 for c in captions if c.startswith('Error generating caption'))
+    return elapsed, bool(body.get('success')) and caption_errors == 0, caption_errors
+
+def run_level(base_url, endpoint, concurrency, total):
+    if endpoint == '/generate-caption':
+        payload = {'prompt': 'Launching our new analytics dashboard', 'platform': 'linkedin'}
+    else:
+        payload = {'prompt': 'Launching our new analytics dashboard', 'platforms': ALL_PLATFORMS}
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: call(base_url + endpoint, payload), range(total)))
+    wall = time.time() - start
+
+    latencies = [r[0] for r in results]
+    failures = sum(1 for r in results if not r[1])
+    caption_errors = sum(r[2] for r in results)
+    return {
+        'throughput': total / wall,
+        'p50': statistics.median(latencies),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'failures': failures,
+        'caption_errors': caption_errors
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the caption endpoints against a local Groq stub")
+    parser.add_argument('--concurrency', default='1,4,16')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--latency-ms', type=int, default=400)
+    parser.add_argument('--jitter-ms', type=int, default=200)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--endpoints', default='/generate-caption,/generate-all-captions')
+    args = parser.parse_args()
+
+    stub, stub_url = start_groq_stub(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                     error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+    os.environ['GROQ_BASE_URL'] = stub_url
+    os.environ.setdefault('GROQ_API_KEY', 'stub')
+
+    os.chdir(tempfile.mkdtemp(prefix='bench_captions_'))
+    import app
+    app.GROQ_BASE_URL = stub_url
+    app.GROQ_API_KEY = os.environ['GROQ_API_KEY']
+
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"{'endpoint':<24}{'conc':>5}{'req/s':>8}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'fail':>6}{'cap err':>9}")
+    for endpoint in args.endpoints.split(','):
+        for concurrency in [int(c) for c in args.concurrency.split(',')]:
+            stats = run_level(base_url, endpoint, concurrency, args.requests)
+            print(f"{endpoint:<24}{concurrency:>5}{stats['throughput']:>8.1f}{stats['p50']:>8.2f}"
+                  f"{stats['p95']:>8.2f}{stats['p99']:>8.2f}{stats['failures']:>6}{stats['caption_errors']:>9}")
+
+    server.shutdown()
+    stub.shutdown()
+    print(f"\nStub saw {stub.stats['requests']} requests, {stub.stats['errors']} errors, "
+          f"{stub.stats['rate_limited']} rate-limited (the Groq client retries 429/5xx on its own)")
+
+if __name__ == '__main__':
+    main()
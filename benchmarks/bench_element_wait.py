@@ -0,0 +1,106 @@
+"""
+Element wait micro-benchmark
+Compares WebDriverWait polling against the in-page MutationObserver wait
+(wait_for_element_js) on local test pages where the target appears after a delay.
+
+Usage: python benchmarks/bench_element_wait.py [--runs 10] [--headed]
+"""
+
+import argparse
+import functools
+import http.server
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py works relative to the working directory and, unless APP_ROLE=web, starts the scheduler
+# (restoring and running whatever is stored there) on import: keep it away from real posts and cookies
+WORKDIR = tempfile.mkdtemp(prefix='bench_wait_')
+os.chdir(WORKDIR)
+os.environ['APP_ROLE'] = 'web'
+
+from app import get_chrome_driver, wait_for_any
+
+# Each page reveals its target after `delay` ms; the wait should notice as soon as possible
+PAGES = {
+    'appear': """<html><body><script>
+        setTimeout(function () {
+            var b = document.createElement('button'); b.id = 'target'; b.textContent = 'Post';
+            document.body.appendChild(b);
+        }, %(delay)d);
+    </script></body></html>""",
+    'enable': """<html><body><button id="target" disabled>Post</button><script>
+        setTimeout(function () { document.getElementById('target').disabled = false; }, %(delay)d);
+    </script></body></html>""",
+    'unhide': """<html><body><button id="target" style="display:none">Post</button><script>
+        setTimeout(function () { document.getElementById('target').style.display = 'block'; }, %(delay)d);
+    </script></body></html>""",
+}
+
+SELECTORS = ["//button[@id='missing']", "//button[@id='target']"]
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def serve(directory):
+    """Serve the generated pages on a free local port"""
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run(driver, url, delay_ms, use_observer):
+    """Load the page, wait for the target and return (overshoot ms, commands)"""
+    driver.get(url)
+    start = time.time()
+    commands_before = driver.command_count
+    element = wait_for_any(driver, SELECTORS, timeout=10, use_observer=use_observer)
+    elapsed_ms = (time.time() - start) * 1000
+    if element is None:
+        raise RuntimeError(f"Target never found on {url}")
+    return elapsed_ms - delay_ms, driver.command_count - commands_before
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark polling vs. MutationObserver waits")
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--delays', default='200,1000,3000', help="Comma-separated reveal delays in ms")
+    parser.add_argument('--headed', action='store_true')
+    args = parser.parse_args()
+
+    delays = [int(d) for d in args.delays.split(',')]
+    workdir = WORKDIR
+    for name, template in PAGES.items():
+        for delay in delays:
+            with open(os.path.join(workdir, f"{name}_{delay}.html"), 'w') as f:
+                f.write(template % {'delay': delay})
+
+    server = serve(workdir)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    driver = get_chrome_driver(headless=not args.headed)
+
+    print(f"{'page':<14}{'mode':<10}{'p50 late ms':>12}{'max late ms':>12}{'commands':>10}")
+    try:
+        for name in PAGES:
+            for delay in delays:
+                url = f"{base}/{name}_{delay}.html"
+                for mode, use_observer in (('polling', False), ('observer', True)):
+                    lateness, commands = [], []
+                    for _ in range(args.runs):
+                        late, cmds = run(driver, url, delay, use_observer)
+                        lateness.append(late)
+                        commands.append(cmds)
+                    print(f"{name + '/' + str(delay):<14}{mode:<10}"
+                          f"{statistics.median(lateness):>12.0f}{max(lateness):>12.0f}"
+                          f"{statistics.median(commands):>10.0f}")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
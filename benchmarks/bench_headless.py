@@ -0,0 +1,108 @@
+"""
+Headless vs. headed benchmark
+Launches Chrome in each mode, loads a local page with a hidden file input and a
+button that opens a detached file chooser, uploads a file through
+find_and_upload_file and reports launch/upload latency and peak RSS of the
+Chrome process tree.
+
+Usage: python benchmarks/bench_headless.py [--runs 5] [--modes headless,headed]
+"""
+
+import argparse
+import functools
+import http.server
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py works relative to the working directory and, unless APP_ROLE=web, starts the scheduler
+# (restoring and running whatever is stored there) on import: keep it away from real posts and cookies
+WORKDIR = tempfile.mkdtemp(prefix='bench_headless_')
+os.chdir(WORKDIR)
+os.environ['APP_ROLE'] = 'web'
+
+from app import get_chrome_driver, find_and_upload_file, wait_for_any, safe_click, driver_rss_mb, has_display, PSUTIL_AVAILABLE
+
+# The page has no file input until the button creates one, so uploads go through the picker path
+UPLOAD_PAGE = """<html><body>
+<button id="open-picker" onclick="
+    var input = document.createElement('input');
+    input.type = 'file';
+    input.onchange = function () { document.title = 'picked:' + input.files.length; };
+    input.click();
+">Add media</button>
+</body></html>"""
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def serve(directory):
+    """Serve the benchmark page on a free local port"""
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run_once(url, upload_file, headless):
+    """One launch/upload/quit cycle; returns launch seconds, upload seconds and peak RSS MB"""
+    start = time.time()
+    driver = get_chrome_driver(headless=headless)
+    launch = time.time() - start
+    peak = driver_rss_mb(driver) or 0
+    try:
+        driver.get(url)
+        start = time.time()
+        button = wait_for_any(driver, ["//button[@id='open-picker']"], timeout=10)
+        safe_click(driver, button, "js")
+        if not find_and_upload_file(driver, upload_file, wait_time=5):
+            raise RuntimeError("Upload failed")
+        upload = time.time() - start
+        peak = max(peak, driver_rss_mb(driver) or 0)
+    finally:
+        driver.quit()
+    return launch, upload, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless vs. headed posting drivers")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--modes', default='headless,headed')
+    args = parser.parse_args()
+
+    if not PSUTIL_AVAILABLE:
+        print("psutil not installed: memory columns will read 0")
+
+    workdir = WORKDIR
+    with open(os.path.join(workdir, 'upload.html'), 'w') as f:
+        f.write(UPLOAD_PAGE)
+    upload_file = os.path.join(workdir, 'image.png')
+    with open(upload_file, 'wb') as f:
+        f.write(os.urandom(256 * 1024))
+
+    server = serve(workdir)
+    url = f"http://127.0.0.1:{server.server_address[1]}/upload.html"
+
+    print(f"{'mode':<10}{'launch p50 s':>14}{'upload p50 s':>14}{'peak RSS MB':>14}")
+    try:
+        for mode in args.modes.split(','):
+            headless = mode.strip() == 'headless'
+            if not headless and not has_display():
+                print(f"{mode:<10}skipped: no display")
+                continue
+            launches, uploads, peaks = [], [], []
+            for _ in range(args.runs):
+                launch, upload, peak = run_once(url, upload_file, headless)
+                launches.append(launch)
+                uploads.append(upload)
+                peaks.append(peak)
+            print(f"{mode:<10}{statistics.median(launches):>14.2f}{statistics.median(uploads):>14.2f}{max(peaks):>14.0f}")
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+End-to-end posting benchmark
+Runs every post_to_* against the local mock sites (benchmarks/mock_sites.py)
+and reports p50/p95 latency, WebDriver command counts, peak Chrome memory and
+whether the mock actually received each post.
+
+Usage: python benchmarks/bench_posting.py [--runs 5] [--platforms linkedin,twitter] [--delay-ms 300] [--headed]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_sites import start_mock_server, use_mock_sites, write_mock_cookies
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def sample_peak_rss(stop, peak):
+    """Track peak RSS of every child process (chromedriver + Chrome) until stop is set"""
+    import psutil
+    me = psutil.Process()
+    while not stop.is_set():
+        total = 0
+        for child in me.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        peak[0] = max(peak[0], total / (1024 * 1024))
+        time.sleep(0.2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark post_to_* against local mock sites")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--platforms', default='linkedin,twitter,instagram,facebook,pinterest,youtube,youtubepost')
+    parser.add_argument('--delay-ms', type=int, default=300)
+    parser.add_argument('--upload-ms', type=int, default=2000)
+    parser.add_argument('--headed', action='store_true')
+    args = parser.parse_args()
+
+    # app.py writes its folders and reads cookie files relative to the working directory
+    workdir = tempfile.mkdtemp(prefix='bench_posting_')
+    os.chdir(workdir)
+    write_mock_cookies(workdir)
+    media_path = os.path.join(workdir, 'media.mp4')
+    with open(media_path, 'wb') as f:
+        f.write(os.urandom(512 * 1024))
+
+    import app
+
+    server, base_url = start_mock_server(delay_ms=args.delay_ms, upload_ms=args.upload_ms)
+    use_mock_sites(base_url)
+    headless = False if args.headed else None
+
+    post_data = {
+        'captions': {p: f"Benchmark caption for {p} #perf" for p in app.PLATFORMS},
+        'pinterest_title': 'Benchmark pin',
+        'pinterest_link': '',
+        'youtube_title': 'Benchmark video',
+        'youtube_description': 'Uploaded by the posting benchmark',
+        'youtube_visibility': 'unlisted'
+    }
+
+    rows = []
+    for platform in args.platforms.split(','):
+        platform = platform.strip()
+        totals, commands, successes = [], [], 0
+        posts_before = len(server.posts)
+        stop, peak = threading.Event(), [0.0]
+        sampler = None
+        if app.PSUTIL_AVAILABLE:
+            sampler = threading.Thread(target=sample_peak_rss, args=(stop, peak), daemon=True)
+            sampler.start()
+        for _ in range(args.runs):
+            result = app.post_to_platform(platform, post_data, media_path, headless)
+            timings = result.get('timings') or {}
+            totals.append(timings.get('total', 0))
+            commands.append(timings.get('commands', 0))
+            if result.get('success'):
+                successes += 1
+            else:
+                print(f"  {platform} failed at {timings.get('failed_step')}: {result.get('message')}")
+        stop.set()
+        if sampler:
+            sampler.join()
+        received = [p for p in server.posts[posts_before:] if p.get('platform') == platform]
+        bad = [p for p in received if str(p.get('text', '')).startswith('ERROR')]
+        rows.append((platform, successes, len(received), len(bad), totals, commands, peak[0]))
+
+    server.shutdown()
+
+    print(f"\n{'platform':<12}{'ok':>4}{'recv':>6}{'bad':>5}{'p50 s':>8}{'p95 s':>8}{'cmds p50':>10}{'peak MB':>9}")
+    for platform, ok, recv, bad, totals, commands, peak_mb in rows:
+        print(f"{platform:<12}{ok:>4}{recv:>6}{bad:>5}{statistics.median(totals):>8.1f}{percentile(totals, 95):>8.1f}"
+              f"{statistics.median(commands):>10.0f}{peak_mb:>9.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Circuit breaker harness
+Drives one account's breaker through its states with stubbed posters and
+checks each transition: it opens after BREAKER_THRESHOLD failures, lets a
+single probe through once half-open (the probe's token lets it back in,
+other callers are turned away), closes or reopens on the probe's outcome,
+and frees the probe when it ends without one or times out. A second process
+standing in for another node checks that the breaker is shared through
+WORK_QUEUE_DB. No Chrome is launched.
+
+Usage: python benchmarks/check_breaker.py [--callers 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+COOLDOWN = 1.0
+PROBE_TIMEOUT = 2.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the circuit breaker state machine")
+    parser.add_argument('--callers', type=int, default=8, help="Concurrent posts while the breaker is half-open")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='check_breaker_'))
+    os.environ.update(BREAKER_COOLDOWN_SECONDS=str(COOLDOWN), BREAKER_PROBE_TIMEOUT=str(PROBE_TIMEOUT),
+                      BREAKER_THRESHOLD='3', POSTER_ISOLATION='0')
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+
+    runs = []
+    outcome = {'success': False, 'message': 'Twitter authentication failed'}
+
+    def stub_poster(*args, **kwargs):
+        runs.append(threading.get_ident())
+        time.sleep(0.3)
+        return dict(outcome)
+    app.post_to_twitter = stub_poster
+    post = {'captions': {'twitter': 'Breaker check'}}
+
+    failures = []
+    def check(name, ok):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    def open_breaker():
+        for _ in range(3):
+            app.breaker_record('twitter', 'auth', 'Twitter authentication failed')
+
+    def cool_down():
+        time.sleep(COOLDOWN + 0.1)
+
+    check("closed breaker lets posts through without a probe", app.breaker_allow('twitter') == (None, None))
+    open_breaker()
+    check("opens after BREAKER_THRESHOLD auth failures", app.breaker_states()['twitter']['state'] == 'open')
+    retry_at, probe = app.breaker_allow('twitter')
+    check("open breaker defers callers", retry_at is not None and probe is None)
+
+    cool_down()
+    retry_at, probe = app.breaker_allow('twitter')
+    check("half-open hands out one probe token", retry_at is None and probe is not None)
+    check("other callers are turned away while it probes", app.breaker_allow('twitter')[0] is not None)
+    check("the probe gets back in with its token", app.breaker_allow('twitter', probe) == (None, probe))
+    app.breaker_record('twitter', 'auth', 'still failing', probe)
+    check("a failed probe reopens it", app.breaker_states()['twitter']['state'] == 'open')
+
+    cool_down()
+    _, probe = app.breaker_allow('twitter')
+    app.breaker_release('twitter', probe)
+    _, second = app.breaker_allow('twitter')
+    check("a released probe frees the half-open slot", second is not None and second != probe)
+
+    time.sleep(PROBE_TIMEOUT + 0.1)
+    _, third = app.breaker_allow('twitter')
+    check("a probe that never reports back expires", third is not None and third != second)
+    app.breaker_record('twitter', None, probe=third)
+    check("a successful probe closes it", app.breaker_states()['twitter']['state'] == 'closed')
+
+    # Concurrent posts through post_to_platform while half-open: exactly one poster runs
+    open_breaker()
+    cool_down()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(app.post_to_platform('twitter', post, None, True)))
+               for _ in range(args.callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    deferred = sum(1 for r in results if r.get('circuit_open'))
+    check(f"{args.callers} concurrent half-open posts run the poster once ({len(runs)} ran, {deferred} deferred)",
+          len(runs) == 1 and deferred == args.callers - 1)
+    check("the failed probe reopened it", app.breaker_states()['twitter']['state'] == 'open')
+
+    cool_down()
+    outcome.update(success=True, message='Posted')
+    runs.clear()
+    result = app.post_to_platform('twitter', post, None, True)
+    check("a post after the cooldown probes and closes it",
+          result.get('success') and len(runs) == 1 and app.breaker_states()['twitter']['state'] == 'closed')
+
+    # Another node on the same WORK_QUEUE_DB counts toward and obeys the same breaker
+    def other_node(code):
+        script = (f"import contextlib, io, sys\nsys.path.insert(0, {os.path.dirname(BENCH_DIR)!r})\n"
+                  f"with contextlib.redirect_stdout(io.StringIO()):\n    import app\n{code}")
+        return subprocess.run([sys.executable, '-c', script], env=dict(os.environ, WORKER_ID='other-node'),
+                              capture_output=True, text=True).stdout.strip()
+    app.breaker_record('twitter', 'auth', 'Twitter authentication failed')
+    app.breaker_record('twitter', 'auth', 'Twitter authentication failed')
+    other_node("app.breaker_record('twitter', 'auth', 'Twitter authentication failed')")
+    check("failures on two nodes add up to open it", app.breaker_states()['twitter']['state'] == 'open')
+    check("the other node defers its posts while it is open",
+          other_node("print(app.breaker_allow('twitter')[0] is not None)") == 'True')
+
+    print(f"\n{len(failures)} check(s) failed" if failures else "\nAll breaker checks passed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
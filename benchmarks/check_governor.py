@@ -0,0 +1,143 @@
+"""
+Browser governor harness
+Queues runs of each priority class behind a full BrowserGovernor and checks
+the order slots are handed out in: scheduled, interactive, retry, then
+backfill, first come first served within a class, with long waits aged
+ahead of newer, more urgent work. Also checks the per-class caps, that
+/post backpressure only counts what would queue ahead of it, and how
+execution_priority() classes scheduled sub-jobs. No Chrome is launched.
+
+Usage: python benchmarks/check_governor.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+HOLD = 0.05
+
+def main():
+    os.chdir(tempfile.mkdtemp(prefix='check_governor_'))
+    os.environ.update(APP_ROLE='web', POSTER_ISOLATION='0')
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+
+    failures = []
+    def check(name, ok):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    def wait_for(governor, waiting):
+        deadline = time.time() + 5
+        while governor.snapshot()['waiting'] < waiting and time.time() < deadline:
+            time.sleep(0.01)
+
+    def run_queued(governor, runs, gap=0.02, pause_after=None, pause=0):
+        """Fill every slot, queue runs [(name, priority)] behind it, then free the slots; returns the start order"""
+        order = []
+        gate = threading.Event()
+        def blocker():
+            with governor.slot(app.PRIORITY_SCHEDULED):
+                gate.wait()
+        def run(name, priority):
+            with governor.slot(priority):
+                order.append(name)
+                time.sleep(HOLD)
+        threads = [threading.Thread(target=blocker) for _ in range(governor.max_concurrent)]
+        for thread in threads:
+            thread.start()
+        while governor.active < governor.max_concurrent:
+            time.sleep(0.01)
+        for i, (name, priority) in enumerate(runs):
+            threads.append(threading.Thread(target=run, args=(name, priority)))
+            threads[-1].start()
+            wait_for(governor, i + 1)
+            time.sleep(pause if i == pause_after else gap)
+        gate.set()
+        for thread in threads:
+            thread.join()
+        return order
+
+    app.BROWSER_AGING_SECONDS = 120
+    governor = app.BrowserGovernor(1, 0)
+    order = run_queued(governor, [('backfill', app.PRIORITY_BACKFILL), ('retry', app.PRIORITY_RETRY),
+                                  ('interactive', app.PRIORITY_INTERACTIVE), ('scheduled', app.PRIORITY_SCHEDULED)])
+    check(f"classes run most urgent first ({', '.join(order)})", order == ['scheduled', 'interactive', 'retry', 'backfill'])
+
+    order = run_queued(governor, [(f"retry{i}", app.PRIORITY_RETRY) for i in range(4)])
+    check("a class runs first come first served", order == [f"retry{i}" for i in range(4)])
+
+    # Aging: with a class per 0.2s of waiting, a backfill queued 1s earlier outranks a new scheduled run
+    app.BROWSER_AGING_SECONDS = 0.2
+    order = run_queued(governor, [('backfill', app.PRIORITY_BACKFILL), ('scheduled', app.PRIORITY_SCHEDULED)],
+                       pause_after=0, pause=1.0)
+    check(f"a long wait ages ahead of newer work ({', '.join(order)})", order == ['backfill', 'scheduled'])
+    order = run_queued(governor, [('backfill', app.PRIORITY_BACKFILL), ('scheduled', app.PRIORITY_SCHEDULED)])
+    check("a short wait does not", order == ['scheduled', 'backfill'])
+    app.BROWSER_AGING_SECONDS = 120
+
+    # Class limits: backfill may take one of three browsers, the rest stay free for other work
+    governor = app.BrowserGovernor(3, 0, {app.PRIORITY_BACKFILL: 1})
+    peak = {'backfill': 0}
+    started = {}
+    def run(name, priority):
+        with governor.slot(priority):
+            started[name] = time.time()
+            peak['backfill'] = max(peak['backfill'], governor.snapshot()['classes']['backfill']['active'])
+            time.sleep(0.2)
+    threads = [threading.Thread(target=run, args=(f"backfill{i}", app.PRIORITY_BACKFILL)) for i in range(4)]
+    threads += [threading.Thread(target=run, args=(f"scheduled{i}", app.PRIORITY_SCHEDULED)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    check(f"backfill never holds more than its limit (peak {peak['backfill']})", peak['backfill'] == 1)
+    check("scheduled runs get the free browsers while backfill queues",
+          max(started['scheduled0'], started['scheduled1']) < started['backfill1'])
+
+    # Backpressure: a queue of retries and backfill does not turn /post away, interactive waiters do
+    app.BROWSER_QUEUE_LIMIT = 2
+    governor = app.BrowserGovernor(1, 0)
+    gate = threading.Event()
+    def hold():
+        with governor.slot(app.PRIORITY_SCHEDULED):
+            gate.wait()
+    waiters = [threading.Thread(target=hold)]
+    waiters[0].start()
+    for priority in [app.PRIORITY_RETRY, app.PRIORITY_BACKFILL] * 3:
+        waiters.append(threading.Thread(target=governor.acquire, args=(priority, 0.5)))
+        waiters[-1].start()
+    wait_for(governor, 6)
+    check("retries and backfill waiting do not trip backpressure", governor.saturation() is None)
+    for _ in range(2):
+        waiters.append(threading.Thread(target=governor.acquire, args=(app.PRIORITY_INTERACTIVE, 0.5)))
+        waiters[-1].start()
+    wait_for(governor, 8)
+    saturated = governor.saturation()
+    check("BROWSER_QUEUE_LIMIT interactive waiters do", saturated is not None and saturated[0] == 429)
+    gate.set()
+    for thread in waiters:
+        thread.join()
+
+    now = datetime.now()
+    overdue = (now - timedelta(seconds=app.BACKFILL_AFTER_SECONDS + 60)).isoformat()
+    check("a sub-job long overdue runs as backfill", app.execution_priority({'scheduled_time': overdue}, 0) == app.PRIORITY_BACKFILL)
+    check("an on-time sub-job runs as scheduled",
+          app.execution_priority({'scheduled_time': (now + timedelta(minutes=1)).isoformat()}, 0) == app.PRIORITY_SCHEDULED)
+    check("a sub-job that was attempted runs as a retry", app.execution_priority({'scheduled_time': overdue}, 1) == app.PRIORITY_RETRY)
+
+    print(f"\n{len(failures)} check(s) failed" if failures else "\nAll governor checks passed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
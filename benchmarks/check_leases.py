@@ -0,0 +1,135 @@
+"""
+Sub-job lease harness
+Starts several node processes on one shared scheduled_posts.json and
+WORK_QUEUE_DB and has every node fire every post, the way scheduler workers
+do. Checks that each sub-job is posted exactly once, that a lease a live
+node still holds is left alone, and that a stale one (its node stopped
+renewing it) is taken over and retried by exactly one node. Posters and the
+publish check are stubbed, so no Chrome is launched.
+
+Usage: python benchmarks/check_leases.py [--nodes 4] [--posts 6]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+PLATFORMS = ['linkedin', 'twitter', 'facebook']
+STALE_POST = 'post_stale'
+LEASE_TTL = 3.0
+
+def import_app(worker_id):
+    os.environ.update(APP_ROLE='web', POSTER_ISOLATION='0', RETRY_MAX_ATTEMPTS='3',
+                      LEASE_TTL_SECONDS=str(LEASE_TTL), WORKER_ID=worker_id)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    return app
+
+def run_node(node, start_at):
+    """One node: fire every post, then take over the stale sub-job once its lease has expired"""
+    app = import_app(f"node{node}")
+
+    def stub_post(platform, post_data, *args, **kwargs):
+        # O_APPEND keeps each line whole across processes
+        with open('runs.log', 'a') as f:
+            f.write(f"{post_data['id']} {platform} node{node}\n")
+        time.sleep(0.2)
+        return {'success': True, 'message': 'Posted'}
+    app.post_to_platform = stub_post
+    app.verify_published = lambda platform, post_data: False
+
+    posts = json.load(open(app.SCHEDULED_POSTS_FILE))
+    post_ids = [post['id'] for post in posts if post['id'] != STALE_POST]
+    random.Random(node).shuffle(post_ids)
+    time.sleep(max(0, start_at - time.time()))
+    for post_id in post_ids:
+        app.execute_scheduled_post(post_id)
+
+    time.sleep(max(0, start_at + LEASE_TTL + 0.5 - time.time()))
+    app.reclaim_abandoned_work()
+    app.execute_scheduled_post(STALE_POST, ['twitter'], automatic=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check sub-job claims and lease takeover across node processes")
+    parser.add_argument('--nodes', type=int, default=4, help="Node processes sharing the store")
+    parser.add_argument('--posts', type=int, default=6, help="Scheduled posts every node fires")
+    parser.add_argument('--node', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--start-at', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.node is not None:
+        run_node(args.node, args.start_at)
+        return
+
+    os.chdir(tempfile.mkdtemp(prefix='check_leases_'))
+    app = import_app('harness')
+    now = datetime.now().isoformat()
+    posts = [{'id': f"post_{i}", 'platforms': PLATFORMS, 'captions': {p: 'Lease check' for p in PLATFORMS},
+              'scheduled_time': now, 'created_at': now, 'status': 'scheduled'} for i in range(args.posts)]
+    # A sub-job a node was running when it stopped; its lease runs out LEASE_TTL from now
+    posts.append({'id': STALE_POST, 'platforms': ['twitter'], 'captions': {'twitter': 'Lease check'},
+                  'scheduled_time': now, 'created_at': now, 'status': 'running',
+                  'jobs': {'twitter': {'status': 'running', 'attempts': 0, 'result': None}}})
+    app.save_scheduled_posts(posts)
+    conn = app.queue_db()
+    conn.execute("INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                 (app.job_lease(STALE_POST, 'twitter'), 'stopped-node', time.time() + LEASE_TTL))
+    conn.close()
+
+    failures = []
+    def check(name, ok):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    app.reclaim_abandoned_work()
+    stale = next(p for p in app.load_scheduled_posts() if p['id'] == STALE_POST)
+    check("a lease its node still renews is left alone", stale['jobs']['twitter']['status'] == 'running')
+
+    start_at = time.time() + 2
+    nodes = [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--node', str(i), '--start-at', str(start_at)])
+             for i in range(args.nodes)]
+    codes = [node.wait() for node in nodes]
+    check(f"{args.nodes} nodes exited cleanly", not any(codes))
+
+    runs = {}
+    if os.path.exists('runs.log'):
+        for line in open('runs.log'):
+            post_id, platform, node = line.split()
+            runs.setdefault((post_id, platform), []).append(node)
+    expected = [(post['id'], platform) for post in posts for platform in post['platforms']]
+    twice = sorted(key for key, nodes_run in runs.items() if len(nodes_run) > 1)
+    missing = sorted(key for key in expected if key not in runs)
+    check(f"every sub-job posted exactly once ({len(twice)} twice, {len(missing)} never)", not twice and not missing)
+    by_node = {}
+    for nodes_run in runs.values():
+        for node in nodes_run:
+            by_node[node] = by_node.get(node, 0) + 1
+    print(f"     runs per node: {dict(sorted(by_node.items()))}")
+
+    stored = {post['id']: post for post in app.load_scheduled_posts()}
+    check("every post ends completed", all(stored[post['id']]['status'] == 'completed' for post in posts))
+    stale_job = stored[STALE_POST]['jobs']['twitter']
+    check("the stale sub-job was taken over as interrupted and retried once",
+          stale_job['status'] == 'succeeded' and stale_job['attempts'] == 2)
+    conn = app.queue_db()
+    left = conn.execute("SELECT name FROM leases WHERE name LIKE 'job/%'").fetchall()
+    conn.close()
+    check(f"finished sub-jobs leave no job leases behind ({len(left)} left)", not left)
+
+    print(f"\n{len(failures)} check(s) failed" if failures else "\nAll lease checks passed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Local Groq stand-in
+An OpenAI/Groq-compatible chat completions server with configurable latency,
+error rate and 429 rate limiting, so the caption path can be exercised offline.
+
+Usage: python benchmarks/groq_stub.py [--port 8766] [--latency-ms 400] [--jitter-ms 200]
+                                      [--error-rate 0.02] [--rate-limit-rate 0.05] [--retry-after 1]
+       then run the app with GROQ_BASE_URL=http://127.0.0.1:8766 GROQ_API_KEY=stub
+"""
+
+import argparse
+import http.server
+import json
+import random
+import threading
+import time
+
+class GroqStubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Unknown endpoint', 'type': 'invalid_request_error'}})
+            return
+
+        config = self.server.config
+        with self.server.stats_lock:
+            self.server.stats['requests'] += 1
+
+        roll = random.random()
+        if roll < config['rate_limit_rate']:
+            with self.server.stats_lock:
+                self.server.stats['rate_limited'] += 1
+            self._send_json(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_exceeded'}},
+                            {'Retry-After': str(config['retry_after'])})
+            return
+
+        delay = max(0, config['latency_ms'] + random.uniform(-config['jitter_ms'], config['jitter_ms'])) / 1000.0
+        time.sleep(delay)
+
+        if roll < config['rate_limit_rate'] + config['error_rate']:
+            with self.server.stats_lock:
+                self.server.stats['errors'] += 1
+            self._send_json(500, {'error': {'message': 'Stub internal error', 'type': 'internal_server_error'}})
+            return
+
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        caption = f"Stub caption for: {prompt[-60:]} #stub #offline"
+        self._send_json(200, {
+            'id': f"chatcmpl-stub-{random.randint(0, 1 << 30)}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': caption},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': len(prompt.split()), 'completion_tokens': len(caption.split()),
+                      'total_tokens': len(prompt.split()) + len(caption.split())}
+        })
+
+def start_groq_stub(port=0, latency_ms=400, jitter_ms=200, error_rate=0.0, rate_limit_rate=0.0, retry_after=1):
+    """Start the stub in a background thread; returns (server, base_url)"""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), GroqStubHandler)
+    server.config = {
+        'latency_ms': latency_ms,
+        'jitter_ms': jitter_ms,
+        'error_rate': error_rate,
+        'rate_limit_rate': rate_limit_rate,
+        'retry_after': retry_after
+    }
+    server.stats = {'requests': 0, 'errors': 0, 'rate_limited': 0}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve a local Groq-compatible chat completions stub")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency-ms', type=int, default=400)
+    parser.add_argument('--jitter-ms', type=int, default=200)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+
+    server, base_url = start_groq_stub(args.port, args.latency_ms, args.jitter_ms,
+                                       args.error_rate, args.rate_limit_rate, args.retry_after)
+    print(f"Groq stub at {base_url}  (set GROQ_BASE_URL={base_url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"Stats: {server.stats}")
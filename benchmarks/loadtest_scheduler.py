@@ -0,0 +1,241 @@
+"""
+Scheduling API load test
+Fills scheduled_posts.json with synthetic posts (10k-100k), measures startup
+restore time and memory, then fires concurrent calls at /schedule-post,
+/get-scheduled-posts, /cancel-scheduled-post and /scheduler-status while
+tracking latency and how long callers wait on scheduled_posts_lock.
+Browser posters are replaced with stubs, so no Chrome is launched.
+
+Usage: python benchmarks/loadtest_scheduler.py [--posts 10000] [--concurrency 16] [--duration 30]
+       python benchmarks/loadtest_scheduler.py --generate-only scheduled_posts.json --posts 100000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+PLATFORMS = ['linkedin', 'twitter', 'instagram', 'facebook', 'pinterest', 'youtube', 'youtubepost']
+
+def generate_posts(count, completed_fraction=0.3, missed_fraction=0.05, seed=42):
+    """Synthetic post records shaped like the ones /schedule-post writes"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    posts = []
+    for i in range(count):
+        platforms = rng.sample(PLATFORMS, rng.randint(1, 4))
+        roll = rng.random()
+        if roll < completed_fraction:
+            status = 'completed'
+            scheduled = now - timedelta(hours=rng.uniform(1, 72))
+        elif roll < completed_fraction + missed_fraction:
+            status = 'missed'
+            scheduled = now - timedelta(hours=rng.uniform(1, 72))
+        else:
+            status = 'scheduled'
+            scheduled = now + timedelta(days=rng.uniform(1, 30))
+        post = {
+            'id': f"post_synthetic_{i}_{uuid.uuid4().hex[:8]}",
+            'captions': {p: f"Synthetic caption {i} for {p} #load" for p in platforms},
+            'platforms': platforms,
+            'scheduled_time': scheduled.isoformat(),
+            'image_path': None,
+            'pinterest_title': '',
+            'pinterest_link': '',
+            'youtube_title': '',
+            'youtube_description': '',
+            'youtube_visibility': 'public',
+            'headless': None,
+            'status': status,
+            'created_at': (scheduled - timedelta(days=1)).isoformat()
+        }
+        if status == 'completed':
+            post['executed_at'] = (scheduled + timedelta(seconds=30)).isoformat()
+            post['results'] = {p: {'success': True, 'message': 'stub'} for p in platforms}
+        posts.append(post)
+    return posts
+
+class TimedLock:
+    """Drop-in for threading.Lock that records how long each acquire waited"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits_lock = threading.Lock()
+        self.waits = []
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        with self._waits_lock:
+            self.waits.append(time.perf_counter() - start)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def encode_form(fields):
+    """multipart/form-data body for /schedule-post (no file part)"""
+    boundary = uuid.uuid4().hex
+    lines = []
+    for name, value in fields:
+        lines += [f"--{boundary}", f'Content-Disposition: form-data; name="{name}"', '', str(value)]
+    lines += [f"--{boundary}--", '']
+    return "\r\n".join(lines).encode('utf-8'), f"multipart/form-data; boundary={boundary}"
+
+def worker(base_url, mix, deadline, post_ids, ids_lock, samples, rng):
+    while time.time() < deadline:
+        op = rng.choices(list(mix), weights=list(mix.values()))[0]
+        if op == 'schedule':
+            when = (datetime.now() + timedelta(days=rng.uniform(1, 30))).strftime('%Y-%m-%dT%H:%M')
+            body, content_type = encode_form([('platforms[]', 'linkedin'), ('platforms[]', 'twitter'),
+                                              ('caption_linkedin', 'Load test'), ('caption_twitter', 'Load test'),
+                                              ('schedule_datetime', when)])
+            request = urllib.request.Request(base_url + '/schedule-post', data=body, method='POST',
+                                             headers={'Content-Type': content_type})
+        elif op == 'list':
+            request = urllib.request.Request(base_url + '/get-scheduled-posts')
+        elif op == 'cancel':
+            with ids_lock:
+                if not post_ids:
+                    continue
+                post_id = post_ids.pop(rng.randrange(len(post_ids)))
+            request = urllib.request.Request(base_url + f'/cancel-scheduled-post/{post_id}', method='DELETE')
+        else:
+            request = urllib.request.Request(base_url + '/scheduler-status')
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=300) as response:
+                ok = json.loads(response.read()).get('success', False)
+        except Exception:
+            ok = False
+        samples.append((op, time.perf_counter() - start, ok))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scheduling API with a large queue")
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=int, default=30, help="Seconds of concurrent API load")
+    parser.add_argument('--mix', default='schedule=2,list=5,cancel=1,status=2',
+                        help="Relative weights of schedule/list/cancel/status calls")
+    parser.add_argument('--generate-only', metavar='PATH', help="Write the synthetic queue to PATH and exit")
+    args = parser.parse_args()
+
+    posts = generate_posts(args.posts)
+    if args.generate_only:
+        with open(args.generate_only, 'w') as f:
+            json.dump(posts, f, indent=2)
+        print(f"Wrote {len(posts)} posts to {args.generate_only}")
+        return
+
+    os.chdir(tempfile.mkdtemp(prefix='loadtest_scheduler_'))
+    with open('scheduled_posts.json', 'w') as f:
+        json.dump(posts, f, indent=2)
+    file_mb = os.path.getsize('scheduled_posts.json') / (1024 * 1024)
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app  # restores every scheduled job at import time
+    import_restore_s = time.perf_counter() - start
+    rss_after_restore = rss_mb()
+
+    # Never launch browsers during the load test
+    def stub_poster(*args, **kwargs):
+        return {"success": True, "message": "stubbed"}
+    for name in ('post_to_linkedin', 'post_to_twitter', 'post_to_instagram', 'post_to_facebook',
+                 'post_to_pinterest', 'post_to_youtube', 'post_to_youtube_post'):
+        setattr(app, name, stub_poster)
+    # The stubs only exist in this process, so keep posters out of worker processes
+    app.POSTER_ISOLATION = False
+
+    timed_lock = TimedLock()
+    app.scheduled_posts_lock = timed_lock
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.restore_scheduled_jobs()
+    restore_s = time.perf_counter() - start
+    timed_lock.waits.clear()
+
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *a, **kw):
+            pass
+
+    server = make_server('127.0.0.1', 0, app.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    mix = {k: float(v) for k, v in (item.split('=') for item in args.mix.split(','))}
+    post_ids = [p['id'] for p in posts if p['status'] == 'scheduled']
+    ids_lock = threading.Lock()
+    samples = []
+    deadline = time.time() + args.duration
+    threads = [threading.Thread(target=worker, args=(base_url, mix, deadline, post_ids, ids_lock, samples,
+                                                     random.Random(i)))
+               for i in range(args.concurrency)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    server.shutdown()
+    rss_peak = rss_mb()
+
+    print(f"Queue: {len(posts)} posts ({file_mb:.1f} MB JSON)")
+    print(f"Import + restore: {import_restore_s:.2f}s   restore_scheduled_jobs(): {restore_s:.2f}s   "
+          f"scheduler jobs: {len(app.scheduler.get_jobs())}")
+    print(f"RSS: {rss_before:.0f} MB before, {rss_after_restore:.0f} MB after restore, {rss_peak:.0f} MB after load")
+    print(f"\n{'operation':<12}{'calls':>7}{'err':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for op in mix:
+        op_samples = [s for s in samples if s[0] == op]
+        if not op_samples:
+            continue
+        latencies = [s[1] * 1000 for s in op_samples]
+        errors = sum(1 for s in op_samples if not s[2])
+        print(f"{op:<12}{len(op_samples):>7}{errors:>6}{statistics.median(latencies):>9.1f}"
+              f"{percentile(latencies, 95):>9.1f}{percentile(latencies, 99):>9.1f}{max(latencies):>9.1f}")
+    waits = [w * 1000 for w in timed_lock.waits]
+    print(f"\nscheduled_posts_lock: {len(waits)} acquires, wait p50 {percentile(waits, 50):.1f} ms, "
+          f"p95 {percentile(waits, 95):.1f} ms, max {max(waits) if waits else 0:.1f} ms, "
+          f"total {sum(waits) / 1000:.1f}s over {args.duration}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+Local mock platform sites
+Serves minimal pages that reproduce the DOM hooks the post_to_* functions rely
+on (tweetTextarea_0, LinkedIn's ql-editor, YouTube Studio's #textbox and file
+inputs, ...) so posting can be measured without touching the real platforms.
+Each UI stage appears after a configurable delay, and every completed post is
+reported back to the server so the harness can check it actually happened.
+
+Usage: python benchmarks/mock_sites.py [--port 8765] [--delay-ms 300] [--upload-ms 2000]
+       then point app.PLATFORM_URLS at it with use_mock_sites(base_url)
+"""
+
+import argparse
+import html
+import http.server
+import json
+import threading
+
+# Shared helpers injected into every page
+COMMON_JS = """
+var DELAY = %(delay)d, UPLOAD_MS = %(upload)d;
+function later(fn) { setTimeout(fn, DELAY); }
+function show(id) { document.getElementById(id).style.display = ''; }
+function addFileInput(parentId, onPicked) {
+    var input = document.createElement('input');
+    input.type = 'file';
+    input.style.display = 'none';
+    input.addEventListener('change', function () { if (input.files.length) { later(onPicked); } });
+    document.getElementById(parentId).appendChild(input);
+    return input;
+}
+function textOf(el) { return el.value !== undefined && el.tagName === 'TEXTAREA' ? el.value : el.innerText; }
+function posted(platform, text) {
+    fetch('/__posted', {method: 'POST', headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({platform: platform, text: text})})
+        .then(function () { document.title = 'posted'; });
+}
+"""
+
+PAGES = {
+    'linkedin': """
+<button class="artdeco-button" id="start" style="display:none" onclick="later(function () { show('dialog'); })">Start a post</button>
+<div id="dialog" style="display:none">
+    <button aria-label="Add media" onclick="addFileInput('media', function () { show('next'); })">Media</button>
+    <div id="media"></div>
+    <button id="next" style="display:none" onclick="this.style.display='none'"><span>Next</span></button>
+    <div class="ql-editor" contenteditable="true" data-placeholder="What do you want to talk about?"></div>
+    <button class="share-actions__primary-action" onclick="posted('linkedin', textOf(document.querySelector('.ql-editor')))">
+        <span class="artdeco-button__text">Post</span></button>
+</div>
+<script>later(function () { show('start'); });</script>
+""",
+    'twitter': """
+<div id="composer" style="display:none">
+    <div data-testid="tweetTextarea_0" contenteditable="true" role="textbox"></div>
+    <div id="media"></div>
+    <button data-testid="tweetButtonInline" onclick="posted('twitter', textOf(document.querySelector('[data-testid=tweetTextarea_0]')))">Post</button>
+</div>
+<script>
+    later(function () { show('composer'); addFileInput('media', function () {}); });
+</script>
+""",
+    'instagram': """
+<a href="/instagram/create/" id="create" style="display:none"
+   onclick="event.preventDefault(); later(function () { show('dialog'); addFileInput('media', function () { show('next1'); }); })">
+   <span>Create</span></a>
+<div id="dialog" style="display:none">
+    <div id="media"></div>
+    <div role="button" id="next1" style="display:none" onclick="this.remove(); later(function () { show('next2'); })">Next</div>
+    <div role="button" id="next2" style="display:none" onclick="this.remove(); later(function () { show('details'); })">Next</div>
+    <div id="details" style="display:none">
+        <textarea aria-label="Write a caption..."></textarea>
+        <div role="button" onclick="posted('instagram', textOf(document.querySelector('textarea'))); later(function () { show('shared'); })">Share</div>
+    </div>
+    <div id="shared" style="display:none">Your post has been shared.</div>
+</div>
+<script>later(function () { show('create'); });</script>
+""",
+    'facebook': """
+<div id="feed" style="display:none">
+    <span onclick="later(function () { show('dialog'); })">What's on your mind, Mock?</span>
+</div>
+<div id="dialog" style="display:none">
+    <div contenteditable="true" role="textbox"></div>
+    <div aria-label="Photo/video" role="button" onclick="addFileInput('media', function () {})">Photo/video</div>
+    <div id="media"></div>
+    <div role="button" onclick="posted('facebook', textOf(document.querySelector('[role=textbox]')))"><span>Post</span></div>
+</div>
+<script>later(function () { show('feed'); });</script>
+""",
+    'pinterest': """
+<div id="create" style="display:none"
+     onclick="later(function () { addFileInput('media', function () { show('form'); }); })">Create Pin</div>
+<div id="media"></div>
+<div id="form" style="display:none">
+    <input id="storyboard-selector-title">
+    <textarea id="storyboard-selector-description"></textarea>
+    <div class="lIkAnG" onclick="posted('pinterest', document.getElementById('storyboard-selector-title').value)">Publish</div>
+</div>
+<script>later(function () { show('create'); });</script>
+""",
+    'youtube': """
+<button aria-label="Create" id="create" style="display:none" onclick="later(function () { show('menu'); })">Create</button>
+<div id="menu" style="display:none">
+    <yt-formatted-string onclick="later(startUpload)">Upload video</yt-formatted-string>
+    <yt-formatted-string onclick="later(function () { show('community'); })">Create post</yt-formatted-string>
+</div>
+
+<div id="community" style="display:none">
+    <button aria-label="Add image" onclick="addFileInput('community-media', function () {})">Image</button>
+    <div id="community-media"></div>
+    <div id="contenteditable-root" contenteditable="true"></div>
+    <button aria-label="Post" onclick="posted('youtubepost', textOf(document.getElementById('contenteditable-root')))">Post</button>
+</div>
+
+<div id="studio" style="display:none">
+    <div id="upload-media"></div>
+    <div id="details" style="display:none">
+        <div id="textbox" contenteditable="true">video-file-name</div>
+        <div id="textbox" contenteditable="true"></div>
+        <tp-yt-paper-radio-button name="VIDEO_MADE_FOR_KIDS_MFK" onclick="this.setAttribute('checked', '')">Yes</tp-yt-paper-radio-button>
+        <tp-yt-paper-radio-button name="VIDEO_MADE_FOR_KIDS_NOT_MFK" onclick="this.setAttribute('checked', '')">No</tp-yt-paper-radio-button>
+        <tp-yt-paper-radio-button name="PUBLIC" onclick="this.setAttribute('checked', '')">Public</tp-yt-paper-radio-button>
+        <tp-yt-paper-radio-button name="UNLISTED" onclick="this.setAttribute('checked', '')">Unlisted</tp-yt-paper-radio-button>
+        <tp-yt-paper-radio-button name="PRIVATE" onclick="this.setAttribute('checked', '')">Private</tp-yt-paper-radio-button>
+        <button id="next-button">Next</button>
+        <button id="done-button" onclick="publish()">Publish</button>
+    </div>
+    <ytcp-video-upload-progress uploading><span class="progress-label">Uploading 0% ...</span></ytcp-video-upload-progress>
+</div>
+<ytcp-video-share-dialog id="share" style="display:none">Video published</ytcp-video-share-dialog>
+
+<script>
+    var uploaded = false;
+    function startUpload() {
+        show('studio');
+        addFileInput('upload-media', function () {
+            show('details');
+            var started = Date.now();
+            var progress = document.querySelector('ytcp-video-upload-progress');
+            var label = progress.querySelector('.progress-label');
+            var tick = setInterval(function () {
+                var pct = Math.min(100, Math.floor((Date.now() - started) * 100 / Math.max(UPLOAD_MS, 1)));
+                label.textContent = 'Uploading ' + pct + '% ...';
+                if (pct >= 100) {
+                    clearInterval(tick);
+                    uploaded = true;
+                    progress.removeAttribute('uploading');
+                    label.textContent = 'Upload complete ... Processing will begin shortly';
+                }
+            }, 200);
+        });
+    }
+    function publish() {
+        // Publishing before the upload finishes is exactly the bug the poster must avoid
+        var title = document.querySelectorAll('#textbox')[0].innerText;
+        if (!uploaded) { posted('youtube', 'ERROR: published before upload finished: ' + title); return; }
+        later(function () { show('share'); });
+        posted('youtube', title);
+    }
+    later(function () { show('create'); });
+</script>
+""",
+}
+
+# Which page each platform's 'home'/'app' URL serves; YouTube Community shares the YouTube page
+PAGE_PATHS = {
+    'linkedin': {'home': '/linkedin/', 'app': '/linkedin/feed/', 'profile': '/linkedin/profile'},
+    'twitter': {'home': '/twitter/', 'app': '/twitter/home', 'profile': '/twitter/profile'},
+    'instagram': {'home': '/instagram/', 'app': '/instagram/app'},
+    'facebook': {'home': '/facebook/', 'app': '/facebook/app', 'profile': '/facebook/profile'},
+    'pinterest': {'home': '/pinterest/', 'app': '/pinterest/app'},
+    'youtube': {'home': '/youtube/', 'app': '/youtube/app', 'profile': '/youtube/profile'},
+    'youtubepost': {'home': '/youtube/', 'app': '/youtube/app', 'profile': '/youtubepost/profile'},
+}
+
+def render_page(platform, delay_ms, upload_ms):
+    body = PAGES[platform]
+    script = COMMON_JS % {'delay': delay_ms, 'upload': upload_ms}
+    return f"<!DOCTYPE html><html><head><title>{platform} mock</title><script>{script}</script></head><body>{body}</body></html>"
+
+def render_profile(platform, posts):
+    """The account's own feed: every text posted to this platform so far, for verify_published()"""
+    items = ''.join(f"<article>{html.escape(p.get('text') or '')}</article>" for p in posts if p.get('platform') == platform)
+    return f"<!DOCTYPE html><html><head><title>{platform} profile</title></head><body>{items}</body></html>"
+
+class MockHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type='text/html; charset=utf-8'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        platform = path.strip('/').split('/', 1)[0]
+        if platform in PAGE_PATHS and path.rstrip('/').endswith('/profile'):
+            with self.server.posts_lock:
+                posts = list(self.server.posts)
+            self._send(200, render_profile(platform, posts))
+            return
+        if platform not in PAGES:
+            self._send(404, 'not found', 'text/plain')
+            return
+        self._send(200, render_page(platform, self.server.delay_ms, self.server.upload_ms))
+
+    def do_POST(self):
+        if self.path != '/__posted':
+            self._send(404, 'not found', 'text/plain')
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        with self.server.posts_lock:
+            self.server.posts.append(payload)
+        self._send(200, '{"ok": true}', 'application/json')
+
+def start_mock_server(port=0, delay_ms=300, upload_ms=2000):
+    """Start the mock sites in a background thread; returns (server, base_url)"""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), MockHandler)
+    server.delay_ms = delay_ms
+    server.upload_ms = upload_ms
+    server.posts = []
+    server.posts_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def use_mock_sites(base_url):
+    """Point app.PLATFORM_URLS at the mock server"""
+    import app
+    for platform, paths in PAGE_PATHS.items():
+        app.PLATFORM_URLS[platform] = {kind: base_url + path for kind, path in paths.items()}
+
+def write_mock_cookies(directory):
+    """load_cookies() needs a <platform>_cookies.json per platform; any cookie will do for the mocks"""
+    for platform in PAGE_PATHS:
+        with open(f"{directory}/{platform}_cookies.json", 'w') as f:
+            json.dump([{'name': 'mock_session', 'value': platform}], f)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve local mock platform pages")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay-ms', type=int, default=300)
+    parser.add_argument('--upload-ms', type=int, default=2000)
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(args.port, args.delay_ms, args.upload_ms)
+    print(f"Mock platforms at {base_url}/<platform>/  (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
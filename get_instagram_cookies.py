@@ -9,8 +9,12 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 import json
-import time
 import os
+import time
+
+from account_paths import account_cookie_path
+
+COOKIE_FILE = account_cookie_path('instagram')
 
 def extract_instagram_cookies():
     """
@@ -22,7 +26,7 @@ def extract_instagram_cookies():
     print("\nThis script will:")
     print("1. Open Instagram in a browser")
     print("2. Wait for you to log in manually")
-    print("3. Extract and save cookies to instagram_cookies.json")
+    print(f"3. Extract and save cookies to {COOKIE_FILE}")
     print("\n" + "=" * 60)
     
     # Setup Chrome options
@@ -100,7 +104,8 @@ def extract_instagram_cookies():
         print(f"✅ Found {len(cookies)} cookies")
         
         # Save cookies to JSON file
-        filename = 'instagram_cookies.json'
+        filename = COOKIE_FILE
+        os.makedirs(os.path.dirname(COOKIE_FILE) or '.', exist_ok=True)
         with open(filename, 'w') as f:
             json.dump(cookies, f, indent=2)
         
@@ -168,8 +173,8 @@ def verify_instagram_cookies():
     print("Verifying Instagram Cookies...")
     print("=" * 60)
     
-    if not os.path.exists('instagram_cookies.json'):
-        print("❌ instagram_cookies.json not found!")
+    if not os.path.exists(COOKIE_FILE):
+        print(f"❌ {COOKIE_FILE} not found!")
         return False
     
     options = Options()
@@ -186,16 +191,19 @@ def verify_instagram_cookies():
         time.sleep(2)
         
         # Load cookies
-        with open('instagram_cookies.json', 'r') as f:
+        with open(COOKIE_FILE, 'r') as f:
             cookies = json.load(f)
         
         print(f"Loading {len(cookies)} cookies...")
         
+        failed = []
         for cookie in cookies:
             try:
                 driver.add_cookie(cookie)
-            except Exception as e:
-                print(f"Warning: Could not add cookie {cookie.get('name', 'unknown')}: {e}")
+            except Exception:
+                failed.append(cookie.get('name', 'unknown'))
+        if failed:
+            print(f"Warning: Could not add {len(failed)} cookie(s): {', '.join(failed)}")
         
         # Refresh to apply cookies
         driver.get('https://www.instagram.com/')
@@ -274,7 +282,7 @@ def main():
     print("   - Don't share or commit to Git")
     print("   - Add to .gitignore: *.json")
     print("\n📝 NEXT STEPS:")
-    print("   1. Place instagram_cookies.json in same folder as app.py")
+    print(f"   1. Keep {COOKIE_FILE} in the folder you run app.py from")
     print("   2. Run: python app.py")
     print("   3. Open: http://localhost:5000")
     print("   4. Select Instagram and UPLOAD AN IMAGE")
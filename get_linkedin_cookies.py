@@ -9,8 +9,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 import json
+import os
 import time
 
+from account_paths import account_cookie_path
+
+COOKIE_FILE = account_cookie_path('linkedin')
+
 def extract_linkedin_cookies():
     """
     Extract LinkedIn cookies after manual login
@@ -21,7 +26,7 @@ def extract_linkedin_cookies():
     print("\nThis script will:")
     print("1. Open LinkedIn in a browser")
     print("2. Wait for you to log in manually")
-    print("3. Extract and save cookies to linkedin_cookies.json")
+    print(f"3. Extract and save cookies to {COOKIE_FILE}")
     print("\n" + "=" * 60)
     
     # Setup Chrome options
@@ -77,7 +82,8 @@ def extract_linkedin_cookies():
         print(f"✅ Found {len(cookies)} cookies")
         
         # Save cookies to JSON file
-        filename = 'linkedin_cookies.json'
+        filename = COOKIE_FILE
+        os.makedirs(os.path.dirname(COOKIE_FILE) or '.', exist_ok=True)
         with open(filename, 'w') as f:
             json.dump(cookies, f, indent=2)
         
@@ -122,8 +128,8 @@ def verify_cookies():
     print("Verifying Cookies...")
     print("=" * 60)
     
-    if not os.path.exists('linkedin_cookies.json'):
-        print("❌ linkedin_cookies.json not found!")
+    if not os.path.exists(COOKIE_FILE):
+        print(f"❌ {COOKIE_FILE} not found!")
         return False
     
     options = Options()
@@ -139,7 +145,7 @@ def verify_cookies():
         time.sleep(2)
         
         # Load cookies
-        with open('linkedin_cookies.json', 'r') as f:
+        with open(COOKIE_FILE, 'r') as f:
             cookies = json.load(f)
         
         for cookie in cookies:
@@ -193,5 +199,5 @@ if __name__ == "__main__":
     print("   - Re-run this script if your cookies expire")
     print("   - Keep the cookies file secure")
     print("   - Don't share or commit to Git")
-    print("\n✅ You can now use linkedin_cookies.json with the auto poster!")
+    print(f"\n✅ You can now use {COOKIE_FILE} with the auto poster!")
     print("=" * 60 + "\n")
\ No newline at end of file
@@ -4,8 +4,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
+import os
 import time
 
+from account_paths import account_cookie_path
+
+COOKIE_FILE = account_cookie_path('youtube')
+
 def get_youtube_cookies():
     """
     Get YouTube cookies by logging in manually
@@ -17,7 +22,7 @@ def get_youtube_cookies():
     print("\nThis script will:")
     print("1. Open YouTube in a browser")
     print("2. Wait for you to log in manually")
-    print("3. Save your cookies to 'youtube_cookies.json'")
+    print(f"3. Save your cookies to '{COOKIE_FILE}'")
     print("\nIMPORTANT: You have 5 minutes to log in!")
     print("=" * 60)
     
@@ -106,10 +111,11 @@ def get_youtube_cookies():
         cookies = driver.get_cookies()
         
         # Save to file
-        with open('youtube_cookies.json', 'w') as f:
+        os.makedirs(os.path.dirname(COOKIE_FILE) or '.', exist_ok=True)
+        with open(COOKIE_FILE, 'w') as f:
             json.dump(cookies, f, indent=2)
         
-        print(f"\n✓ SUCCESS! Saved {len(cookies)} cookies to 'youtube_cookies.json'")
+        print(f"\n✓ SUCCESS! Saved {len(cookies)} cookies to '{COOKIE_FILE}'")
         print("\n" + "=" * 60)
         print("Cookie Summary:")
         print("=" * 60)
@@ -125,7 +131,7 @@ def get_youtube_cookies():
         if len(found_important) >= 3:
             print("\n✓ All important cookies captured!")
             print("\nYou can now close the browser.")
-            print("Your cookies are saved in 'youtube_cookies.json'")
+            print(f"Your cookies are saved in '{COOKIE_FILE}'")
         else:
             print("\n⚠ Warning: Some important cookies might be missing")
             print("You may need to try again")
@@ -0,0 +1,21 @@
+"""
+Scheduler worker
+Runs scheduled posts, retries and browsers for web processes started with APP_ROLE=web.
+
+    APP_ROLE=web gunicorn -w 4 app:app
+    python worker.py
+
+Several workers, on one machine or several, may share one WORK_QUEUE_DB and
+scheduled_posts.json (on storage that honours file locks); give each its own
+WORKER_ID. They take queued commands and scheduled sub-jobs through leases in
+WORK_QUEUE_DB and write the JSON store under a file lock, so each runs once.
+"""
+
+import os
+
+os.environ['APP_ROLE'] = 'scheduler'
+
+import app
+
+if __name__ == '__main__':
+    app.run_worker()